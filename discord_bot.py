@@ -7,11 +7,57 @@ This module provides OAuth2 authentication for Discord and
 the ability to send embeds/attachments to Discord channels.
 """
 
+import json
 import os
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Union
 from urllib.parse import urlencode
 
+# orjson is an optional speedup; fall back to the stdlib when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(payload: Any) -> bytes:
+    """Encode a JSON request body as bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(response: requests.Response) -> Any:
+    """Decode a JSON response body straight from its raw bytes"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def _retry_after(response: requests.Response, default: float = 1.0) -> float:
+    """
+    Seconds to wait before retrying a rate-limited (429) request
+
+    Args:
+        response: The 429 response
+        default: Wait used when neither the header nor the body gives one
+
+    Returns:
+        The Retry-After header, else the JSON body's retry_after, else default
+    """
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, float(_loads(response)["retry_after"]))
+    except Exception:
+        return default
+
 
 class DiscordOAuth2:
     """
@@ -29,6 +75,19 @@ class DiscordOAuth2:
         self.token_url = "https://discord.com/api/oauth2/token"
         self.api_base = "https://discord.com/api/v10"
 
+        # Pooled connections, released by close() or the context manager
+        self._session = requests.Session()
+
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._session.close()
+
+    def __enter__(self) -> "DiscordOAuth2":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     def get_authorization_url(
         self, state: Optional[str] = None, scopes: Optional[list] = None
     ) -> str:
@@ -77,10 +136,10 @@ class DiscordOAuth2:
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        response = requests.post(self.token_url, data=data, headers=headers)
+        response = self._session.post(self.token_url, data=data, headers=headers)
         response.raise_for_status()
 
-        return response.json()
+        return _loads(response)
 
     def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
         """
@@ -101,10 +160,10 @@ class DiscordOAuth2:
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        response = requests.post(self.token_url, data=data, headers=headers)
+        response = self._session.post(self.token_url, data=data, headers=headers)
         response.raise_for_status()
 
-        return response.json()
+        return _loads(response)
 
     def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """
@@ -118,10 +177,10 @@ class DiscordOAuth2:
         """
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        response = requests.get(f"{self.api_base}/users/@me", headers=headers)
+        response = self._session.get(f"{self.api_base}/users/@me", headers=headers)
         response.raise_for_status()
 
-        return response.json()
+        return _loads(response)
 
     def get_user_guilds(self, access_token: str) -> list:
         """
@@ -135,10 +194,12 @@ class DiscordOAuth2:
         """
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        response = requests.get(f"{self.api_base}/users/@me/guilds", headers=headers)
+        response = self._session.get(
+            f"{self.api_base}/users/@me/guilds", headers=headers
+        )
         response.raise_for_status()
 
-        return response.json()
+        return _loads(response)
 
 
 class DiscordMessenger:
@@ -146,15 +207,39 @@ class DiscordMessenger:
     Discord message and embed sender
     """
 
-    def __init__(self, bot_token: Optional[str] = None):
+    def __init__(self, bot_token: Optional[str] = None, max_concurrency: int = 10):
         """
         Initialize Discord messenger
 
         Args:
             bot_token: Discord bot token (optional, can also use OAuth tokens)
+            max_concurrency: Maximum in-flight requests for batch sends
         """
         self.bot_token = bot_token or os.getenv("DISCORD_BOT_TOKEN")
         self.api_base = "https://discord.com/api/v10"
+        self.max_concurrency = max_concurrency
+
+        # Pooled connections sized for batch sends, released by close()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(max_concurrency, 10))
+        self._session.mount("https://", adapter)
+
+        # Bot-token headers never change, so build them once instead of per call
+        self._bot_headers_json = {
+            "Authorization": f"Bot {self.bot_token}",
+            "Content-Type": "application/json",
+        }
+        self._bot_headers_multipart = {"Authorization": f"Bot {self.bot_token}"}
+
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._session.close()
+
+    def __enter__(self) -> "DiscordMessenger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def send_embed(
         self,
@@ -176,10 +261,13 @@ class DiscordMessenger:
             Response from Discord API
         """
         # Determine which token to use
-        token = access_token or self.bot_token
-        auth_header = f"Bearer {token}" if access_token else f"Bot {self.bot_token}"
-
-        headers = {"Authorization": auth_header, "Content-Type": "application/json"}
+        if access_token:
+            headers = {
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json",
+            }
+        else:
+            headers = self._bot_headers_json
 
         payload = {"embeds": [embed]}
 
@@ -187,10 +275,71 @@ class DiscordMessenger:
             payload["content"] = content
 
         url = f"{self.api_base}/channels/{channel_id}/messages"
-        response = requests.post(url, json=payload, headers=headers)
+        response = self._session.post(url, data=_dumps(payload), headers=headers)
         response.raise_for_status()
 
-        return response.json()
+        return _loads(response)
+
+    def send_embed_many(
+        self,
+        channel_ids: List[str],
+        embed: Dict[str, Any],
+        access_token: Optional[str] = None,
+        content: Optional[str] = None,
+        max_retries: int = 3,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Send the same embed to several channels concurrently
+
+        At most ``max_concurrency`` requests are in flight at once. When
+        Discord answers 429, every worker pauses until the Retry-After
+        window has passed before the request is retried.
+
+        Args:
+            channel_ids: Discord channel IDs to send to
+            embed: Embed object (Discord embed format)
+            access_token: OAuth access token (if not using bot token)
+            content: Optional message content
+            max_retries: Retries per channel after a 429 response
+
+        Returns:
+            One entry per channel, in order: the API response, or the
+            exception raised for that channel
+        """
+        if not channel_ids:
+            return []
+
+        lock = threading.Lock()
+        resume_at = [0.0]  # Shared monotonic deadline set by 429 responses
+
+        def _send_one(channel_id: str) -> Union[Dict[str, Any], Exception]:
+            attempt = 0
+            while True:
+                with lock:
+                    delay = resume_at[0] - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+                try:
+                    return self.send_embed(channel_id, embed, access_token, content)
+                except requests.HTTPError as e:
+                    response = e.response
+                    if (
+                        response is None
+                        or response.status_code != 429
+                        or attempt >= max_retries
+                    ):
+                        return e
+                    retry_after = _retry_after(response)
+                    with lock:
+                        resume_at[0] = max(resume_at[0], time.monotonic() + retry_after)
+                    attempt += 1
+                except Exception as e:
+                    return e
+
+        workers = max(1, min(self.max_concurrency, len(channel_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_send_one, channel_ids))
 
     def send_attachment(
         self,
@@ -214,14 +363,14 @@ class DiscordMessenger:
             Response from Discord API
         """
         # Download the file
-        file_response = requests.get(file_url)
+        file_response = self._session.get(file_url)
         file_response.raise_for_status()
 
-        # Determine which token to use
-        token = access_token or self.bot_token
-        auth_header = f"Bearer {token}" if access_token else f"Bot {self.bot_token}"
-
-        headers = {"Authorization": auth_header}
+        # Determine which token to use (requests sets the multipart boundary)
+        if access_token:
+            headers = {"Authorization": f"Bearer {access_token}"}
+        else:
+            headers = self._bot_headers_multipart
 
         # Prepare multipart form data
         files = {"file": (filename, file_response.content)}
@@ -231,10 +380,10 @@ class DiscordMessenger:
             data["content"] = content
 
         url = f"{self.api_base}/channels/{channel_id}/messages"
-        response = requests.post(url, headers=headers, files=files, data=data)
+        response = self._session.post(url, headers=headers, files=files, data=data)
         response.raise_for_status()
 
-        return response.json()
+        return _loads(response)
 
     def create_embed(
         self,
@@ -340,12 +489,12 @@ if __name__ == "__main__":
     # print(f'User: {user_info["username"]}')
 
     # Messaging example
-    messenger = DiscordMessenger()
-
-    # Create an embed for a GIF
-    # messenger.send_gif_embed(
-    #     channel_id='1234567890',
-    #     gif_url='https://example.com/awesome.gif',
-    #     title='Awesome GIF!',
-    #     description='Check out this cool GIF'
-    # )
+    with DiscordMessenger() as messenger:
+        # Send an embed for a GIF
+        # messenger.send_gif_embed(
+        #     channel_id='1234567890',
+        #     gif_url='https://example.com/awesome.gif',
+        #     title='Awesome GIF!',
+        #     description='Check out this cool GIF'
+        # )
+        pass
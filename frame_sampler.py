@@ -13,7 +13,6 @@ Features:
 import io
 import os
 import subprocess
-import tempfile
 from pathlib import Path
 from typing import List, Optional, Tuple, Union, BinaryIO
 from dataclasses import dataclass
@@ -174,6 +173,36 @@ class FrameSampler:
         except (subprocess.CalledProcessError, ValueError) as e:
             raise RuntimeError(f"Failed to get video info: {e}")
 
+    @staticmethod
+    def get_video_dimensions(file_path: str) -> Tuple[int, int]:
+        """
+        Get video frame width and height using ffprobe
+
+        Args:
+            file_path: Path to video file
+
+        Returns:
+            Tuple of (width, height)
+        """
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=width,height",
+            "-of",
+            "csv=p=0:s=x",
+            file_path,
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            width, height = result.stdout.strip().split("x")[:2]
+            return int(width), int(height)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            raise RuntimeError(f"Failed to get video dimensions: {e}")
+
     @staticmethod
     def calculate_frame_indices(total_frames: int, num_samples: int) -> List[int]:
         """
@@ -287,73 +316,78 @@ class FrameSampler:
         total_frames, duration_ms = FrameSampler.get_video_info(file_path)
         indices = FrameSampler.calculate_frame_indices(total_frames, num_frames)
 
+        width, height = FrameSampler.get_video_dimensions(file_path)
+        frame_size = width * height * 3
+
+        if output_format == OutputFormat.FILE:
+            if not output_dir:
+                raise ValueError("output_dir required for FILE output format")
+            os.makedirs(output_dir, exist_ok=True)
+
         frames = []
         frame_info = []
 
-        # Create temp directory for extraction
-        with tempfile.TemporaryDirectory() as temp_dir:
-            for idx in indices:
-                # Calculate timestamp
-                timestamp_ms = (
-                    (idx / total_frames) * duration_ms if total_frames > 0 else 0
+        for idx in indices:
+            # Calculate timestamp
+            timestamp_ms = (idx / total_frames) * duration_ms if total_frames > 0 else 0
+            timestamp_sec = timestamp_ms / 1000
+
+            # Decode the frame straight to raw RGB on stdout, skipping the
+            # PNG encode in ffmpeg and the decode in PIL
+            cmd = [
+                "ffmpeg",
+                "-ss",
+                str(timestamp_sec),
+                "-i",
+                file_path,
+                "-frames:v",
+                "1",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgb24",
+                "-s",
+                f"{width}x{height}",
+                "-",
+            ]
+
+            try:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    check=True,
+                    creationflags=(
+                        subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+                    ),
                 )
-                timestamp_sec = timestamp_ms / 1000
-
-                # Extract frame using ffmpeg
-                temp_frame = os.path.join(temp_dir, f"frame_{idx}.png")
-                cmd = [
-                    "ffmpeg",
-                    "-ss",
-                    str(timestamp_sec),
-                    "-i",
-                    file_path,
-                    "-frames:v",
-                    "1",
-                    "-y",
-                    temp_frame,
-                ]
-
-                try:
-                    subprocess.run(
-                        cmd,
-                        capture_output=True,
-                        check=True,
-                        creationflags=(
-                            subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
-                        ),
-                    )
-                except subprocess.CalledProcessError as e:
-                    raise RuntimeError(f"ffmpeg failed: {e.stderr.decode()}")
-
-                # Load and process frame
-                with Image.open(temp_frame) as frame:
-                    frame = frame.convert("RGB")
-
-                    info = FrameInfo(
-                        index=idx,
-                        timestamp_ms=timestamp_ms,
-                        width=frame.width,
-                        height=frame.height,
-                        format="RGB",
-                    )
-                    frame_info.append(info)
-
-                    if output_format == OutputFormat.PIL_IMAGE:
-                        frames.append(frame.copy())
-                    elif output_format == OutputFormat.BYTES:
-                        buffer = io.BytesIO()
-                        frame.save(buffer, format="PNG")
-                        frames.append(buffer.getvalue())
-                    elif output_format == OutputFormat.FILE:
-                        if not output_dir:
-                            raise ValueError(
-                                "output_dir required for FILE output format"
-                            )
-                        os.makedirs(output_dir, exist_ok=True)
-                        filename = f"frame_{idx:04d}.png"
-                        filepath = os.path.join(output_dir, filename)
-                        frame.save(filepath, format="PNG")
-                        frames.append(filepath)
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"ffmpeg failed: {e.stderr.decode()}")
+
+            if len(result.stdout) < frame_size:
+                raise RuntimeError(f"ffmpeg returned no frame at {timestamp_sec:.3f}s")
+
+            frame = Image.frombytes("RGB", (width, height), result.stdout[:frame_size])
+
+            info = FrameInfo(
+                index=idx,
+                timestamp_ms=timestamp_ms,
+                width=width,
+                height=height,
+                format="RGB",
+            )
+            frame_info.append(info)
+
+            if output_format == OutputFormat.PIL_IMAGE:
+                frames.append(frame)
+            elif output_format == OutputFormat.BYTES:
+                buffer = io.BytesIO()
+                frame.save(buffer, format="PNG")
+                frames.append(buffer.getvalue())
+            elif output_format == OutputFormat.FILE:
+                filename = f"frame_{idx:04d}.png"
+                filepath = os.path.join(output_dir, filename)
+                frame.save(filepath, format="PNG")
+                frames.append(filepath)
 
         return SamplerResult(
             frames=frames,
@@ -4,12 +4,14 @@ Provides channel management and programmatic upload integration with GIPHY API
 Issue: #12
 """
 
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import json
+from functools import lru_cache
+import asyncio
 import hashlib
 import time
+from urllib.parse import quote
 
 
 class GiphyContentRating(Enum):
@@ -21,6 +23,10 @@ class GiphyContentRating(Enum):
     R = "r"  # Restricted (not supported in SFW-only mode)
 
 
+# Plain-dict lookup for rating strings, cheaper than Enum.value per upload
+_RATING_VALUE = {rating: rating.value for rating in GiphyContentRating}
+
+
 class GiphyChannelType(Enum):
     """GIPHY channel types"""
 
@@ -29,7 +35,7 @@ class GiphyChannelType(Enum):
     COMMUNITY = "community"  # Community channel
 
 
-@dataclass
+@dataclass(slots=True)
 class GiphyUploadMetadata:
     """Metadata for a GIPHY upload"""
 
@@ -43,7 +49,7 @@ class GiphyUploadMetadata:
     is_private: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GiphyChannel:
     """GIPHY channel configuration"""
 
@@ -57,7 +63,7 @@ class GiphyChannel:
     is_verified: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GiphyUploadResult:
     """Result of a GIPHY upload operation"""
 
@@ -69,6 +75,80 @@ class GiphyUploadResult:
     status_code: Optional[int] = None
 
 
+# Ratings accepted in SFW-only mode
+_SFW_RATINGS = frozenset({GiphyContentRating.G, GiphyContentRating.PG})
+
+# Bucket count for the mock per-tag search estimate
+_TAG_REACH_BUCKETS = 15000
+
+# Public URL prefixes, concatenated with IDs instead of formatted per call
+_GIFS_PREFIX = "https://giphy.com/gifs/"
+_EMBED_PREFIX = "https://giphy.com/embed/"
+_SEARCH_PREFIX = "https://giphy.com/search/"
+
+# Space-to-hyphen table for tag normalization, built once
+_TAG_TRANS = str.maketrans({" ": "-"})
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_tag_tuple(tags: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Sanitize a tag tuple, memoized because batches often share tag suites
+
+    Args:
+        tags: Raw tags
+
+    Returns:
+        Lowercased, hyphenated, deduplicated tags in original order
+    """
+    sanitized = []
+    seen = set()
+    add = sanitized.append
+
+    for tag in tags:
+        # GIPHY tags are lowercase with hyphens; dedupe on the final form
+        tag = tag.strip().lower().translate(_TAG_TRANS)
+
+        if tag and tag not in seen:
+            seen.add(tag)
+            add(tag)
+
+    return tuple(sanitized)
+
+
+@lru_cache(maxsize=4096)
+def _joined_tag_string(tags: Tuple[str, ...]) -> str:
+    """Comma-joined sanitized tags as sent in the upload payload"""
+    return ",".join(_sanitize_tag_tuple(tags))
+
+
+class _TTLCache:
+    """Small key/value cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl_ns = int(ttl_seconds * 1_000_000_000)
+        self._entries: Dict = {}
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_ns, value = entry
+        if time.monotonic_ns() >= expires_ns:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key, value) -> None:
+        """Cache a value for the TTL"""
+        self._entries[key] = (time.monotonic_ns() + self._ttl_ns, value)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+
+
 class GiphyPublisher:
     """
     Handles publishing GIFs to GIPHY via their Upload API
@@ -80,6 +160,18 @@ class GiphyPublisher:
     4. Handle response and track upload status
     """
 
+    __slots__ = (
+        "api_key",
+        "username",
+        "base_url",
+        "sfw_only",
+        "app_name",
+        "channels",
+        "_trending_cache",
+        "_user_stats_cache",
+        "_key_bytes",
+    )
+
     def __init__(
         self,
         api_key: str,
@@ -103,6 +195,13 @@ class GiphyPublisher:
         self.app_name = "GIFDistributor"
         self.channels: Dict[str, GiphyChannel] = {}
 
+        # BLAKE2b keys are limited to 64 bytes
+        self._key_bytes = (api_key or "").encode("utf-8")[:64]
+
+        # Short-lived caches for dashboard-style polling of remote lookups
+        self._trending_cache = _TTLCache(60)
+        self._user_stats_cache = _TTLCache(30)
+
     def validate_metadata(
         self, metadata: GiphyUploadMetadata
     ) -> tuple[bool, Optional[str]]:
@@ -115,43 +214,69 @@ class GiphyPublisher:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        is_valid, error_msg, _ = self._validate_and_sanitize(metadata)
+        return is_valid, error_msg
+
+    def _validate_and_sanitize(
+        self, metadata: GiphyUploadMetadata
+    ) -> Tuple[bool, Optional[str], Tuple[str, ...]]:
+        """
+        Validate metadata and sanitize its tags in the same pass
+
+        Args:
+            metadata: Upload metadata to validate
+
+        Returns:
+            Tuple of (is_valid, error_message, sanitized_tags)
+        """
         # Check media URL
         if not metadata.media_url or not metadata.media_url.startswith("http"):
-            return False, "Invalid media URL"
+            return False, "Invalid media URL", ()
 
         # Check title
         if not metadata.title or len(metadata.title.strip()) == 0:
-            return False, "Title is required"
+            return False, "Title is required", ()
 
         if len(metadata.title) > 140:
-            return False, "Title must be 140 characters or less"
+            return False, "Title must be 140 characters or less", ()
 
         # Check tags
-        if not metadata.tags or len(metadata.tags) == 0:
-            return False, "At least one tag is required"
+        tags = metadata.tags
+        if not tags:
+            return False, "At least one tag is required", ()
 
-        if len(metadata.tags) > 25:
-            return False, "Maximum 25 tags allowed"
+        if len(tags) > 25:
+            return False, "Maximum 25 tags allowed", ()
 
-        # Validate tag content
-        for tag in metadata.tags:
-            if not tag or len(tag.strip()) == 0:
-                return False, "Empty tags are not allowed"
+        # Validate tag content while normalizing and deduplicating
+        sanitized = []
+        seen = set()
+        add = sanitized.append
+        for tag in tags:
+            stripped = tag.strip() if tag else ""
+            if not stripped:
+                return False, "Empty tags are not allowed", ()
             if len(tag) > 50:
-                return False, f"Tag '{tag}' exceeds 50 character limit"
+                return False, f"Tag '{tag}' exceeds 50 character limit", ()
+
+            normalized = stripped.lower().translate(_TAG_TRANS)
+            if normalized not in seen:
+                seen.add(normalized)
+                add(normalized)
 
         # Check content rating for SFW-only mode
-        if self.sfw_only and metadata.content_rating not in [
-            GiphyContentRating.G,
-            GiphyContentRating.PG,
-        ]:
-            return False, "Only G or PG rated content is allowed in SFW-only mode"
+        if self.sfw_only and metadata.content_rating not in _SFW_RATINGS:
+            return (
+                False,
+                "Only G or PG rated content is allowed in SFW-only mode",
+                (),
+            )
 
         # Validate channel if specified
         if metadata.channel_id and metadata.channel_id not in self.channels:
-            return False, f"Channel '{metadata.channel_id}' not found"
+            return False, f"Channel '{metadata.channel_id}' not found", ()
 
-        return True, None
+        return True, None, tuple(sanitized)
 
     def sanitize_tags(self, tags: List[str]) -> List[str]:
         """
@@ -163,31 +288,7 @@ class GiphyPublisher:
         Returns:
             Sanitized list of tags
         """
-        sanitized = []
-        seen = set()
-
-        for tag in tags:
-            # Strip whitespace
-            tag = tag.strip()
-
-            # Skip empty tags
-            if not tag:
-                continue
-
-            # Convert to lowercase for deduplication
-            tag_lower = tag.lower()
-
-            # Skip duplicates
-            if tag_lower in seen:
-                continue
-
-            # GIPHY tags are typically lowercase with hyphens
-            tag = tag_lower.replace(" ", "-")
-
-            seen.add(tag)
-            sanitized.append(tag)
-
-        return sanitized
+        return list(_sanitize_tag_tuple(tuple(tags)))
 
     def create_channel(self, channel: GiphyChannel) -> bool:
         """
@@ -205,6 +306,7 @@ class GiphyPublisher:
 
         # Store channel configuration
         self.channels[channel.channel_id] = channel
+        self._user_stats_cache.clear()  # channel_count changed
         return True
 
     def get_channel(self, channel_id: str) -> Optional[GiphyChannel]:
@@ -228,39 +330,40 @@ class GiphyPublisher:
         """
         return list(self.channels.values())
 
-    def build_upload_payload(self, metadata: GiphyUploadMetadata) -> Dict:
+    def build_upload_payload(
+        self,
+        metadata: GiphyUploadMetadata,
+        sanitized_tags: Optional[Tuple[str, ...]] = None,
+    ) -> Dict:
         """
         Build the upload payload for GIPHY API
 
         Args:
             metadata: Upload metadata
+            sanitized_tags: Tags already sanitized during validation (optional)
 
         Returns:
             Dictionary containing the upload payload
         """
-        payload = {
-            "source_image_url": metadata.media_url,
-            "title": metadata.title.strip(),
-            "tags": ",".join(self.sanitize_tags(metadata.tags)),
-            "rating": metadata.content_rating.value,
-            "api_key": self.api_key,
-            "username": self.username,
-        }
-
-        # Add optional fields
-        if metadata.source_url:
-            payload["source_post_url"] = metadata.source_url
-
-        if metadata.channel_id:
-            payload["channel_id"] = metadata.channel_id
-
-        if metadata.is_hidden:
-            payload["is_hidden"] = "true"
-
-        if metadata.is_private:
-            payload["is_private"] = "true"
-
-        return payload
+        if sanitized_tags is None:
+            tags = _joined_tag_string(tuple(metadata.tags))
+        else:
+            tags = ",".join(sanitized_tags)
+
+        # Optional fields are None when unset and filtered out in one pass
+        candidates = (
+            ("source_image_url", metadata.media_url),
+            ("title", metadata.title.strip()),
+            ("tags", tags),
+            ("rating", _RATING_VALUE[metadata.content_rating]),
+            ("api_key", self.api_key),
+            ("username", self.username),
+            ("source_post_url", metadata.source_url or None),
+            ("channel_id", metadata.channel_id or None),
+            ("is_hidden", "true" if metadata.is_hidden else None),
+            ("is_private", "true" if metadata.is_private else None),
+        )
+        return {key: value for key, value in candidates if value is not None}
 
     def upload(self, metadata: GiphyUploadMetadata) -> GiphyUploadResult:
         """
@@ -272,23 +375,23 @@ class GiphyPublisher:
         Returns:
             GiphyUploadResult with upload status
         """
-        # Validate metadata
-        is_valid, error_msg = self.validate_metadata(metadata)
+        # Validate metadata, keeping the sanitized tags for the payload
+        is_valid, error_msg, sanitized_tags = self._validate_and_sanitize(metadata)
         if not is_valid:
             return GiphyUploadResult(
                 success=False, error_message=f"Validation failed: {error_msg}"
             )
 
         # Build payload
-        payload = self.build_upload_payload(metadata)
+        payload = self.build_upload_payload(metadata, sanitized_tags)
 
         # In a real implementation, this would call the GIPHY API
         # For now, we'll simulate a successful upload
 
         # Generate a mock GIPHY ID
         giphy_id = self._generate_mock_id(metadata.media_url)
-        giphy_url = f"https://giphy.com/gifs/{giphy_id}"
-        embed_url = f"https://giphy.com/embed/{giphy_id}"
+        giphy_url = _GIFS_PREFIX + giphy_id
+        embed_url = _EMBED_PREFIX + giphy_id
 
         return GiphyUploadResult(
             success=True,
@@ -308,10 +411,12 @@ class GiphyPublisher:
         Returns:
             Mock GIPHY ID
         """
-        # Create a hash-based ID similar to GIPHY's format
-        hash_input = f"{media_url}{time.time()}".encode("utf-8")
-        hash_value = hashlib.sha256(hash_input).hexdigest()[:16]
-        return hash_value
+        # Create a hash-based ID similar to GIPHY's format. A 64-bit BLAKE2b
+        # digest keyed by the API key namespaces IDs per account
+        h = hashlib.blake2b(digest_size=8, key=self._key_bytes)
+        h.update(media_url.encode("utf-8"))
+        h.update(time.time_ns().to_bytes(8, "little"))
+        return h.hexdigest()
 
     def check_upload_status(self, giphy_id: str) -> Dict:
         """
@@ -327,7 +432,7 @@ class GiphyPublisher:
         return {
             "giphy_id": giphy_id,
             "status": "published",
-            "url": f"https://giphy.com/gifs/{giphy_id}",
+            "url": _GIFS_PREFIX + giphy_id,
             "views": 0,
             "favorites": 0,
             "import_datetime": time.time(),
@@ -344,8 +449,9 @@ class GiphyPublisher:
         Returns:
             GIPHY search URL
         """
-        search_query = " ".join(tags)
-        return f"https://giphy.com/search/{search_query.replace(' ', '-')}"
+        # Spaces inside a tag become hyphens too; quote anything else unsafe
+        search_query = "-".join(tags).translate(_TAG_TRANS)
+        return _SEARCH_PREFIX + quote(search_query, safe="")
 
     def format_tags_for_giphy(
         self, tags: List[str], include_platform_tags: bool = True
@@ -378,8 +484,9 @@ class GiphyPublisher:
         Returns:
             Dictionary with estimated metrics
         """
-        # Mock implementation - in reality would query GIPHY analytics
-        total_searches = sum(hash(tag) % 15000 for tag in tags)
+        # Mock implementation - in reality would query GIPHY analytics.
+        # Chained map() over C builtins keeps the reduction out of Python frames
+        total_searches = sum(map(_TAG_REACH_BUCKETS.__rmod__, map(hash, tags)))
 
         return {
             "estimated_monthly_searches": total_searches,
@@ -394,6 +501,8 @@ class GiphyPublisher:
         """
         Upload multiple GIFs in batch
 
+        Duplicate metadata entries are uploaded once and share the result.
+
         Args:
             uploads: List of upload metadata
 
@@ -401,31 +510,89 @@ class GiphyPublisher:
             List of upload results
         """
         results = []
+        seen: Dict[tuple, GiphyUploadResult] = {}
 
         for metadata in uploads:
-            result = self.upload(metadata)
+            # Identical submissions (re-uploads, fan-out) share one upload
+            key = self._upload_key(metadata)
+            result = seen.get(key)
+            if result is None:
+                result = seen[key] = self.upload(metadata)
             results.append(result)
 
         return results
 
+    async def batch_upload_async(
+        self, uploads: List[GiphyUploadMetadata], concurrency: int = 16
+    ) -> List[GiphyUploadResult]:
+        """
+        Upload multiple GIFs with a bounded number in flight
+
+        Each upload runs in a worker thread so blocking HTTP calls overlap.
+        Duplicate metadata entries are uploaded once and share the result.
+
+        Args:
+            uploads: List of upload metadata
+            concurrency: Maximum concurrent uploads
+
+        Returns:
+            List of upload results, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks: Dict[tuple, asyncio.Task] = {}
+
+        async def _upload_one(metadata: GiphyUploadMetadata) -> GiphyUploadResult:
+            async with semaphore:
+                return await asyncio.to_thread(self.upload, metadata)
+
+        ordered = []
+        for metadata in uploads:
+            key = self._upload_key(metadata)
+            task = tasks.get(key)
+            if task is None:
+                task = tasks[key] = asyncio.ensure_future(_upload_one(metadata))
+            ordered.append(task)
+
+        return list(await asyncio.gather(*ordered))
+
+    @staticmethod
+    def _upload_key(metadata: GiphyUploadMetadata) -> tuple:
+        """Key identifying metadata that would produce the same upload"""
+        return (
+            metadata.media_url,
+            metadata.title,
+            tuple(metadata.tags),
+            metadata.source_url,
+            metadata.content_rating,
+            metadata.channel_id,
+            metadata.is_hidden,
+            metadata.is_private,
+        )
+
     def get_user_stats(self) -> Dict:
         """
-        Get statistics for the user account
+        Get statistics for the user account (cached for 30 seconds)
 
         Returns:
             Dictionary with user statistics
         """
-        # Mock implementation
-        return {
-            "username": self.username,
-            "total_uploads": 0,
-            "total_views": 0,
-            "total_favorites": 0,
-            "follower_count": 0,
-            "channel_count": len(self.channels),
-            "top_tags": [],
-            "upload_limit_remaining": 5000,
-        }
+        stats = self._user_stats_cache.get(self.username)
+        if stats is None:
+            # Mock implementation
+            stats = {
+                "username": self.username,
+                "total_uploads": 0,
+                "total_views": 0,
+                "total_favorites": 0,
+                "follower_count": 0,
+                "channel_count": len(self.channels),
+                "top_tags": [],
+                "upload_limit_remaining": 5000,
+            }
+            self._user_stats_cache.set(self.username, stats)
+
+        # Only top_tags is mutable; a shallow copy plus a fresh list suffices
+        return {**stats, "top_tags": list(stats["top_tags"])}
 
     def get_channel_stats(self, channel_id: str) -> Optional[Dict]:
         """
@@ -496,7 +663,7 @@ class GiphyPublisher:
 
     def get_trending_tags(self, limit: int = 10) -> List[str]:
         """
-        Get currently trending tags on GIPHY
+        Get currently trending tags on GIPHY (cached for 60 seconds)
 
         Args:
             limit: Maximum number of tags to return
@@ -504,19 +671,24 @@ class GiphyPublisher:
         Returns:
             List of trending tags
         """
-        # Mock implementation - would call GIPHY trending API
-        return [
-            "reaction",
-            "funny",
-            "love",
-            "happy",
-            "birthday",
-            "excited",
-            "thumbs-up",
-            "dancing",
-            "celebrate",
-            "wow",
-        ][:limit]
+        tags = self._trending_cache.get(limit)
+        if tags is None:
+            # Mock implementation - would call GIPHY trending API
+            tags = [
+                "reaction",
+                "funny",
+                "love",
+                "happy",
+                "birthday",
+                "excited",
+                "thumbs-up",
+                "dancing",
+                "celebrate",
+                "wow",
+            ][:limit]
+            self._trending_cache.set(limit, tags)
+
+        return list(tags)
 
     def search_similar_gifs(self, giphy_id: str, limit: int = 5) -> List[Dict]:
         """
@@ -534,7 +706,7 @@ class GiphyPublisher:
             {
                 "giphy_id": f"similar-{i}",
                 "title": f"Similar GIF {i}",
-                "url": f"https://giphy.com/gifs/similar-{i}",
+                "url": f"{_GIFS_PREFIX}similar-{i}",
             }
             for i in range(limit)
         ]
@@ -13,18 +13,32 @@ Features:
 - Resource limits and timeout handling
 """
 
+import asyncio
+import heapq
+import itertools
 import os
+import shutil
+import sqlite3
 import subprocess
 import threading
 import time
 import uuid
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from queue import PriorityQueue, Empty
-from typing import Dict, List, Optional, Callable, Any
+from multiprocessing import shared_memory
+from queue import Empty
+from functools import lru_cache
+from typing import Dict, List, Optional, Callable, Any, Sequence, Tuple
 import json
 
+# orjson is an optional speedup; fall back to the stdlib when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class JobStatus(Enum):
     """Job execution status"""
@@ -36,6 +50,10 @@ class JobStatus(Enum):
     CANCELLED = "cancelled"
 
 
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted to a queue at its admission limit"""
+
+
 class JobPriority(Enum):
     """Job priority levels (lower number = higher priority)"""
 
@@ -53,7 +71,7 @@ class MediaJob:
     job_type: str  # 'transcode', 'frame_sample', 'thumbnail', etc.
     input_path: str
     output_path: str
-    ffmpeg_args: List[str]
+    ffmpeg_args: Sequence[str]
     priority: JobPriority = JobPriority.NORMAL
     status: JobStatus = JobStatus.PENDING
     created_at: datetime = field(default_factory=datetime.now)
@@ -64,11 +82,26 @@ class MediaJob:
     max_retries: int = 3
     timeout_seconds: int = 300
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Monotonic perf_counter_ns() stamps for durations; the datetime fields
+    # above are wall-clock and only meant for display
+    started_ns: Optional[int] = field(default=None, repr=False)
+    completed_ns: Optional[int] = field(default=None, repr=False)
+    # Guards status/started_at/completed_at transitions for this job only
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     def __lt__(self, other):
         """Compare jobs by priority for PriorityQueue"""
         return self.priority.value < other.priority.value
 
+    @property
+    def duration_ns(self) -> Optional[int]:
+        """Run time in nanoseconds, or None until the job has finished"""
+        if self.started_ns is None or self.completed_ns is None:
+            return None
+        return self.completed_ns - self.started_ns
+
 
 @dataclass
 class WorkerMetrics:
@@ -83,12 +116,236 @@ class WorkerMetrics:
     queue_size: int = 0
 
 
+# Number of trailing ffmpeg stderr lines kept for error reporting
+_STDERR_TAIL_LINES = 256
+# Byte budget for the same tail when stderr is read in raw chunks
+_STDERR_TAIL_BYTES = 16 * 1024
+
+_TERMINAL_STATUSES = frozenset(
+    {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+)
+
+
+def _drain_pipe(pipe, sink):
+    """Read a text pipe to EOF, appending each line to sink"""
+    with pipe:
+        for line in pipe:
+            sink.append(line)
+
+
+def _discard_shm(shm: shared_memory.SharedMemory) -> None:
+    """Destroy a shared memory block this process created and failed to fill"""
+    shm.unlink()
+    try:
+        shm.close()
+    except BufferError:
+        # A view is still referenced (e.g. by a traceback being raised); the
+        # mapping is released when it is collected, and the name is gone
+        pass
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON with orjson when available (its errors subclass the stdlib's)"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _probe_cache_key(kind: str, file_path: str) -> Optional[tuple]:
+    """Cache key for a probe of a local file, or None if it can't be stat'ed"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (kind, file_path, st.st_mtime_ns, st.st_size)
+
+
+def _parse_number(value: Optional[str], kind: Callable[[str], Any]) -> Any:
+    """Convert an ffprobe scalar, mapping missing or 'N/A' values to None"""
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_frame_rate(value: Optional[str]) -> Optional[float]:
+    """Convert an ffprobe rational such as '30000/1001' to frames per second"""
+    if not value:
+        return None
+    num, _, den = value.partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _select_at_times(times: Sequence[float]) -> str:
+    """ffmpeg select expression keeping the first frame at/after each time"""
+    return "+".join(
+        f"gte(pts*TB,{t})*(isnan(prev_pts)+lt(prev_pts*TB,{t}))" for t in times
+    )
+
+
+def _record_job_outputs(job: MediaJob) -> None:
+    """
+    Record the files a successful thumbnail batch job actually wrote
+
+    A pts-based select emits fewer frames than requested when timestamps
+    share a frame or fall past the end of the input, so the numbered outputs
+    are listed from disk rather than predicted from the timestamps. Files
+    older than the job (left by an earlier run) end the listing.
+
+    Args:
+        job: Job that has just finished successfully
+    """
+    if job.job_type != "thumbnail_batch":
+        return
+    # Allow for filesystems with coarse (up to 2s) modification times
+    started = job.started_at.timestamp() - 2 if job.started_at else 0.0
+    output_paths = []
+    for index in range(1, len(job.metadata.get("timestamps", ())) + 1):
+        path = job.output_path % index
+        try:
+            if os.stat(path).st_mtime < started:
+                break
+        except OSError:
+            break
+        output_paths.append(path)
+    job.metadata["output_paths"] = output_paths
+
+
+class _PriorityJobQueue:
+    """
+    Job queue with one FIFO deque per JobPriority
+
+    Mirrors the subset of queue.PriorityQueue used by workers (put, get,
+    qsize, task_done, join), but enqueue/dequeue are O(1) and jobs of equal
+    priority are served in submission order. Blocked getters are woken
+    LIFO, so the most recently active worker takes new work and the rest
+    stay idle long enough for the autoscaler to retire them.
+    """
+
+    def __init__(self):
+        self._deques = [deque() for _ in JobPriority]
+        self._lock = threading.Lock()
+        # Per-getter wakeup locks, most recently parked first
+        self._idle: deque = deque()
+        self._all_done = threading.Condition(self._lock)
+        self._unfinished = 0
+
+    def _has_jobs(self) -> bool:
+        return any(self._deques)
+
+    def put(self, job: MediaJob, deferred: bool = False):
+        """
+        Enqueue a job
+
+        Args:
+            job: Job to enqueue
+            deferred: The job was already counted by defer(), so it must not
+                be counted again for join()
+        """
+        with self._lock:
+            self._deques[job.priority.value - 1].append(job)
+            if not deferred:
+                self._unfinished += 1
+            if self._idle:
+                self._idle.popleft().release()
+
+    def get(
+        self,
+        timeout: Optional[float] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> MediaJob:
+        """
+        Pop the oldest job of the highest non-empty priority
+
+        Args:
+            timeout: Seconds to wait for a job (None blocks indefinitely)
+            stop: Predicate re-checked on every wakeup; when it returns True
+                the call gives up instead of waiting for work
+
+        Raises:
+            Empty: If no job arrived before the timeout or stop fired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while not self._has_jobs():
+                if stop is not None and stop():
+                    raise Empty
+                remaining = -1 if deadline is None else deadline - time.monotonic()
+                if deadline is not None and remaining <= 0:
+                    raise Empty
+
+                waiter = threading.Lock()
+                waiter.acquire()
+                self._idle.appendleft(waiter)
+                self._lock.release()
+                try:
+                    waiter.acquire(timeout=remaining)
+                finally:
+                    self._lock.acquire()
+                    # Still registered if we timed out rather than being woken
+                    try:
+                        self._idle.remove(waiter)
+                    except ValueError:
+                        pass
+
+            for jobs in self._deques:
+                if jobs:
+                    return jobs.popleft()
+
+    def qsize(self) -> int:
+        return sum(map(len, self._deques))
+
+    def wake_all(self):
+        """Wake every blocked getter so it can re-check its stop conditions"""
+        with self._lock:
+            while self._idle:
+                self._idle.popleft().release()
+
+    def defer(self):
+        """Count a job that will be put() later so join() waits for it"""
+        with self._lock:
+            self._unfinished += 1
+
+    def task_done(self):
+        with self._lock:
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._unfinished = 0
+                self._all_done.notify_all()
+
+    def join(self):
+        with self._lock:
+            while self._unfinished:
+                self._all_done.wait()
+
+
 class FFmpegRuntime:
     """ffmpeg binary manager and executor"""
 
-    def __init__(self, ffmpeg_path: str = "ffmpeg", ffprobe_path: str = "ffprobe"):
+    def __init__(
+        self,
+        ffmpeg_path: str = "ffmpeg",
+        ffprobe_path: str = "ffprobe",
+        probe_cache_size: int = 256,
+        threads_per_job: Optional[int] = None,
+    ):
         self.ffmpeg_path = ffmpeg_path
         self.ffprobe_path = ffprobe_path
+        self.probe_cache_size = probe_cache_size
+        # Caps ffmpeg's own threading so concurrent jobs don't each spawn a
+        # thread per core; None leaves ffmpeg's defaults alone
+        self.threads_per_job = threads_per_job
+        # LRU of ffprobe output keyed by (kind, path, st_mtime_ns, st_size),
+        # so a rewritten file misses instead of returning stale metadata
+        self._probe_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._probe_lock = threading.Lock()
+        # Absolute binary paths let subprocess launch via posix_spawn (vfork)
+        # instead of fork+exec, which copies the parent's page tables
+        self._ffmpeg_exe = shutil.which(ffmpeg_path) or ffmpeg_path
+        self._ffprobe_exe = shutil.which(ffprobe_path) or ffprobe_path
         self._validate_binaries()
 
     def _validate_binaries(self):
@@ -113,61 +370,342 @@ class FFmpegRuntime:
         ) as e:
             raise RuntimeError(f"ffmpeg/ffprobe not found or invalid: {e}")
 
+    def _with_thread_limits(self, args: Sequence[str]) -> Sequence[str]:
+        """
+        Apply threads_per_job to an ffmpeg argument list
+
+        Adds a global -filter_threads, plus -threads for the first input's
+        decoder and for the encoder (before the final, output argument),
+        unless the caller already set them.
+        """
+        if not self.threads_per_job or not args:
+            return args
+
+        n = str(self.threads_per_job)
+        prefix = [] if "-filter_threads" in args else ["-filter_threads", n]
+        if "-threads" in args:
+            return [*prefix, *args]
+        return [*prefix, "-threads", n, *args[:-1], "-threads", n, args[-1]]
+
     def execute_ffmpeg(
-        self, args: List[str], timeout_seconds: int = 300
+        self, args: Sequence[str], timeout_seconds: int = 300
     ) -> tuple[int, str, str]:
         """
         Execute ffmpeg command with timeout
 
+        stderr is streamed rather than buffered: only the last
+        _STDERR_TAIL_LINES lines are kept, so per-frame progress output from
+        long encodes cannot grow memory or fill the pipe and stall ffmpeg.
+
         Args:
             args: ffmpeg command arguments (without 'ffmpeg' itself)
             timeout_seconds: Command timeout in seconds
 
         Returns:
-            Tuple of (return_code, stdout, stderr)
+            Tuple of (return_code, stdout, stderr tail)
         """
-        cmd = [self.ffmpeg_path] + args
+        cmd = [self._ffmpeg_exe, *self._with_thread_limits(args)]
+
+        # close_fds=False is safe (Python fds are non-inheritable by default)
+        # and is required for CPython to use posix_spawn
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+            text=True,
+            errors="replace",
+        )
+        stdout_lines: List[str] = []
+        stderr_tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+        readers = [
+            threading.Thread(
+                target=_drain_pipe, args=(proc.stdout, stdout_lines), daemon=True
+            ),
+            threading.Thread(
+                target=_drain_pipe, args=(proc.stderr, stderr_tail), daemon=True
+            ),
+        ]
+        for reader in readers:
+            reader.start()
 
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout_seconds,
-                check=False,
-            )
-            return result.returncode, result.stdout, result.stderr
+            returncode = proc.wait(timeout=timeout_seconds)
         except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise TimeoutError(f"ffmpeg command timed out after {timeout_seconds}s")
+        finally:
+            for reader in readers:
+                reader.join()
+
+        return returncode, "".join(stdout_lines), "".join(stderr_tail)
+
+    async def execute_ffmpeg_async(
+        self, args: Sequence[str], timeout_seconds: int = 300
+    ) -> tuple[int, str, str]:
+        """
+        Execute ffmpeg on the running event loop
+
+        Same contract as execute_ffmpeg, but waiting on the child costs no
+        thread, so many jobs can be in flight from a single loop.
+
+        Args:
+            args: ffmpeg command arguments (without 'ffmpeg' itself)
+            timeout_seconds: Command timeout in seconds
+
+        Returns:
+            Tuple of (return_code, stdout, stderr tail)
+        """
+        proc = await asyncio.create_subprocess_exec(
+            self._ffmpeg_exe,
+            *self._with_thread_limits(args),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+        )
+        stderr_tail = bytearray()
+
+        async def drain_stderr():
+            # Read raw chunks: progress lines end in \r, so line-based reads
+            # could hit the StreamReader limit on a long encode
+            while chunk := await proc.stderr.read(4096):
+                stderr_tail.extend(chunk)
+                del stderr_tail[:-_STDERR_TAIL_BYTES]
+
+        try:
+            stdout, _, returncode = await asyncio.wait_for(
+                asyncio.gather(proc.stdout.read(), drain_stderr(), proc.wait()),
+                timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
             raise TimeoutError(f"ffmpeg command timed out after {timeout_seconds}s")
 
+        return (
+            returncode,
+            stdout.decode(errors="replace"),
+            stderr_tail.decode(errors="replace"),
+        )
+
+    def extract_frames_shm(
+        self,
+        input_path: str,
+        timestamps: List[float],
+        width: int,
+        height: int,
+        timeout_seconds: int = 300,
+    ) -> Tuple[Optional[shared_memory.SharedMemory], int]:
+        """
+        Decode frames at the given timestamps straight into shared memory
+
+        ffmpeg writes rgb24 rawvideo to a pipe that is read directly into a
+        SharedMemory block, so no image files touch the disk. Frames are
+        stored back to back (frame i starts at i * width * height * 3);
+        other processes can attach with SharedMemory(name=shm.name), and
+        PIL's Image.frombuffer or numpy.frombuffer can view a frame without
+        copying. The caller owns the block and must close() and unlink() it.
+
+        Args:
+            input_path: Input media file path
+            timestamps: Frame positions in seconds
+            width: Output frame width
+            height: Output frame height
+            timeout_seconds: Command timeout in seconds
+
+        Returns:
+            Tuple of (shared memory block, number of frames written); the
+            block is None when there are no timestamps
+        """
+        times = sorted(set(timestamps))
+        if not times:
+            # SharedMemory cannot allocate a zero-size block
+            return None, 0
+        frame_size = width * height * 3
+        args = [
+            "-i",
+            input_path,
+            "-vf",
+            f"select='{_select_at_times(times)}',scale={width}:{height}",
+            "-vsync",
+            "0",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-",
+        ]
+
+        shm = shared_memory.SharedMemory(create=True, size=frame_size * len(times))
+        try:
+            proc = subprocess.Popen(
+                [self._ffmpeg_exe, *self._with_thread_limits(args)],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                close_fds=False,
+            )
+        except BaseException:
+            # e.g. ffmpeg missing or out of file descriptors; free the segment
+            _discard_shm(shm)
+            raise
+        stderr_tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+        reader = threading.Thread(
+            target=_drain_pipe, args=(proc.stderr, stderr_tail), daemon=True
+        )
+        reader.start()
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            proc.kill()
+
+        killer = threading.Timer(timeout_seconds, kill)
+        killer.start()
+
+        filled = 0
+        try:
+            with proc.stdout:
+                while filled < shm.size:
+                    n = proc.stdout.readinto(shm.buf[filled:])
+                    if not n:
+                        break
+                    filled += n
+            returncode = proc.wait()
+        except BaseException:
+            proc.kill()
+            proc.wait()  # Reap the child so it does not linger as a zombie
+            _discard_shm(shm)
+            raise
+        finally:
+            killer.cancel()
+            reader.join()
+
+        if returncode != 0:
+            _discard_shm(shm)
+            if timed_out.is_set():
+                raise TimeoutError(f"ffmpeg command timed out after {timeout_seconds}s")
+            stderr = b"".join(stderr_tail).decode(errors="replace")
+            raise RuntimeError(f"ffmpeg failed with code {returncode}: {stderr}")
+
+        return shm, filled // frame_size
+
     def probe_media(self, file_path: str) -> Dict[str, Any]:
         """
         Get media file information using ffprobe
 
+        Results for local files are cached until the file's mtime or size
+        changes; paths that cannot be stat'ed (e.g. URLs) are always probed.
+
         Args:
             file_path: Path to media file
 
         Returns:
             Dictionary with media metadata
         """
-        cmd = [
-            self.ffprobe_path,
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_format",
-            "-show_streams",
-            file_path,
-        ]
+        key = _probe_cache_key("full", file_path)
+        # The cache holds ffprobe's JSON text: re-parsing hands every caller
+        # its own dict and is cheaper than deep-copying the nested result
+        output = self._probe_cache_get(key)
+        if output is None:
+            output = self._run_ffprobe(
+                [
+                    "-v",
+                    "quiet",
+                    "-print_format",
+                    "json",
+                    "-show_format",
+                    "-show_streams",
+                    file_path,
+                ]
+            )
 
+        try:
+            info = _json_loads(output)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Failed to probe media file: {e}")
+
+        self._probe_cache_put(key, output)
+        return info
+
+    def probe_scalars(self, file_path: str) -> Dict[str, Any]:
+        """
+        Get the first video stream's size, frame rate and duration
+
+        A lighter alternative to probe_media when only these fields are
+        needed: ffprobe prints four key=value lines, so there is no JSON to
+        parse. Results share probe_media's cache.
+
+        Args:
+            file_path: Path to media file
+
+        Returns:
+            Dictionary with width, height, fps and duration (seconds);
+            values ffprobe reports as unknown are None
+        """
+        key = _probe_cache_key("scalars", file_path)
+        output = self._probe_cache_get(key)
+        if output is None:
+            output = self._run_ffprobe(
+                [
+                    "-v",
+                    "error",
+                    "-select_streams",
+                    "v:0",
+                    "-show_entries",
+                    "stream=width,height,r_frame_rate,duration",
+                    "-of",
+                    "default=noprint_wrappers=1",
+                    file_path,
+                ]
+            )
+
+        fields = dict(line.split("=", 1) for line in output.splitlines() if "=" in line)
+        scalars = {
+            "width": _parse_number(fields.get("width"), int),
+            "height": _parse_number(fields.get("height"), int),
+            "fps": _parse_frame_rate(fields.get("r_frame_rate")),
+            "duration": _parse_number(fields.get("duration"), float),
+        }
+
+        self._probe_cache_put(key, output)
+        return scalars
+
+    def _run_ffprobe(self, args: List[str]) -> str:
+        """Run ffprobe and return its stdout"""
         try:
             result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=30, check=True
+                [self._ffprobe_exe, *args],
+                capture_output=True,
+                close_fds=False,
+                text=True,
+                timeout=30,
+                check=True,
             )
-            return json.loads(result.stdout)
-        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Failed to probe media file: {e}")
+        return result.stdout
+
+    def _probe_cache_get(self, key: Optional[tuple]) -> Optional[str]:
+        if key is None:
+            return None
+        with self._probe_lock:
+            output = self._probe_cache.get(key)
+            if output is not None:
+                self._probe_cache.move_to_end(key)
+            return output
+
+    def _probe_cache_put(self, key: Optional[tuple], output: str):
+        if key is None or self.probe_cache_size <= 0:
+            return
+        with self._probe_lock:
+            self._probe_cache[key] = output
+            self._probe_cache.move_to_end(key)
+            while len(self._probe_cache) > self.probe_cache_size:
+                self._probe_cache.popitem(last=False)
 
 
 class MediaJobWorker(threading.Thread):
@@ -176,60 +714,88 @@ class MediaJobWorker(threading.Thread):
     def __init__(
         self,
         worker_id: int,
-        job_queue: PriorityQueue,
+        job_queue: _PriorityJobQueue,
         runtime: FFmpegRuntime,
         jobs_dict: Dict[str, MediaJob],
-        lock: threading.Lock,
         stop_event: threading.Event,
+        on_status_change: Optional[Callable[[MediaJob], None]] = None,
+        cpus: Optional[set] = None,
     ):
         super().__init__(daemon=True)
         self.worker_id = worker_id
         self.job_queue = job_queue
         self.runtime = runtime
         self.jobs_dict = jobs_dict
-        self.lock = lock
         self.stop_event = stop_event
+        self.on_status_change = on_status_change
+        # CPU set this thread (and the ffmpeg children it spawns) runs on
+        self.cpus = cpus
         self.current_job: Optional[MediaJob] = None
+        self.last_active = time.monotonic()
+        # Set by the autoscaler to retire this worker once it is idle
+        self.stop_self = False
 
     def run(self):
         """Worker main loop"""
-        while not self.stop_event.is_set():
+        if self.cpus:
+            # pid 0 is the calling thread on Linux; children inherit the mask
+            os.sched_setaffinity(0, self.cpus)
+
+        while not self._should_stop():
             try:
-                # Get job with timeout to allow checking stop_event
-                job = self.job_queue.get(timeout=1)
+                # Block until a job arrives or wake_all() signals a stop
+                job = self.job_queue.get(stop=self._should_stop)
+            except Empty:
+                continue
 
-                with self.lock:
-                    self.current_job = job
+            try:
+                with job._lock:
+                    # Skip jobs cancelled while they were queued
+                    if job.status != JobStatus.PENDING:
+                        continue
                     job.status = JobStatus.RUNNING
                     job.started_at = datetime.now()
+                    job.started_ns = time.perf_counter_ns()
+                self.current_job = job
+                self._notify(job)
 
                 # Process the job
                 success = self._process_job(job)
 
-                with self.lock:
+                with job._lock:
                     if success:
                         job.status = JobStatus.COMPLETED
                         job.completed_at = datetime.now()
+                        job.completed_ns = time.perf_counter_ns()
+                    elif job.retry_count < job.max_retries:
+                        # Back to PENDING; the queue schedules the re-run
+                        job.retry_count += 1
+                        job.status = JobStatus.PENDING
                     else:
                         job.status = JobStatus.FAILED
                         job.completed_at = datetime.now()
+                        job.completed_ns = time.perf_counter_ns()
+                self._notify(job)
 
-                    self.current_job = None
-
-                self.job_queue.task_done()
-
-            except Empty:
-                # No jobs available, continue loop
-                continue
             except Exception as e:
                 # Unexpected error
-                if self.current_job:
-                    with self.lock:
-                        self.current_job.status = JobStatus.FAILED
-                        self.current_job.error = f"Worker error: {str(e)}"
-                        self.current_job.completed_at = datetime.now()
-                        self.current_job = None
-                    self.job_queue.task_done()
+                with job._lock:
+                    job.status = JobStatus.FAILED
+                    job.error = f"Worker error: {str(e)}"
+                    job.completed_at = datetime.now()
+                    job.completed_ns = time.perf_counter_ns()
+                self._notify(job)
+            finally:
+                self.current_job = None
+                self.last_active = time.monotonic()
+                self.job_queue.task_done()
+
+    def _should_stop(self) -> bool:
+        return self.stop_event.is_set() or self.stop_self
+
+    def _notify(self, job: MediaJob):
+        if self.on_status_change is not None:
+            self.on_status_change(job)
 
     def _process_job(self, job: MediaJob) -> bool:
         """
@@ -250,6 +816,7 @@ class MediaJobWorker(threading.Thread):
                 job.error = f"ffmpeg failed with code {returncode}: {stderr}"
                 return False
 
+            _record_job_outputs(job)
             return True
 
         except TimeoutError as e:
@@ -279,6 +846,13 @@ class MediaJobQueue:
         max_workers: int = 10,
         scale_up_threshold: int = 5,
         scale_down_threshold: int = 2,
+        scale_down_ticks: int = 3,
+        db_path: Optional[str] = None,
+        max_queue_size: Optional[int] = None,
+        max_history: int = 10_000,
+        retry_backoff_seconds: float = 1.0,
+        threads_per_job: Optional[int] = None,
+        pin_workers: bool = False,
     ):
         """
         Initialize media job queue
@@ -290,22 +864,77 @@ class MediaJobQueue:
             max_workers: Maximum number of worker threads
             scale_up_threshold: Queue size to trigger scaling up
             scale_down_threshold: Queue size to trigger scaling down
+            scale_down_ticks: Consecutive autoscaler checks below
+                scale_down_threshold required before retiring a worker
+            db_path: Optional SQLite database for job state. When set, jobs
+                and metric counters are persisted (WAL mode) and jobs left
+                pending or running by a previous process are re-queued.
+            max_queue_size: Optional admission limit; submit_job raises
+                QueueFullError while this many jobs are waiting, so callers
+                can shed load or retry elsewhere instead of queueing forever
+            max_history: Maximum number of jobs kept in memory; beyond it
+                the oldest finished jobs are dropped (still retrievable via
+                get_job_status when db_path is set)
+            retry_backoff_seconds: Delay before a failed job's first retry;
+                doubles with each further retry, capped at 300 seconds
+            threads_per_job: ffmpeg threads per job; defaults to
+                cpu_count // max_workers so a full pool doesn't oversubscribe
+            pin_workers: Pin each worker (and its ffmpeg) to its own
+                threads_per_job-sized slice of CPUs (Linux only)
         """
-        self.runtime = FFmpegRuntime(ffmpeg_path, ffprobe_path)
+        if threads_per_job is None:
+            threads_per_job = max(1, (os.cpu_count() or 1) // max(1, max_workers))
+        self.runtime = FFmpegRuntime(
+            ffmpeg_path, ffprobe_path, threads_per_job=threads_per_job
+        )
+        self.pin_workers = pin_workers and hasattr(os, "sched_setaffinity")
         self.min_workers = min_workers
         self.max_workers = max_workers
         self.scale_up_threshold = scale_up_threshold
         self.scale_down_threshold = scale_down_threshold
-
-        self.job_queue = PriorityQueue()
+        self.scale_down_ticks = scale_down_ticks
+        self.max_queue_size = max_queue_size
+        self.max_history = max_history
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._scale_down_streak = 0
+        self._worker_ids = itertools.count()
+
+        self.job_queue = _PriorityJobQueue()
         self.jobs: Dict[str, MediaJob] = {}
+        # Finished job ids in completion order; the eviction order for jobs
+        self._finished_ids: deque = deque()
+        # Failed jobs waiting out their backoff: (ready_at_ns, seq, job)
+        self._delay_heap: List[Tuple[int, int, MediaJob]] = []
+        self._delay_seq = itertools.count()
+        self._delay_cv = threading.Condition()
         self.workers: List[MediaJobWorker] = []
-        self.lock = threading.Lock()
+        # Separate locks so submitters, status readers and the autoscaler
+        # don't serialize on each other; job status uses MediaJob._lock
+        self._jobs_lock = threading.Lock()
+        self._scale_lock = threading.Lock()
         self.stop_event = threading.Event()
         self.metrics = WorkerMetrics()
 
+        # Running totals updated at each terminal transition so get_metrics
+        # never has to walk the job history
+        self._counters_lock = threading.Lock()
+        self._processed_count = 0
+        self._failed_count = 0
+        self._retried_count = 0
+        self._duration_sum_ns = 0
+        self._duration_count = 0
+
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path is not None:
+            self._init_database()
+            self._load_counters()
+            self._restore_jobs()
+
         # Start initial workers
-        self._scale_workers(self.min_workers)
+        with self._scale_lock:
+            self._scale_workers(self.min_workers)
 
         # Start autoscaler thread
         self.autoscaler_thread = threading.Thread(
@@ -313,15 +942,22 @@ class MediaJobQueue:
         )
         self.autoscaler_thread.start()
 
+        # Moves retried jobs back onto the queue once their backoff expires
+        self.retry_thread = threading.Thread(
+            target=self._retry_scheduler_loop, daemon=True
+        )
+        self.retry_thread.start()
+
     def submit_job(
         self,
         job_type: str,
         input_path: str,
         output_path: str,
-        ffmpeg_args: List[str],
+        ffmpeg_args: Sequence[str],
         priority: JobPriority = JobPriority.NORMAL,
         timeout_seconds: int = 300,
         metadata: Optional[Dict[str, Any]] = None,
+        max_retries: int = 0,
     ) -> str:
         """
         Submit a media processing job
@@ -334,10 +970,23 @@ class MediaJobQueue:
             priority: Job priority
             timeout_seconds: Job timeout
             metadata: Additional job metadata
+            max_retries: How many times a failed job is re-run, with
+                exponential backoff, before it is marked FAILED
 
         Returns:
             Job ID
+
+        Raises:
+            QueueFullError: If max_queue_size jobs are already waiting
         """
+        if (
+            self.max_queue_size is not None
+            and self.job_queue.qsize() >= self.max_queue_size
+        ):
+            raise QueueFullError(
+                f"Job queue is full ({self.max_queue_size} jobs waiting)"
+            )
+
         job_id = str(uuid.uuid4())
 
         job = MediaJob(
@@ -348,12 +997,13 @@ class MediaJobQueue:
             ffmpeg_args=ffmpeg_args,
             priority=priority,
             timeout_seconds=timeout_seconds,
+            max_retries=max_retries,
             metadata=metadata or {},
         )
 
-        with self.lock:
+        with self._jobs_lock:
             self.jobs[job_id] = job
-            self.metrics.queue_size += 1
+        self._persist_job(job)
 
         self.job_queue.put(job)
 
@@ -361,8 +1011,10 @@ class MediaJobQueue:
 
     def get_job_status(self, job_id: str) -> Optional[MediaJob]:
         """Get job status by ID"""
-        with self.lock:
-            return self.jobs.get(job_id)
+        job = self.jobs.get(job_id)
+        if job is None and self._db is not None:
+            job = self._load_job(job_id)
+        return job
 
     def cancel_job(self, job_id: str) -> bool:
         """
@@ -374,47 +1026,230 @@ class MediaJobQueue:
         Returns:
             True if cancelled, False if job not found or already running
         """
-        with self.lock:
-            job = self.jobs.get(job_id)
-            if job and job.status == JobStatus.PENDING:
-                job.status = JobStatus.CANCELLED
-                job.completed_at = datetime.now()
-                return True
+        job = self.jobs.get(job_id)
+        if job is None:
             return False
 
+        with job._lock:
+            if job.status != JobStatus.PENDING:
+                return False
+            job.status = JobStatus.CANCELLED
+            job.completed_at = datetime.now()
+
+        self._on_status_change(job)
+        return True
+
     def get_metrics(self) -> WorkerMetrics:
         """Get current worker pool metrics"""
-        with self.lock:
-            self.metrics.active_workers = len(self.workers)
-            self.metrics.idle_workers = sum(
-                1 for w in self.workers if w.current_job is None
-            )
-            self.metrics.queue_size = self.job_queue.qsize()
-
-            # Calculate average job duration
-            completed_jobs = [
-                j
-                for j in self.jobs.values()
-                if j.status == JobStatus.COMPLETED and j.started_at and j.completed_at
-            ]
-            if completed_jobs:
-                durations = [
-                    (j.completed_at - j.started_at).total_seconds()
-                    for j in completed_jobs
-                ]
-                self.metrics.average_job_duration = sum(durations) / len(durations)
+        workers = list(self.workers)
+        self.metrics.active_workers = len(workers)
+        self.metrics.idle_workers = sum(1 for w in workers if w.current_job is None)
+        self.metrics.queue_size = self.job_queue.qsize()
+
+        with self._counters_lock:
+            self.metrics.total_jobs_processed = self._processed_count
+            self.metrics.total_jobs_failed = self._failed_count
+            self.metrics.total_jobs_retried = self._retried_count
+            if self._duration_count:
+                self.metrics.average_job_duration = (
+                    self._duration_sum_ns / self._duration_count / 1e9
+                )
+
+        return self.metrics
+
+    def _on_status_change(self, job: MediaJob):
+        """Record a job status transition made by a worker or cancel_job"""
+        counter_updates = []
+        if job.status == JobStatus.COMPLETED:
+            counter_updates.append(("completed", 1))
+            if job.duration_ns is not None:
+                counter_updates.append(("completed_duration_ns", job.duration_ns))
+        elif job.status == JobStatus.FAILED:
+            counter_updates.append(("failed", 1))
+        elif job.status == JobStatus.PENDING:
+            # Only a worker scheduling a retry reports a PENDING transition
+            counter_updates.append(("retried", 1))
+            self._schedule_retry(job)
+
+        if counter_updates:
+            with self._counters_lock:
+                for key, amount in counter_updates:
+                    self._add_to_counter(key, amount)
+
+        if job.status in _TERMINAL_STATUSES:
+            with self._jobs_lock:
+                self._finished_ids.append(job.job_id)
+                while len(self.jobs) > self.max_history and self._finished_ids:
+                    self.jobs.pop(self._finished_ids.popleft(), None)
+
+        if self.db_path is None:
+            return
+
+        with self._db_lock:
+            if self._db is None:
+                return
+            with self._db:
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, completed_at = ?, "
+                    "error = ?, retry_count = ? WHERE job_id = ?",
+                    (
+                        job.status.value,
+                        _isoformat(job.started_at),
+                        _isoformat(job.completed_at),
+                        job.error,
+                        job.retry_count,
+                        job.job_id,
+                    ),
+                )
+                self._db.executemany(
+                    "UPDATE job_counters SET value = value + ? WHERE key = ?",
+                    [(amount, key) for key, amount in counter_updates],
+                )
 
-            self.metrics.total_jobs_processed = sum(
-                1 for j in self.jobs.values() if j.status == JobStatus.COMPLETED
+    def _init_database(self):
+        """Open the job database in WAL mode and create the schema"""
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    job_type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    error TEXT,
+                    retry_count INTEGER NOT NULL DEFAULT 0,
+                    payload TEXT NOT NULL  -- JSON: paths, args, limits, metadata
+                )
+            """)
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)"
             )
-            self.metrics.total_jobs_failed = sum(
-                1 for j in self.jobs.values() if j.status == JobStatus.FAILED
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS job_counters (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            self._db.executemany(
+                "INSERT OR IGNORE INTO job_counters (key, value) VALUES (?, 0)",
+                [(key,) for key in _JOB_COUNTERS],
             )
-            self.metrics.total_jobs_retried = sum(
-                j.retry_count for j in self.jobs.values()
+
+    def _persist_job(self, job: MediaJob):
+        """Insert a newly submitted job into the database"""
+        if self._db is None:
+            return
+
+        payload = json.dumps(
+            {
+                "input_path": job.input_path,
+                "output_path": job.output_path,
+                "ffmpeg_args": list(job.ffmpeg_args),
+                "timeout_seconds": job.timeout_seconds,
+                "max_retries": job.max_retries,
+                "metadata": job.metadata,
+            }
+        )
+        with self._db_lock, self._db:
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO jobs (
+                    job_id, job_type, status, priority, created_at, started_at,
+                    completed_at, error, retry_count, payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    job.job_id,
+                    job.job_type,
+                    job.status.value,
+                    job.priority.value,
+                    _isoformat(job.created_at),
+                    _isoformat(job.started_at),
+                    _isoformat(job.completed_at),
+                    job.error,
+                    job.retry_count,
+                    payload,
+                ),
             )
 
-            return self.metrics
+    def _restore_jobs(self):
+        """Re-queue jobs a previous process left pending or running"""
+        with self._db_lock:
+            rows = self._db.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE status IN (?, ?) "
+                "ORDER BY created_at",
+                (JobStatus.PENDING.value, JobStatus.RUNNING.value),
+            ).fetchall()
+
+        for row in rows:
+            job = _job_from_row(row)
+            job.status = JobStatus.PENDING
+            job.started_at = None
+            self.jobs[job.job_id] = job
+            self._persist_job(job)
+            self.job_queue.put(job)
+
+    def _load_job(self, job_id: str) -> Optional[MediaJob]:
+        """Rebuild a job that is only present in the database"""
+        with self._db_lock:
+            row = self._db.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return _job_from_row(row) if row else None
+
+    def _schedule_retry(self, job: MediaJob):
+        """Re-queue a failed job after its exponential backoff delay"""
+        delay = min(300.0, self.retry_backoff_seconds * 2 ** (job.retry_count - 1))
+        ready_at = time.perf_counter_ns() + int(delay * 1e9)
+        # Keep join() waiting for the retry while it sits in the heap
+        self.job_queue.defer()
+        with self._delay_cv:
+            heapq.heappush(self._delay_heap, (ready_at, next(self._delay_seq), job))
+            self._delay_cv.notify()
+
+    def _retry_scheduler_loop(self):
+        """Move jobs from the delay heap to the job queue as they come due"""
+        with self._delay_cv:
+            while not self.stop_event.is_set():
+                if not self._delay_heap:
+                    self._delay_cv.wait()
+                    continue
+                wait_ns = self._delay_heap[0][0] - time.perf_counter_ns()
+                if wait_ns > 0:
+                    self._delay_cv.wait(wait_ns / 1e9)
+                    continue
+                _, _, job = heapq.heappop(self._delay_heap)
+                self.job_queue.put(job, deferred=True)
+
+    def _add_to_counter(self, key: str, amount: int):
+        """Apply a job_counters delta to the in-memory totals (lock held)"""
+        if key == "completed":
+            self._processed_count += amount
+        elif key == "failed":
+            self._failed_count += amount
+        elif key == "retried":
+            self._retried_count += amount
+        elif key == "completed_duration_ns":
+            self._duration_sum_ns += amount
+            self._duration_count += 1
+
+    def _load_counters(self):
+        """Seed the in-memory totals from the persisted counters"""
+        with self._db_lock:
+            counters = dict(self._db.execute("SELECT key, value FROM job_counters"))
+
+        with self._counters_lock:
+            self._processed_count = counters["completed"]
+            self._failed_count = counters["failed"]
+            self._retried_count = counters["retried"]
+            self._duration_sum_ns = counters["completed_duration_ns"]
+            self._duration_count = counters["completed"]
 
     def _scale_workers(self, target_count: int):
         """Scale worker pool to target count"""
@@ -422,48 +1257,75 @@ class MediaJobQueue:
 
         if target_count > current_count:
             # Scale up
-            for i in range(target_count - current_count):
+            for _ in range(target_count - current_count):
+                worker_id = next(self._worker_ids)
                 worker = MediaJobWorker(
-                    worker_id=current_count + i,
+                    worker_id=worker_id,
                     job_queue=self.job_queue,
                     runtime=self.runtime,
                     jobs_dict=self.jobs,
-                    lock=self.lock,
                     stop_event=self.stop_event,
+                    on_status_change=self._on_status_change,
+                    cpus=self._worker_cpus(worker_id),
                 )
                 worker.start()
                 self.workers.append(worker)
 
         elif target_count < current_count:
-            # Scale down by removing excess workers
-            # (they will exit naturally when they finish current jobs)
-            self.workers = self.workers[:target_count]
+            # Retire the longest-idle workers first (busy ones last); they
+            # exit once they finish any current job
+            candidates = sorted(
+                self.workers,
+                key=lambda w: (w.current_job is not None, w.last_active),
+            )
+            for worker in candidates[: current_count - target_count]:
+                worker.stop_self = True
+                self.workers.remove(worker)
+            self.job_queue.wake_all()
+
+    def _worker_cpus(self, worker_id: int) -> Optional[set]:
+        """CPU slice for a worker when pinning is enabled"""
+        if not self.pin_workers:
+            return None
+
+        available = sorted(os.sched_getaffinity(0))
+        count = min(self.runtime.threads_per_job, len(available))
+        start = worker_id * count
+        return {available[(start + i) % len(available)] for i in range(count)}
 
     def _autoscaler_loop(self):
         """Autoscaler main loop"""
-        while not self.stop_event.is_set():
-            time.sleep(5)  # Check every 5 seconds
-
-            queue_size = self.job_queue.qsize()
-            current_workers = len(self.workers)
-
-            # Scale up if queue is growing
-            if (
-                queue_size > self.scale_up_threshold
-                and current_workers < self.max_workers
-            ):
-                new_count = min(current_workers + 2, self.max_workers)
-                with self.lock:
-                    self._scale_workers(new_count)
-
-            # Scale down if queue is small
-            elif (
-                queue_size < self.scale_down_threshold
-                and current_workers > self.min_workers
-            ):
-                new_count = max(current_workers - 1, self.min_workers)
-                with self.lock:
-                    self._scale_workers(new_count)
+        # Check every 5 seconds, returning as soon as shutdown sets the event
+        while not self.stop_event.wait(5):
+            self._autoscale_tick()
+
+    def _autoscale_tick(self):
+        """Run one autoscaler check against the current queue size"""
+        queue_size = self.job_queue.qsize()
+        current_workers = len(self.workers)
+
+        # Only scale down after the queue has stayed small for several
+        # consecutive checks, so short lulls between bursts keep workers warm
+        if queue_size < self.scale_down_threshold:
+            self._scale_down_streak += 1
+        else:
+            self._scale_down_streak = 0
+
+        # Scale up if queue is growing
+        if queue_size > self.scale_up_threshold and current_workers < self.max_workers:
+            new_count = min(current_workers + 2, self.max_workers)
+            with self._scale_lock:
+                self._scale_workers(new_count)
+
+        # Scale down if queue is small
+        elif (
+            self._scale_down_streak >= self.scale_down_ticks
+            and current_workers > self.min_workers
+        ):
+            self._scale_down_streak = 0
+            new_count = max(current_workers - 1, self.min_workers)
+            with self._scale_lock:
+                self._scale_workers(new_count)
 
     def shutdown(self, wait: bool = True):
         """
@@ -472,20 +1334,146 @@ class MediaJobQueue:
         Args:
             wait: Wait for pending jobs to complete
         """
-        self.stop_event.set()
-
+        # Drain before signalling stop, otherwise workers can exit with
+        # jobs still queued and join() never returns
         if wait:
             self.job_queue.join()
 
+        self.stop_event.set()
+        self.job_queue.wake_all()
+        with self._delay_cv:
+            self._delay_cv.notify_all()
+
         for worker in self.workers:
             worker.join(timeout=1)
 
+        # Keep the database open for any worker still finishing a job
+        if self._db is not None and not any(w.is_alive() for w in self.workers):
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
         self.workers.clear()
 
 
+_JOB_COUNTERS = ("completed", "failed", "retried", "completed_duration_ns")
+
+_JOB_COLUMNS = (
+    "job_id, job_type, status, priority, created_at, started_at, "
+    "completed_at, error, retry_count, payload"
+)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _job_from_row(row: tuple) -> MediaJob:
+    """Build a MediaJob from a jobs table row selected with _JOB_COLUMNS"""
+    (
+        job_id,
+        job_type,
+        status,
+        priority,
+        created_at,
+        started_at,
+        completed_at,
+        error,
+        retry_count,
+        payload,
+    ) = row
+    data = json.loads(payload)
+    return MediaJob(
+        job_id=job_id,
+        job_type=job_type,
+        input_path=data["input_path"],
+        output_path=data["output_path"],
+        ffmpeg_args=data["ffmpeg_args"],
+        priority=JobPriority(priority),
+        status=JobStatus(status),
+        created_at=datetime.fromisoformat(created_at),
+        started_at=datetime.fromisoformat(started_at) if started_at else None,
+        completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+        error=error,
+        retry_count=retry_count,
+        max_retries=data["max_retries"],
+        timeout_seconds=data["timeout_seconds"],
+        metadata=data["metadata"],
+    )
+
+
+async def run_media_jobs_async(
+    runtime: FFmpegRuntime, jobs: List[MediaJob], max_concurrency: int = 16
+) -> List[MediaJob]:
+    """
+    Run jobs concurrently on the current event loop
+
+    An alternative to MediaJobQueue for asyncio services: each in-flight job
+    is a coroutine awaiting its ffmpeg child rather than a worker thread.
+    Jobs start in priority order (submission order within a priority), and
+    status, timestamps and error are updated as a worker would.
+
+    Args:
+        runtime: ffmpeg runtime used to execute the jobs
+        jobs: Jobs to run; only those still PENDING are executed
+        max_concurrency: Maximum number of ffmpeg processes at once
+
+    Returns:
+        The same jobs, in the order given
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(job: MediaJob):
+        async with semaphore:
+            with job._lock:
+                if job.status != JobStatus.PENDING:
+                    return
+                job.status = JobStatus.RUNNING
+                job.started_at = datetime.now()
+                job.started_ns = time.perf_counter_ns()
+
+            success = False
+            try:
+                returncode, _, stderr = await runtime.execute_ffmpeg_async(
+                    job.ffmpeg_args, timeout_seconds=job.timeout_seconds
+                )
+                if returncode != 0:
+                    job.error = f"ffmpeg failed with code {returncode}: {stderr}"
+                else:
+                    _record_job_outputs(job)
+                    success = True
+            except TimeoutError as e:
+                job.error = str(e)
+            except Exception as e:
+                job.error = f"Job processing error: {str(e)}"
+
+            with job._lock:
+                job.status = JobStatus.COMPLETED if success else JobStatus.FAILED
+                job.completed_at = datetime.now()
+                job.completed_ns = time.perf_counter_ns()
+
+    ordered = sorted(jobs, key=lambda j: j.priority.value)
+    await asyncio.gather(*(run(job) for job in ordered))
+    return jobs
+
+
 # Convenience functions for common media operations
 
 
+@lru_cache(maxsize=256)
+def _transcode_template(
+    video_codec: str, audio_codec: str, bitrate: str
+) -> Tuple[str, ...]:
+    """Shared encoder options for create_transcode_job"""
+    return ("-c:v", video_codec, "-c:a", audio_codec, "-b:v", bitrate, "-y")
+
+
+@lru_cache(maxsize=256)
+def _thumbnail_template(width: int) -> Tuple[str, ...]:
+    """Shared frame/scale options for create_thumbnail_job"""
+    return ("-vframes", "1", "-vf", f"scale={width}:-1", "-y")
+
+
 def create_transcode_job(
     queue: MediaJobQueue,
     input_path: str,
@@ -496,18 +1484,13 @@ def create_transcode_job(
     priority: JobPriority = JobPriority.NORMAL,
 ) -> str:
     """Create a video transcoding job"""
-    ffmpeg_args = [
+    # "-y" in the template overwrites the output
+    ffmpeg_args = (
         "-i",
         input_path,
-        "-c:v",
-        video_codec,
-        "-c:a",
-        audio_codec,
-        "-b:v",
-        bitrate,
-        "-y",  # Overwrite output
+        *_transcode_template(video_codec, audio_codec, bitrate),
         output_path,
-    ]
+    )
 
     return queue.submit_job(
         job_type="transcode",
@@ -532,18 +1515,14 @@ def create_thumbnail_job(
     priority: JobPriority = JobPriority.NORMAL,
 ) -> str:
     """Create a thumbnail extraction job"""
-    ffmpeg_args = [
+    ffmpeg_args = (
         "-i",
         input_path,
         "-ss",
         timestamp,
-        "-vframes",
-        "1",
-        "-vf",
-        f"scale={width}:-1",
-        "-y",
+        *_thumbnail_template(width),
         output_path,
-    ]
+    )
 
     return queue.submit_job(
         job_type="thumbnail",
@@ -553,3 +1532,57 @@ def create_thumbnail_job(
         priority=priority,
         metadata={"timestamp": timestamp, "width": width},
     )
+
+
+def create_thumbnail_batch_job(
+    queue: MediaJobQueue,
+    input_path: str,
+    output_dir: str,
+    timestamps: List[float],
+    width: int = 320,
+    priority: JobPriority = JobPriority.NORMAL,
+) -> str:
+    """
+    Create one job that extracts a thumbnail at each timestamp
+
+    A single ffmpeg run decodes the input once and keeps the first frame at
+    or after each timestamp, instead of one process and seek per thumbnail.
+    Selection is by presentation time, so no fps probe is needed and
+    variable frame rate inputs are handled.
+
+    Args:
+        queue: Job queue to submit to
+        input_path: Input media file path
+        output_dir: Directory the numbered thumbnails are written to
+        timestamps: Thumbnail positions in seconds
+        width: Thumbnail width (height keeps aspect ratio)
+        priority: Job priority
+
+    Returns:
+        Job ID; once the job completes, its metadata["output_paths"] lists
+        the thumbnails actually written, which can be fewer than the
+        timestamps when several share a frame or fall past the end
+    """
+    times = sorted(set(timestamps))
+    select = _select_at_times(times)
+    output_pattern = os.path.join(output_dir, "thumb_%03d.jpg")
+
+    ffmpeg_args = [
+        "-i",
+        input_path,
+        "-vf",
+        f"select='{select}',scale={width}:-1",
+        "-vsync",
+        "0",
+        "-y",
+        output_pattern,
+    ]
+
+    return queue.submit_job(
+        job_type="thumbnail_batch",
+        input_path=input_path,
+        output_path=output_pattern,
+        ffmpeg_args=ffmpeg_args,
+        priority=priority,
+        metadata={"timestamps": times, "width": width},
+    )
@@ -4,13 +4,26 @@ Provides content moderation with automated scanning and audit trail
 Issue: #25
 """
 
+import re
 import time
-import hashlib
-from typing import Dict, List, Optional, Tuple
+import secrets
+import itertools
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+# pyahocorasick is an optional speedup; fall back to substring probes when missing
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class ModerationDecision(Enum):
     """Moderation decision outcomes"""
@@ -33,13 +46,27 @@ class ContentCategory(Enum):
     UNKNOWN = "unknown"
 
 
+# Metadata keyword categories in priority order: (category, confidence, label)
+_KEYWORD_CATEGORIES = (
+    (ContentCategory.NSFW, 0.95, "NSFW"),
+    (ContentCategory.GRAPHIC_VIOLENCE, 0.90, "Violence"),
+    (ContentCategory.HATE_SPEECH, 0.95, "Hate speech"),
+)
+
+# Category recorded for manual review decisions; anything else is UNKNOWN
+_MANUAL_DECISION_CATEGORIES = {
+    ModerationDecision.APPROVED: ContentCategory.SAFE,
+    ModerationDecision.REJECTED: ContentCategory.NSFW,  # Default for manual rejection
+}
+
+
 class ModerationError(Exception):
     """Exception raised when moderation fails"""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ModerationResult:
     """Result of content moderation"""
 
@@ -54,7 +81,7 @@ class ModerationResult:
     metadata: Dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditEntry:
     """Audit trail entry for moderation actions"""
 
@@ -69,6 +96,111 @@ class AuditEntry:
     metadata: Dict = field(default_factory=dict)
 
 
+class _AuditRecord(NamedTuple):
+    """
+    Audit trail record for an automated decision, expanded lazily on read
+
+    Fields mirror AuditEntry and are copied from the ModerationResult when
+    the decision is recorded, so later edits to the result do not rewrite
+    the trail.
+    """
+
+    audit_id: str
+    asset_id: str
+    decision: ModerationDecision
+    category: ContentCategory
+    confidence: float
+    moderator: str
+    timestamp: str
+    reasons: List[str]
+    metadata: Dict
+
+
+_TrailItem = Union[AuditEntry, _AuditRecord]
+
+
+def _as_audit_entry(item: _TrailItem) -> AuditEntry:
+    """
+    Expand an audit trail item into an AuditEntry
+
+    Args:
+        item: Stored AuditEntry, or a deferred automated-decision record
+
+    Returns:
+        The equivalent AuditEntry
+    """
+    if not isinstance(item, _AuditRecord):
+        return item
+    return AuditEntry(*item)
+
+
+def _iso_to_epoch(value: str) -> float:
+    """
+    Convert an ISO-8601 timestamp to epoch seconds
+
+    Args:
+        value: ISO format timestamp; naive values are taken as UTC
+
+    Returns:
+        Seconds since the epoch
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+@lru_cache(maxsize=4096)
+def _classify_hash_prefix(
+    prefix: str,
+) -> Tuple[ContentCategory, float, Tuple[str, ...]]:
+    """
+    Deterministically classify content from its hash prefix (simulation)
+
+    Args:
+        prefix: First 8 characters of the file hash
+
+    Returns:
+        Tuple of (category, confidence, reasons)
+    """
+    # Convert hash to integer (handle non-hex characters)
+    try:
+        hash_int = int(prefix, 16)
+    except ValueError:
+        # Fall back to sum of character codes for non-hex hashes
+        hash_int = sum(ord(c) for c in prefix)
+
+    # 95% of content is safe in simulation
+    if hash_int % 100 < 95:
+        return (ContentCategory.SAFE, 0.98, ("Visual content analysis passed",))
+
+    # 3% is flagged for review
+    if hash_int % 100 < 98:
+        return (
+            ContentCategory.UNKNOWN,
+            0.60,
+            ("Low confidence - requires manual review",),
+        )
+
+    # 2% is rejected
+    return (
+        ContentCategory.NSFW,
+        0.85,
+        ("Visual content detected inappropriate imagery",),
+    )
+
+
+class _KeywordIndex(NamedTuple):
+    """Keyword matchers built from one snapshot of the blocklists"""
+
+    keywords: Tuple[frozenset, ...]  # Snapshot, in category priority order
+    reasons: Tuple[Dict[str, str], ...]  # Reason string per keyword
+    automaton: Any  # None when pyahocorasick is missing
+    # Regex fallback, one per category (None for an empty blocklist); only
+    # built when pyahocorasick is missing
+    patterns: Optional[Tuple[Optional[re.Pattern], ...]]
+
+
 class ContentScanner:
     """Simulated content scanner (would integrate with real AI/ML service)"""
 
@@ -95,6 +227,99 @@ class ContentScanner:
         self.violence_keywords = {"gore", "blood", "violence", "brutal", "graphic"}
         self.hate_keywords = {"hate", "slur", "racist", "nazi", "supremacist"}
 
+        self._index = self._build_index()
+
+    def _keyword_sets(self) -> Tuple[set, set, set]:
+        """Keyword blocklists in category priority order"""
+        return (self.nsfw_keywords, self.violence_keywords, self.hate_keywords)
+
+    def _build_index(self) -> _KeywordIndex:
+        """Build keyword matchers from the current blocklists"""
+        keywords = tuple(map(frozenset, self._keyword_sets()))
+
+        # Reason strings are built once per keyword, indexed by priority
+        reasons = tuple(
+            {keyword: f"{label} keyword detected: '{keyword}'" for keyword in words}
+            for (_, _, label), words in zip(_KEYWORD_CATEGORIES, keywords)
+        )
+
+        # Single automaton over all blocklists; payload is (priority, keyword)
+        automaton = patterns = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for priority, words in enumerate(keywords):
+                for keyword in words:
+                    if keyword not in automaton:
+                        automaton.add_word(keyword, (priority, keyword))
+            # An automaton with no words cannot be searched; nothing can match
+            if len(automaton):
+                automaton.make_automaton()
+            else:
+                automaton = None
+                patterns = (None,) * len(keywords)
+        else:
+            # One literal alternation per category, searched in priority order
+            patterns = tuple(
+                (
+                    re.compile("|".join(map(re.escape, sorted(words, key=len)[::-1])))
+                    if words
+                    else None
+                )
+                for words in keywords
+            )
+
+        return _KeywordIndex(keywords, reasons, automaton, patterns)
+
+    def _keyword_index(self) -> _KeywordIndex:
+        """
+        Keyword matchers for the blocklists as they are now
+
+        The blocklists are public sets, so the index is rebuilt whenever one
+        has been edited or replaced since it was built.
+        """
+        index = self._index
+        if index.keywords != self._keyword_sets():
+            index = self._index = self._build_index()
+        return index
+
+    def _match_keyword(
+        self, fields: Sequence[str], index: _KeywordIndex
+    ) -> Optional[Tuple[int, str]]:
+        """
+        Find the highest-priority blocklisted keyword in any metadata field
+
+        Args:
+            fields: Metadata strings to scan, in any case
+            index: Keyword matchers to scan with
+
+        Returns:
+            Tuple of (priority, keyword), or None if nothing matched
+        """
+        if index.automaton is not None:
+            # No keyword contains a space, so fields can be scanned separately
+            # without building the joined text
+            best = None
+            for field_text in fields:
+                for _, hit in index.automaton.iter(field_text.lower()):
+                    if best is None or hit[0] < best[0]:
+                        best = hit
+                        if best[0] == 0:
+                            return best
+            return best
+
+        # One joined, lowered string keeps this to a single re search per
+        # category. Lowering (rather than IGNORECASE, whose Unicode folding
+        # matches e.g. the long s "ſ" as "s") makes every match a keyword
+        # verbatim, as with the automaton and `keyword in text.lower()`.
+        text = " ".join(fields).lower()
+        for priority, pattern in enumerate(index.patterns):
+            if pattern is None:
+                continue
+            match = pattern.search(text)
+            if match is not None:
+                return priority, match.group()
+        return None
+
     def scan_metadata(
         self, title: str = "", tags: Optional[List[str]] = None, description: str = ""
     ) -> Tuple[ContentCategory, float, List[str]]:
@@ -112,26 +337,13 @@ class ContentScanner:
         tags = tags or []
         reasons = []
 
-        # Combine all text for scanning
-        text = f"{title} {description} {' '.join(tags)}".lower()
-
-        # Check for NSFW content
-        for keyword in self.nsfw_keywords:
-            if keyword in text:
-                reasons.append(f"NSFW keyword detected: '{keyword}'")
-                return ContentCategory.NSFW, 0.95, reasons
-
-        # Check for violence
-        for keyword in self.violence_keywords:
-            if keyword in text:
-                reasons.append(f"Violence keyword detected: '{keyword}'")
-                return ContentCategory.GRAPHIC_VIOLENCE, 0.90, reasons
-
-        # Check for hate speech
-        for keyword in self.hate_keywords:
-            if keyword in text:
-                reasons.append(f"Hate speech keyword detected: '{keyword}'")
-                return ContentCategory.HATE_SPEECH, 0.95, reasons
+        index = self._keyword_index()
+        match = self._match_keyword((title, description, *tags), index)
+        if match is not None:
+            priority, keyword = match
+            category, confidence, _ = _KEYWORD_CATEGORIES[priority]
+            reasons.append(index.reasons[priority][keyword])
+            return category, confidence, reasons
 
         return ContentCategory.SAFE, 0.99, ["No policy violations detected"]
 
@@ -156,31 +368,8 @@ class ContentScanner:
         # - OpenAI Moderation API
 
         # For simulation, use hash to deterministically classify
-        # Convert hash to integer (handle non-hex characters)
-        try:
-            hash_int = int(file_hash[:8], 16)
-        except ValueError:
-            # Fall back to sum of character codes for non-hex hashes
-            hash_int = sum(ord(c) for c in file_hash[:8])
-
-        # 95% of content is safe in simulation
-        if hash_int % 100 < 95:
-            return (ContentCategory.SAFE, 0.98, ["Visual content analysis passed"])
-
-        # 3% is flagged for review
-        if hash_int % 100 < 98:
-            return (
-                ContentCategory.UNKNOWN,
-                0.60,
-                ["Low confidence - requires manual review"],
-            )
-
-        # 2% is rejected
-        return (
-            ContentCategory.NSFW,
-            0.85,
-            ["Visual content detected inappropriate imagery"],
-        )
+        category, confidence, reasons = _classify_hash_prefix(file_hash[:8])
+        return category, confidence, list(reasons)
 
 
 class ModerationPipeline:
@@ -192,6 +381,8 @@ class ModerationPipeline:
         auto_approve_threshold: float = 0.95,
         auto_reject_threshold: float = 0.80,
         enable_audit: bool = True,
+        audit_max_entries: Optional[int] = 100_000,
+        max_concurrency: int = 8,
     ):
         """
         Initialize moderation pipeline
@@ -201,15 +392,30 @@ class ModerationPipeline:
             auto_approve_threshold: Confidence threshold for auto-approval
             auto_reject_threshold: Confidence threshold for auto-rejection
             enable_audit: Enable audit trail logging
+            audit_max_entries: Maximum audit entries retained (oldest dropped first),
+                or None for unbounded
+            max_concurrency: Maximum concurrent scans in moderate_batch
         """
         self.scanner = ContentScanner(strict_mode=strict_mode)
         self.strict_mode = strict_mode
         self.auto_approve_threshold = auto_approve_threshold
         self.auto_reject_threshold = auto_reject_threshold
         self.enable_audit = enable_audit
+        self.max_concurrency = max_concurrency
+
+        # Guards stats and the audit trail when moderating from several threads
+        self._lock = threading.Lock()
 
-        # Audit trail storage
-        self._audit_trail: List[AuditEntry] = []
+        # Audit trail storage, bounded so long-running workers don't grow forever
+        self._audit_trail: Deque[_TrailItem] = deque(maxlen=audit_max_entries)
+        # Epoch seconds of each audit entry, parallel to _audit_trail and sorted
+        self._audit_ts: Deque[float] = deque(maxlen=audit_max_entries)
+
+        # IDs are a random per-pipeline prefix plus a monotonic counter
+        self._scan_prefix = secrets.token_hex(4)
+        self._audit_prefix = secrets.token_hex(4)
+        self._scan_counter = itertools.count()
+        self._audit_counter = itertools.count()
 
         # Statistics
         self._stats = {
@@ -219,18 +425,16 @@ class ModerationPipeline:
             "flagged": 0,
             "pending": 0,
         }
+        # get_statistics result, rebuilt only after a counter changes
+        self._cached_stats: Optional[Dict] = None
 
     def _generate_scan_id(self, asset_id: str) -> str:
         """Generate unique scan ID"""
-        timestamp = str(time.time())
-        data = f"{asset_id}{timestamp}".encode()
-        return hashlib.sha256(data).hexdigest()[:16]
+        return f"{self._scan_prefix}{next(self._scan_counter):08x}"
 
     def _generate_audit_id(self, scan_id: str) -> str:
         """Generate unique audit ID"""
-        timestamp = str(time.time())
-        data = f"{scan_id}{timestamp}".encode()
-        return hashlib.sha256(data).hexdigest()[:16]
+        return f"{self._audit_prefix}{next(self._audit_counter):08x}"
 
     def moderate_content(
         self,
@@ -257,7 +461,9 @@ class ModerationPipeline:
         Returns:
             ModerationResult with decision and details
         """
-        self._stats["total_scans"] += 1
+        with self._lock:
+            self._stats["total_scans"] += 1
+            self._cached_stats = None
         scan_id = self._generate_scan_id(asset_id)
         metadata = metadata or {}
 
@@ -339,6 +545,47 @@ class ModerationPipeline:
         self._record_decision(asset_id, result, "automated")
         return result
 
+    def moderate_batch(
+        self,
+        items: List[Dict[str, Any]],
+        requests_per_second: Optional[float] = None,
+    ) -> List[ModerationResult]:
+        """
+        Moderate many assets concurrently
+
+        Scanning is where a production deployment calls out to remote vision
+        services, so items are dispatched to a thread pool bounded by
+        max_concurrency and optionally paced to the service's request rate.
+
+        Args:
+            items: Keyword arguments for moderate_content, one dict per asset
+            requests_per_second: Optional cap on how many scans start per second
+
+        Returns:
+            ModerationResult for each item, in input order
+        """
+        if not items:
+            return []
+
+        interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        lock = threading.Lock()
+        next_start = [time.monotonic()]
+
+        def _moderate_one(item: Dict[str, Any]) -> ModerationResult:
+            if interval:
+                # Reserve the next start slot, then wait for it outside the lock
+                with lock:
+                    now = time.monotonic()
+                    start = max(now, next_start[0])
+                    next_start[0] = start + interval
+                if start > now:
+                    time.sleep(start - now)
+            return self.moderate_content(**item)
+
+        workers = max(1, min(self.max_concurrency, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_moderate_one, items))
+
     def manual_review(
         self,
         asset_id: str,
@@ -363,12 +610,7 @@ class ModerationPipeline:
         audit_id = self._generate_audit_id(scan_id)
 
         # Determine category based on decision
-        if decision == ModerationDecision.APPROVED:
-            category = ContentCategory.SAFE
-        elif decision == ModerationDecision.REJECTED:
-            category = ContentCategory.NSFW  # Default for manual rejection
-        else:
-            category = ContentCategory.UNKNOWN
+        category = _MANUAL_DECISION_CATEGORIES.get(decision, ContentCategory.UNKNOWN)
 
         entry = AuditEntry(
             audit_id=audit_id,
@@ -382,10 +624,12 @@ class ModerationPipeline:
             metadata={"scan_id": scan_id, "review_type": "manual"},
         )
 
-        if self.enable_audit:
-            self._audit_trail.append(entry)
+        with self._lock:
+            if self.enable_audit:
+                self._append_audit(entry)
 
-        self._stats[decision.value] = self._stats.get(decision.value, 0) + 1
+            self._stats[decision.value] = self._stats.get(decision.value, 0) + 1
+            self._cached_stats = None
 
         return entry
 
@@ -396,22 +640,43 @@ class ModerationPipeline:
         if not self.enable_audit:
             return
 
+        # Snapshot the result now; the AuditEntry is built when the trail is read
         audit_id = self._generate_audit_id(result.scan_id)
+        with self._lock:
+            self._append_audit(
+                _AuditRecord(
+                    audit_id,
+                    asset_id,
+                    result.decision,
+                    result.category,
+                    result.confidence,
+                    moderator,
+                    result.timestamp,
+                    list(result.reasons),
+                    result.metadata,
+                )
+            )
+            self._stats[result.decision.value] += 1
+            self._cached_stats = None
 
-        entry = AuditEntry(
-            audit_id=audit_id,
-            asset_id=asset_id,
-            decision=result.decision,
-            category=result.category,
-            confidence=result.confidence,
-            moderator=moderator,
-            timestamp=result.timestamp,
-            reasons=result.reasons,
-            metadata=result.metadata,
-        )
+    def _append_audit(self, entry: _TrailItem) -> None:
+        """Add an entry to the audit trail, keeping it sorted by timestamp"""
+        trail, stamps = self._audit_trail, self._audit_ts
+        ts = _iso_to_epoch(entry.timestamp)
+
+        if not stamps or ts >= stamps[-1]:
+            trail.append(entry)
+            stamps.append(ts)
+            return
 
-        self._audit_trail.append(entry)
-        self._stats[result.decision.value] += 1
+        # Wall clock stepped backwards; insert in order (full deques can't insert)
+        index = bisect_right(stamps, ts)
+        if len(stamps) == stamps.maxlen:
+            trail.popleft()
+            stamps.popleft()
+            index = max(index - 1, 0)
+        trail.insert(index, entry)
+        stamps.insert(index, ts)
 
     def get_audit_trail(
         self,
@@ -430,15 +695,29 @@ class ModerationPipeline:
         Returns:
             List of audit entries
         """
-        entries = self._audit_trail
-
-        if asset_id:
-            entries = [e for e in entries if e.asset_id == asset_id]
-
-        if decision:
-            entries = [e for e in entries if e.decision == decision]
-
-        return entries[-limit:]
+        with self._lock:
+            if limit <= 0:
+                # Preserve list-slice semantics for non-positive limits
+                items = [
+                    e
+                    for e in self._audit_trail
+                    if (not asset_id or e.asset_id == asset_id)
+                    and (not decision or e.decision == decision)
+                ][-limit:]
+            else:
+                # Walk newest-first and stop once limit matches are found
+                recent = reversed(self._audit_trail)
+                if asset_id or decision:
+                    recent = (
+                        e
+                        for e in recent
+                        if (not asset_id or e.asset_id == asset_id)
+                        and (not decision or e.decision == decision)
+                    )
+                items = list(itertools.islice(recent, limit))
+                items.reverse()
+
+        return [_as_audit_entry(e) for e in items]
 
     def get_statistics(self) -> Dict:
         """
@@ -447,18 +726,22 @@ class ModerationPipeline:
         Returns:
             Dictionary with statistics
         """
-        stats = self._stats.copy()
-
-        if stats["total_scans"] > 0:
-            stats["approval_rate"] = stats["approved"] / stats["total_scans"] * 100
-            stats["rejection_rate"] = stats["rejected"] / stats["total_scans"] * 100
-            stats["flag_rate"] = stats["flagged"] / stats["total_scans"] * 100
-        else:
-            stats["approval_rate"] = 0.0
-            stats["rejection_rate"] = 0.0
-            stats["flag_rate"] = 0.0
-
-        return stats
+        with self._lock:
+            if self._cached_stats is None:
+                stats = self._stats.copy()
+
+                if stats["total_scans"] > 0:
+                    total = stats["total_scans"]
+                    stats["approval_rate"] = stats["approved"] / total * 100
+                    stats["rejection_rate"] = stats["rejected"] / total * 100
+                    stats["flag_rate"] = stats["flagged"] / total * 100
+                else:
+                    stats["approval_rate"] = 0.0
+                    stats["rejection_rate"] = 0.0
+                    stats["flag_rate"] = 0.0
+
+                self._cached_stats = stats
+            return dict(self._cached_stats)
 
     def clear_audit_trail(self, asset_id: Optional[str] = None) -> None:
         """
@@ -467,10 +750,19 @@ class ModerationPipeline:
         Args:
             asset_id: Clear entries for specific asset, or all if None
         """
-        if asset_id:
-            self._audit_trail = [e for e in self._audit_trail if e.asset_id != asset_id]
-        else:
-            self._audit_trail.clear()
+        with self._lock:
+            if asset_id:
+                kept = [
+                    (e, ts)
+                    for e, ts in zip(self._audit_trail, self._audit_ts)
+                    if e.asset_id != asset_id
+                ]
+                maxlen = self._audit_trail.maxlen
+                self._audit_trail = deque((e for e, _ in kept), maxlen=maxlen)
+                self._audit_ts = deque((ts for _, ts in kept), maxlen=maxlen)
+            else:
+                self._audit_trail.clear()
+                self._audit_ts.clear()
 
     def export_audit_trail(
         self, start_time: Optional[str] = None, end_time: Optional[str] = None
@@ -485,13 +777,25 @@ class ModerationPipeline:
         Returns:
             List of audit entries as dictionaries
         """
-        entries = self._audit_trail
-
-        if start_time:
-            entries = [e for e in entries if e.timestamp >= start_time]
-
-        if end_time:
-            entries = [e for e in entries if e.timestamp <= end_time]
+        try:
+            start = _iso_to_epoch(start_time) if start_time else None
+            end = _iso_to_epoch(end_time) if end_time else None
+        except ValueError:
+            # Bounds that are not ISO timestamps are compared as strings
+            with self._lock:
+                entries = [
+                    e
+                    for e in self._audit_trail
+                    if (not start_time or e.timestamp >= start_time)
+                    and (not end_time or e.timestamp <= end_time)
+                ]
+        else:
+            with self._lock:
+                # The trail is time-sorted, so the window is a contiguous range
+                stamps = self._audit_ts
+                lo = bisect_left(stamps, start) if start is not None else 0
+                hi = bisect_right(stamps, end) if end is not None else len(stamps)
+                entries = list(itertools.islice(self._audit_trail, lo, hi))
 
         return [
             {
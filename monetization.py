@@ -9,11 +9,20 @@ Depends on: publisher-ui (#38), analytics (#33)
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from operator import attrgetter
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+import csv
+import io
 import json
 
+# orjson is an optional speedup; fall back to the stdlib when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class RevenueSource(Enum):
     """Revenue sources for monetization tracking"""
@@ -24,7 +33,7 @@ class RevenueSource(Enum):
     CUSTOM_PARTNERSHIP = "custom_partnership"
 
 
-@dataclass
+@dataclass(slots=True)
 class RevenueEvent:
     """Represents a revenue-generating event"""
 
@@ -36,7 +45,7 @@ class RevenueEvent:
     metadata: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class AdRevenueMetrics:
     """Metrics for ad revenue performance"""
 
@@ -48,6 +57,24 @@ class AdRevenueMetrics:
     fill_rate: float  # Percentage of ad requests filled
 
 
+# Enum .value goes through a descriptor; precompute the dict keys once
+_SOURCE_VALUES: Tuple[str, ...] = tuple(source.value for source in RevenueSource)
+
+_SUBSCRIPTION_SOURCES = (
+    RevenueSource.PRO_SUBSCRIPTION,
+    RevenueSource.TEAM_SUBSCRIPTION,
+)
+
+_EVENT_AMOUNT = attrgetter("amount_usd")
+
+
+def _dumps_indented(payload: Any) -> str:
+    """Serialize a report payload as indented JSON text"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, indent=2)
+
+
 class MonetizationTracker:
     """
     Tracks revenue and monetization metrics across the platform.
@@ -79,12 +106,13 @@ class MonetizationTracker:
         Returns:
             Created revenue event
         """
+        now = datetime.now(timezone.utc)
         event = RevenueEvent(
-            event_id=f"ad_rev_{ad_id}_{int(datetime.now(timezone.utc).timestamp())}",
+            event_id=f"ad_rev_{ad_id}_{int(now.timestamp())}",
             source=RevenueSource.WEBSITE_ADS,
             amount_usd=revenue_usd,
             user_id=user_id,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=now,
             metadata={
                 "ad_id": ad_id,
                 "impressions": impressions,
@@ -121,12 +149,13 @@ class MonetizationTracker:
             else RevenueSource.TEAM_SUBSCRIPTION
         )
 
+        now = datetime.now(timezone.utc)
         event = RevenueEvent(
-            event_id=f"sub_{tier}_{user_id}_{int(datetime.now(timezone.utc).timestamp())}",
+            event_id=f"sub_{tier}_{user_id}_{int(now.timestamp())}",
             source=source,
             amount_usd=amount_usd,
             user_id=user_id,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=now,
             metadata={"tier": tier, "billing_period": billing_period},
         )
         self.revenue_events.append(event)
@@ -151,7 +180,7 @@ class MonetizationTracker:
             Total revenue in USD
         """
         filtered_events = self._filter_events(start_date, end_date, source)
-        return sum(event.amount_usd for event in filtered_events)
+        return sum(map(_EVENT_AMOUNT, filtered_events))
 
     def get_ad_revenue_metrics(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
@@ -166,8 +195,13 @@ class MonetizationTracker:
         Returns:
             Ad revenue metrics
         """
-        ad_events = self._filter_events(start_date, end_date, RevenueSource.WEBSITE_ADS)
+        return self._ad_revenue_metrics(
+            self._filter_events(start_date, end_date, RevenueSource.WEBSITE_ADS)
+        )
 
+    @staticmethod
+    def _ad_revenue_metrics(ad_events: List[RevenueEvent]) -> AdRevenueMetrics:
+        """Aggregate ad revenue metrics over already-filtered ad events"""
         if not ad_events:
             return AdRevenueMetrics(
                 impressions=0,
@@ -178,11 +212,14 @@ class MonetizationTracker:
                 fill_rate=0.0,
             )
 
-        total_impressions = sum(
-            event.metadata.get("impressions", 0) for event in ad_events
-        )
-        total_clicks = sum(event.metadata.get("clicks", 0) for event in ad_events)
-        total_revenue = sum(event.amount_usd for event in ad_events)
+        # Single fused pass instead of one sum() per metric
+        total_impressions = total_clicks = 0
+        total_revenue = 0.0
+        for event in ad_events:
+            metadata = event.metadata
+            total_impressions += metadata.get("impressions", 0)
+            total_clicks += metadata.get("clicks", 0)
+            total_revenue += event.amount_usd
 
         ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0.0
         ecpm = (
@@ -214,16 +251,15 @@ class MonetizationTracker:
         Returns:
             Dictionary mapping revenue source to amount
         """
-        filtered_events = self._filter_events(start_date, end_date)
+        return self._revenue_by_source(self._filter_events(start_date, end_date))
 
-        revenue_by_source = {}
-        for source in RevenueSource:
-            source_events = [e for e in filtered_events if e.source == source]
-            revenue_by_source[source.value] = sum(
-                event.amount_usd for event in source_events
-            )
-
-        return revenue_by_source
+    @staticmethod
+    def _revenue_by_source(events: List[RevenueEvent]) -> Dict[str, float]:
+        """Sum already-filtered events per source in one pass"""
+        revenue = dict.fromkeys(_SOURCE_VALUES, 0)
+        for event in events:
+            revenue[event.source.value] += event.amount_usd
+        return revenue
 
     def get_mrr(self) -> float:
         """
@@ -232,28 +268,26 @@ class MonetizationTracker:
         Returns:
             MRR in USD
         """
-        # Get last 30 days of subscription events
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=30)
+        return self._mrr(self._filter_events(start_date, end_date))
 
-        subscription_sources = [
-            RevenueSource.PRO_SUBSCRIPTION,
-            RevenueSource.TEAM_SUBSCRIPTION,
-        ]
-
+    @staticmethod
+    def _mrr(events: List[RevenueEvent]) -> float:
+        """Sum normalized subscription revenue over already-filtered events"""
         mrr = 0.0
-        for source in subscription_sources:
-            events = self._filter_events(start_date, end_date, source)
+        for event in events:
+            if event.source not in _SUBSCRIPTION_SOURCES:
+                continue
             # Sum monthly subscription amounts
-            for event in events:
-                amount = event.amount_usd
-                period = event.metadata.get("billing_period", "monthly")
+            amount = event.amount_usd
+            period = event.metadata.get("billing_period", "monthly")
 
-                # Normalize to monthly
-                if period == "annual":
-                    amount = amount / 12
+            # Normalize to monthly
+            if period == "annual":
+                amount = amount / 12
 
-                mrr += amount
+            mrr += amount
 
         return round(mrr, 2)
 
@@ -291,10 +325,14 @@ class MonetizationTracker:
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=30)
 
-        total_revenue = self.get_total_revenue(start_date, end_date)
-        revenue_by_source = self.get_revenue_by_source(start_date, end_date)
-        ad_metrics = self.get_ad_revenue_metrics(start_date, end_date)
-        mrr = self.get_mrr()
+        # Filter once and derive every figure from the same window
+        events = self._filter_events(start_date, end_date)
+        total_revenue = sum(map(_EVENT_AMOUNT, events))
+        revenue_by_source = self._revenue_by_source(events)
+        ad_metrics = self._ad_revenue_metrics(
+            [e for e in events if e.source == RevenueSource.WEBSITE_ADS]
+        )
+        mrr = self._mrr(events)
 
         return {
             "period": {
@@ -343,20 +381,28 @@ class MonetizationTracker:
         summary = self.get_monetization_summary()
 
         if format == "json":
-            return json.dumps(summary, indent=2)
+            return _dumps_indented(summary)
         elif format == "csv":
-            # Simple CSV format
-            lines = [
-                "metric,value",
-                f"total_revenue_usd,{summary['total_revenue_usd']}",
-                f"mrr,{summary['mrr']}",
-                f"ad_revenue,{summary['ad_metrics']['revenue_usd']}",
-                f"subscription_revenue,{summary['subscription_metrics']['total_subscription_revenue']}",
-                f"ad_impressions,{summary['ad_metrics']['impressions']}",
-                f"ad_clicks,{summary['ad_metrics']['clicks']}",
-                f"ad_ctr,{summary['ad_metrics']['ctr']}",
-            ]
-            return "\n".join(lines)
+            # Simple CSV format; csv.writer quotes any value that needs it
+            ad_metrics = summary["ad_metrics"]
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerows(
+                [
+                    ("metric", "value"),
+                    ("total_revenue_usd", summary["total_revenue_usd"]),
+                    ("mrr", summary["mrr"]),
+                    ("ad_revenue", ad_metrics["revenue_usd"]),
+                    (
+                        "subscription_revenue",
+                        summary["subscription_metrics"]["total_subscription_revenue"],
+                    ),
+                    ("ad_impressions", ad_metrics["impressions"]),
+                    ("ad_clicks", ad_metrics["clicks"]),
+                    ("ad_ctr", ad_metrics["ctr"]),
+                ]
+            )
+            return buffer.getvalue().removesuffix("\n")
         else:
             raise ValueError(f"Unsupported format: {format}")
 
@@ -367,16 +413,15 @@ class MonetizationTracker:
         source: Optional[RevenueSource] = None,
     ) -> List[RevenueEvent]:
         """Filter revenue events by criteria"""
-        events = self.revenue_events
-
-        if start_date:
-            events = [e for e in events if e.timestamp >= start_date]
-        if end_date:
-            events = [e for e in events if e.timestamp <= end_date]
-        if source:
-            events = [e for e in events if e.source == source]
-
-        return events
+        # revenue_events is public and events are returned live, so neither
+        # order nor timestamps can be trusted; filter in one fused pass
+        return [
+            event
+            for event in self.revenue_events
+            if (start_date is None or event.timestamp >= start_date)
+            and (end_date is None or event.timestamp <= end_date)
+            and (source is None or event.source == source)
+        ]
 
     def _invalidate_cache(self):
         """Invalidate metrics cache"""
@@ -5,18 +5,116 @@ Provides structured logging, metrics collection, and distributed tracing
 for monitoring and debugging GIFDistributor services.
 """
 
+import itertools
 import logging
+import os
+import queue
+import threading
 import time
 import json
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import (
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
 from enum import Enum
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass, field, asdict
+from functools import lru_cache, partial
+from operator import attrgetter
 import contextvars
 
-# Context variable for trace ID
-_trace_context = contextvars.ContextVar("trace_context", default=None)
+# orjson is an optional speedup; fall back to the stdlib when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Context variable holding the active (trace_id, span_id)
+_trace_context: contextvars.ContextVar[Optional[Tuple[str, str]]] = (
+    contextvars.ContextVar("trace_context", default=None)
+)
+
+# Trace contexts set and not yet reset, across all tracers. While it is zero
+# no context can hold a trace, so logging skips the contextvar lookup.
+_active_trace_contexts = 0
+_active_trace_lock = threading.Lock()
+
+
+def _adjust_active_trace_contexts(delta: int):
+    """Track trace contexts being attached (+1) and restored (-1)"""
+    global _active_trace_contexts
+    with _active_trace_lock:
+        _active_trace_contexts += delta
+
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") for the last timestamp
+_timestamp_cache = (-1, "")
+
+
+def _iso_utc_now() -> str:
+    """
+    Current UTC time in the log timestamp format
+
+    Matches datetime.now(timezone.utc).isoformat() + "Z" but only formats the
+    date and time once per second; later calls in that second just append the
+    microseconds.
+
+    Returns:
+        ISO-8601 timestamp string
+    """
+    global _timestamp_cache
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _timestamp_cache
+    if seconds != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _timestamp_cache = (seconds, prefix)
+    if micros:
+        return f"{prefix}.{micros:06d}+00:00Z"
+    return f"{prefix}+00:00Z"
+
+
+def _stdlib_dumps(payload: Dict[str, Any], ensure_ascii: bool = False) -> str:
+    """Serialize with the stdlib in the same compact form orjson produces"""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=ensure_ascii)
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    """Serialize a log payload to a JSON string"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits; let the stdlib handle the edge cases
+            pass
+    return _stdlib_dumps(payload)
+
+
+def _dumps_bytes(payload: Dict[str, Any]) -> bytes:
+    """Serialize a log payload to UTF-8 JSON bytes"""
+    if orjson is not None:
+        try:
+            # orjson already produces bytes; skip the str round trip
+            return orjson.dumps(payload)
+        except TypeError:
+            pass
+    try:
+        return _stdlib_dumps(payload).encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates cannot be UTF-8 encoded; escape them instead
+        return _stdlib_dumps(payload, ensure_ascii=True).encode("utf-8")
 
 
 class LogLevel(Enum):
@@ -29,6 +127,17 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+# Severity rank per level
+_LEVEL_RANK: Dict[LogLevel, int] = {level: rank for rank, level in enumerate(LogLevel)}
+
+_LOG_LEVEL = attrgetter("level")
+
+# Standard logging function per level, resolved once
+_LOG_FUNCS: Dict[LogLevel, Callable[[str], None]] = {
+    level: getattr(logging, level.value.lower()) for level in LogLevel
+}
+
+
 class MetricType(Enum):
     """Types of metrics"""
 
@@ -38,7 +147,7 @@ class MetricType(Enum):
     TIMER = "timer"
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """Structured log entry"""
 
@@ -52,10 +161,27 @@ class LogEntry:
 
     def to_json(self) -> str:
         """Convert to JSON string"""
-        return json.dumps(asdict(self))
+        return _dumps(self._payload())
 
+    def to_json_bytes(self) -> bytes:
+        """Convert to UTF-8 encoded JSON, as written by the background writer"""
+        return _dumps_bytes(self._payload())
 
-@dataclass
+    def _payload(self) -> Dict[str, Any]:
+        """Fields to serialize"""
+        # Explicit dict instead of asdict(), which deep-copies every field
+        return {
+            "timestamp": self.timestamp,
+            "level": self.level,
+            "message": self.message,
+            "service": self.service,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "metadata": self.metadata,
+        }
+
+
+@dataclass(slots=True)
 class Metric:
     """Metric data point"""
 
@@ -70,7 +196,7 @@ class Metric:
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Span:
     """Distributed tracing span"""
 
@@ -95,7 +221,7 @@ class Span:
         """Add a log entry to this span"""
         self.logs.append(
             {
-                "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+                "timestamp": _iso_utc_now(),
                 "level": level,
                 "message": message,
                 **kwargs,
@@ -107,6 +233,81 @@ class Span:
         return asdict(self)
 
 
+class _BatchWriter:
+    """
+    Background writer for serialized log records
+
+    Producers enqueue records without blocking; a single daemon thread drains
+    whatever has accumulated and writes it to the stream as one chunk.
+    """
+
+    _STOP = object()
+
+    def __init__(self, stream: BinaryIO, queue_size: int, max_batch: int = 512):
+        """
+        Initialize batch writer
+
+        Args:
+            stream: Binary stream receiving newline-delimited records
+            queue_size: Maximum records waiting to be written
+            max_batch: Maximum records joined into a single write
+        """
+        self.stream = stream
+        self.max_batch = max_batch
+        self.dropped = 0
+        self._closed = False
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="structured-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, record: bytes):
+        """Queue a record, dropping it if the writer has fallen behind"""
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Block until every queued record has been written"""
+        self._queue.join()
+
+    def close(self):
+        """Write remaining records and stop the writer thread"""
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _run(self):
+        """Drain the queue, writing each batch with a single write call"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [record for record in batch if record is not self._STOP]
+            stop = len(records) != len(batch)
+            try:
+                if records:
+                    self.stream.write(b"\n".join(records) + b"\n")
+                    self.stream.flush()
+            except Exception:
+                logging.exception("Structured log writer failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+
 class StructuredLogger:
     """
     Structured JSON logger with trace context support
@@ -115,40 +316,58 @@ class StructuredLogger:
     automatic trace ID injection and metadata support.
     """
 
-    def __init__(self, service_name: str, min_level: LogLevel = LogLevel.INFO):
+    def __init__(
+        self,
+        service_name: str,
+        min_level: LogLevel = LogLevel.INFO,
+        output: Optional[BinaryIO] = None,
+        queue_size: int = 10_000,
+        capacity: int = 10_000,
+    ):
         """
         Initialize structured logger
 
         Args:
             service_name: Name of the service
             min_level: Minimum log level to emit
+            output: Optional binary stream for JSON lines; when set, records are
+                written in batches by a background thread instead of going
+                through the standard logging module
+            queue_size: Maximum records waiting for the background writer
+            capacity: Number of most recent entries kept for get_logs(); older
+                entries are discarded
         """
         self.service_name = service_name
-        self.min_level = min_level
-        self._logs: List[LogEntry] = []
+        self.min_level = min_level  # also sets _min_rank
+        self.capacity = capacity
+        self._logs: Deque[LogEntry] = deque(maxlen=capacity)
+        self._writer = _BatchWriter(output, queue_size) if output is not None else None
+
+    @property
+    def min_level(self) -> LogLevel:
+        """Minimum log level to emit"""
+        return self._min_level
+
+    @min_level.setter
+    def min_level(self, level: LogLevel):
+        self._min_level = level
+        self._min_rank = _LEVEL_RANK[level]
 
     def _should_log(self, level: LogLevel) -> bool:
         """Check if message at level should be logged"""
-        levels = [
-            LogLevel.DEBUG,
-            LogLevel.INFO,
-            LogLevel.WARNING,
-            LogLevel.ERROR,
-            LogLevel.CRITICAL,
-        ]
-        return levels.index(level) >= levels.index(self.min_level)
+        return _LEVEL_RANK[level] >= self._min_rank
 
     def _log(self, level: LogLevel, message: str, **metadata):
         """Internal log method"""
-        if not self._should_log(level):
+        # Inlined _should_log: filtered records cost one lookup and a compare
+        if _LEVEL_RANK[level] < self._min_rank:
             return
 
-        trace_ctx = _trace_context.get()
-        trace_id = trace_ctx.trace_id if trace_ctx else None
-        span_id = trace_ctx.span_id if trace_ctx else None
+        trace_ctx = _trace_context.get() if _active_trace_contexts else None
+        trace_id, span_id = trace_ctx if trace_ctx else (None, None)
 
         entry = LogEntry(
-            timestamp=datetime.now(timezone.utc).isoformat() + "Z",
+            timestamp=_iso_utc_now(),
             level=level.value,
             message=message,
             service=self.service_name,
@@ -158,9 +377,12 @@ class StructuredLogger:
         )
         self._logs.append(entry)
 
+        if self._writer is not None:
+            self._writer.submit(entry.to_json_bytes())
+            return
+
         # Also log to standard logging
-        log_func = getattr(logging, level.value.lower())
-        log_func(entry.to_json())
+        _LOG_FUNCS[level](entry.to_json())
 
     def debug(self, message: str, **metadata):
         """Log debug message"""
@@ -193,13 +415,132 @@ class StructuredLogger:
             List of log entries
         """
         if trace_id is None:
-            return self._logs.copy()
+            return list(self._logs)
         return [log for log in self._logs if log.trace_id == trace_id]
 
+    def get_logs_iter(self) -> Iterator[LogEntry]:
+        """
+        Iterate stored log entries without copying
+
+        The iterator is invalidated if a new entry is logged before it is
+        exhausted; use get_logs() when logging may happen concurrently.
+
+        Returns:
+            Iterator over log entries, oldest first
+        """
+        return iter(self._logs)
+
     def clear_logs(self):
         """Clear all stored logs"""
         self._logs.clear()
 
+    @property
+    def dropped_records(self) -> int:
+        """Records discarded because the background writer queue was full"""
+        return self._writer.dropped if self._writer is not None else 0
+
+    def flush(self):
+        """Block until queued records have been written to the output stream"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """Flush queued records and stop the background writer"""
+        if self._writer is not None:
+            self._writer.close()
+
+
+@lru_cache(maxsize=4096)
+def _format_metric_key(name: str, tag_items: Iterable[Tuple[str, str]]) -> str:
+    """
+    Format a metric key as name{k1=v1,k2=v2} with tags sorted by name
+
+    Args:
+        name: Metric name
+        tag_items: (tag, value) pairs; a frozenset when called through the cache
+
+    Returns:
+        Metric key string
+    """
+    tag_str = ",".join([f"{k}={v}" for k, v in sorted(tag_items)])
+    return f"{name}{{{tag_str}}}"
+
+
+# Shared read-only tags for untagged series, so they allocate no dict
+_EMPTY_TAGS: Mapping[str, str] = MappingProxyType({})
+
+
+# 30 log-spaced upper bounds from 1e-3 to 1e6, one decade per ~3.2 buckets
+DEFAULT_HISTOGRAM_BUCKETS = tuple(10.0 ** (-3 + 9 * i / 29) for i in range(30))
+
+
+class _HistogramBuckets:
+    """
+    Fixed-bucket histogram
+
+    Counts samples per upper bound instead of storing them, so memory is
+    O(buckets) and percentiles are read from cumulative counts. min, max,
+    mean and count stay exact; percentiles resolve to a bucket bound.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        # Final slot collects samples above the largest bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def record(self, value: float):
+        """Add a sample to its bucket"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def __len__(self) -> int:
+        return self.count
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarize the histogram
+
+        Returns:
+            Dictionary with min, max, mean, median, p95, p99, count
+        """
+        n = self.count
+        # Same ranks as the exact path: 1-based position of each percentile
+        ranks = {
+            "median": n // 2 + 1,
+            "p95": max(1, int(n * 0.95)),
+            "p99": max(1, int(n * 0.99)),
+        }
+        percentiles = {}
+        pending = sorted(ranks.items(), key=lambda item: item[1])
+        cumulative = 0
+        for idx, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            while pending and pending[0][1] <= cumulative:
+                name = pending.pop(0)[0]
+                bound = self.bounds[idx] if idx < len(self.bounds) else self.max
+                percentiles[name] = min(max(bound, self.min), self.max)
+            if not pending:
+                break
+
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / n,
+            **percentiles,
+            "count": n,
+        }
+
 
 class MetricsCollector:
     """
@@ -209,12 +550,48 @@ class MetricsCollector:
     and performance.
     """
 
-    def __init__(self):
-        """Initialize metrics collector"""
+    def __init__(
+        self,
+        histogram_capacity: int = 10_000,
+        histogram_buckets: Optional[Sequence[float]] = None,
+        record_events: bool = False,
+        max_events: int = 10_000,
+    ):
+        """
+        Initialize metrics collector
+
+        Args:
+            histogram_capacity: Number of most recent samples kept per
+                histogram; older samples are overwritten
+            histogram_buckets: Sorted bucket upper bounds. When given,
+                histograms count samples per bucket instead of storing them
+                and percentiles resolve to bucket bounds (see
+                DEFAULT_HISTOGRAM_BUCKETS)
+            record_events: Also keep a Metric per recorded update, for
+                callers that export the raw event stream
+            max_events: Number of most recent events kept when
+                record_events is enabled
+        """
+        self.histogram_capacity = histogram_capacity
+        self.histogram_buckets = (
+            tuple(sorted(histogram_buckets)) if histogram_buckets else None
+        )
         self._counters: Dict[str, float] = defaultdict(float)
         self._gauges: Dict[str, float] = {}
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
-        self._metrics: List[Metric] = []
+        if self.histogram_buckets is not None:
+            factory = partial(_HistogramBuckets, self.histogram_buckets)
+        else:
+            factory = partial(deque, maxlen=histogram_capacity)
+        self._histograms: Dict[str, Union[Deque[float], _HistogramBuckets]] = (
+            defaultdict(factory)
+        )
+        # Metric key -> histogram stats, dropped when the histogram changes
+        self._stats_cache: Dict[str, Dict[str, float]] = {}
+        # Metric key -> (name, tags), captured the first time a series is seen
+        self._series: Dict[str, Tuple[str, Mapping[str, str]]] = {}
+        self._events: Optional[Deque[Metric]] = (
+            deque(maxlen=max_events) if record_events else None
+        )
 
     def increment_counter(
         self, name: str, value: float = 1.0, tags: Optional[Dict[str, str]] = None
@@ -227,17 +604,13 @@ class MetricsCollector:
             value: Amount to increment (default 1.0)
             tags: Optional tags for the metric
         """
-        key = self._make_key(name, tags or {})
+        key = self._make_key(name, tags)
         self._counters[key] += value
+        if key not in self._series:
+            self._series[key] = (name, dict(tags) if tags else _EMPTY_TAGS)
 
-        metric = Metric(
-            name=name,
-            value=value,
-            metric_type=MetricType.COUNTER.value,
-            timestamp=datetime.now(timezone.utc).isoformat() + "Z",
-            tags=tags or {},
-        )
-        self._metrics.append(metric)
+        if self._events is not None:
+            self._record_event(name, value, MetricType.COUNTER, tags)
 
     def set_gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """
@@ -248,17 +621,13 @@ class MetricsCollector:
             value: Current value
             tags: Optional tags for the metric
         """
-        key = self._make_key(name, tags or {})
+        key = self._make_key(name, tags)
         self._gauges[key] = value
+        if key not in self._series:
+            self._series[key] = (name, dict(tags) if tags else _EMPTY_TAGS)
 
-        metric = Metric(
-            name=name,
-            value=value,
-            metric_type=MetricType.GAUGE.value,
-            timestamp=datetime.now(timezone.utc).isoformat() + "Z",
-            tags=tags or {},
-        )
-        self._metrics.append(metric)
+        if self._events is not None:
+            self._record_event(name, value, MetricType.GAUGE, tags)
 
     def record_histogram(
         self, name: str, value: float, tags: Optional[Dict[str, str]] = None
@@ -271,17 +640,18 @@ class MetricsCollector:
             value: Value to record
             tags: Optional tags for the metric
         """
-        key = self._make_key(name, tags or {})
-        self._histograms[key].append(value)
-
-        metric = Metric(
-            name=name,
-            value=value,
-            metric_type=MetricType.HISTOGRAM.value,
-            timestamp=datetime.now(timezone.utc).isoformat() + "Z",
-            tags=tags or {},
-        )
-        self._metrics.append(metric)
+        key = self._make_key(name, tags)
+        histogram = self._histograms[key]
+        if self.histogram_buckets is not None:
+            histogram.record(value)
+        else:
+            histogram.append(value)
+        self._stats_cache.pop(key, None)
+        if key not in self._series:
+            self._series[key] = (name, dict(tags) if tags else _EMPTY_TAGS)
+
+        if self._events is not None:
+            self._record_event(name, value, MetricType.HISTOGRAM, tags)
 
     def time_operation(self, name: str, tags: Optional[Dict[str, str]] = None):
         """
@@ -296,18 +666,18 @@ class MetricsCollector:
                 # code to time
                 pass
         """
-        return Timer(self, name, tags or {})
+        return Timer(self, name, tags)
 
     def get_counter(self, name: str, tags: Optional[Dict[str, str]] = None) -> float:
         """Get current counter value"""
-        key = self._make_key(name, tags or {})
+        key = self._make_key(name, tags)
         return self._counters.get(key, 0.0)
 
     def get_gauge(
         self, name: str, tags: Optional[Dict[str, str]] = None
     ) -> Optional[float]:
         """Get current gauge value"""
-        key = self._make_key(name, tags or {})
+        key = self._make_key(name, tags)
         return self._gauges.get(key)
 
     def get_histogram_stats(
@@ -316,15 +686,43 @@ class MetricsCollector:
         """
         Get statistics for a histogram
 
+        Statistics cover the most recent ``histogram_capacity`` samples.
+
         Returns:
             Dictionary with min, max, mean, median, p95, p99
         """
-        key = self._make_key(name, tags or {})
-        values = self._histograms.get(key, [])
+        return self._cached_histogram_stats(self._make_key(name, tags))
+
+    def get_all_histogram_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get statistics for every histogram series
 
+        Returns:
+            Mapping of metric key to the get_histogram_stats() dictionary
+        """
+        return {key: self._cached_histogram_stats(key) for key in self._histograms}
+
+    def _cached_histogram_stats(self, key: str) -> Dict[str, float]:
+        """Stats for one histogram, recomputed only after new samples"""
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            stats = self._histogram_stats(self._histograms.get(key))
+            if stats:
+                self._stats_cache[key] = stats
+        # Copy so callers cannot edit the cached summary
+        return dict(stats)
+
+    @staticmethod
+    def _histogram_stats(
+        values: Optional[Union[Deque[float], _HistogramBuckets]],
+    ) -> Dict[str, float]:
+        """Summarize one histogram's samples or buckets"""
         if not values:
             return {}
 
+        if isinstance(values, _HistogramBuckets):
+            return values.stats()
+
         sorted_values = sorted(values)
         n = len(sorted_values)
 
@@ -342,28 +740,90 @@ class MetricsCollector:
         }
 
     def get_all_metrics(self) -> List[Metric]:
-        """Get all recorded metrics"""
-        return self._metrics.copy()
+        """
+        Get all recorded metrics
+
+        Returns:
+            One Metric per recorded update when record_events is enabled.
+            Otherwise one Metric per series built from the aggregates:
+            counter totals, current gauge values and histogram means,
+            timestamped now.
+        """
+        if self._events is not None:
+            return list(self._events)
+
+        timestamp = _iso_utc_now()
+        metrics = []
+        for metric_type, values in (
+            (MetricType.COUNTER, self._counters),
+            (MetricType.GAUGE, self._gauges),
+        ):
+            for key, value in values.items():
+                name, tags = self._series[key]
+                metrics.append(
+                    Metric(name, value, metric_type.value, timestamp, dict(tags))
+                )
+        for key, values in self._histograms.items():
+            if not values:
+                continue
+            if isinstance(values, _HistogramBuckets):
+                mean = values.total / values.count
+            else:
+                mean = sum(values) / len(values)
+            name, tags = self._series[key]
+            metrics.append(
+                Metric(name, mean, MetricType.HISTOGRAM.value, timestamp, dict(tags))
+            )
+        return metrics
 
     def clear_metrics(self):
         """Clear all metrics"""
         self._counters.clear()
         self._gauges.clear()
         self._histograms.clear()
-        self._metrics.clear()
+        self._stats_cache.clear()
+        self._series.clear()
+        if self._events is not None:
+            self._events.clear()
+
+    def _record_event(
+        self,
+        name: str,
+        value: float,
+        metric_type: MetricType,
+        tags: Optional[Dict[str, str]],
+    ):
+        """Append a raw metric event (record_events mode only)"""
+        self._events.append(
+            Metric(
+                name=name,
+                value=value,
+                metric_type=metric_type.value,
+                timestamp=_iso_utc_now(),
+                tags=tags or {},
+            )
+        )
 
-    def _make_key(self, name: str, tags: Dict[str, str]) -> str:
+    def _make_key(self, name: str, tags: Optional[Dict[str, str]]) -> str:
         """Create a unique key from metric name and tags"""
         if not tags:
             return name
-        tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
-        return f"{name}{{{tag_str}}}"
+        try:
+            return _format_metric_key(name, frozenset(tags.items()))
+        except TypeError:
+            # Unhashable tag values cannot be cached; format them directly
+            return _format_metric_key.__wrapped__(name, tags.items())
 
 
 class Timer:
     """Context manager for timing operations"""
 
-    def __init__(self, collector: MetricsCollector, name: str, tags: Dict[str, str]):
+    def __init__(
+        self,
+        collector: MetricsCollector,
+        name: str,
+        tags: Optional[Dict[str, str]] = None,
+    ):
         self.collector = collector
         self.name = name
         self.tags = tags
@@ -385,11 +845,20 @@ class Tracer:
     Creates and manages spans for distributed tracing across services.
     """
 
-    def __init__(self):
-        """Initialize tracer"""
-        self._spans: Dict[str, List[Span]] = defaultdict(list)
+    def __init__(self, max_spans_per_trace: int = 10_000):
+        """
+        Initialize tracer
+
+        Args:
+            max_spans_per_trace: Spans retained per trace; the oldest are
+                discarded once a long-running trace exceeds this
+        """
+        self.max_spans_per_trace = max_spans_per_trace
+        self._spans: Dict[str, Deque[Span]] = {}
         self._active_spans: Dict[str, Span] = {}
-        self._span_counter = 0
+        # span_id -> token restoring the trace context that preceded the span
+        self._context_tokens: Dict[str, contextvars.Token] = {}
+        self._span_counter = itertools.count(1)
 
     def start_trace(
         self, operation: str, tags: Optional[Dict[str, str]] = None
@@ -416,11 +885,8 @@ class Tracer:
             tags=tags or {},
         )
 
-        self._spans[trace_id].append(span)
-        self._active_spans[span_id] = span
-
-        # Set trace context
-        _trace_context.set(span)
+        self._store_span(span)
+        self._attach_context(span)
 
         return span
 
@@ -449,11 +915,8 @@ class Tracer:
             tags=tags or {},
         )
 
-        self._spans[parent_span.trace_id].append(span)
-        self._active_spans[span_id] = span
-
-        # Update trace context
-        _trace_context.set(span)
+        self._store_span(span)
+        self._attach_context(span)
 
         return span
 
@@ -465,9 +928,33 @@ class Tracer:
             span: Span to finish
             status: Status (success, error)
         """
+        self._finish(span, status)
+        self._detach_context(span)
+
+    def _finish(self, span: Span, status: str):
+        """Complete a span without touching the trace context"""
         span.finish(status)
-        if span.span_id in self._active_spans:
-            del self._active_spans[span.span_id]
+        self._active_spans.pop(span.span_id, None)
+
+    def _attach_context(self, span: Span):
+        """Make span the current trace context"""
+        _adjust_active_trace_contexts(1)
+        self._context_tokens[span.span_id] = _trace_context.set(
+            (span.trace_id, span.span_id)
+        )
+
+    def _detach_context(self, span: Span):
+        """Restore the trace context that was current before span started"""
+        token = self._context_tokens.pop(span.span_id, None)
+        if token is None:
+            return
+        try:
+            _trace_context.reset(token)
+        except ValueError:
+            # Finished from a different context than it was started in; that
+            # context still holds the span, so it stays counted as active
+            return
+        _adjust_active_trace_contexts(-1)
 
     def get_trace(self, trace_id: str) -> List[Span]:
         """
@@ -479,27 +966,39 @@ class Tracer:
         Returns:
             List of spans in the trace
         """
-        return self._spans.get(trace_id, []).copy()
+        return list(self._spans.get(trace_id, ()))
 
-    def get_all_traces(self) -> Dict[str, List[Span]]:
-        """Get all traces"""
-        return {k: v.copy() for k, v in self._spans.items()}
+    def get_all_traces(self) -> Mapping[str, Sequence[Span]]:
+        """
+        Get all traces
+
+        Returns:
+            Read-only live view of trace ID to spans; copy it to keep a
+            snapshot
+        """
+        return MappingProxyType(self._spans)
 
     def clear_traces(self):
         """Clear all traces"""
         self._spans.clear()
         self._active_spans.clear()
+        self._context_tokens.clear()
 
-    def _generate_trace_id(self) -> str:
-        """Generate a unique trace ID"""
-        import uuid
+    def _store_span(self, span: Span):
+        """Record a new span under its trace and mark it active"""
+        spans = self._spans.get(span.trace_id)
+        if spans is None:
+            spans = self._spans[span.trace_id] = deque(maxlen=self.max_spans_per_trace)
+        spans.append(span)
+        self._active_spans[span.span_id] = span
 
-        return uuid.uuid4().hex
+    def _generate_trace_id(self) -> str:
+        """Generate a unique trace ID (32 random hex characters)"""
+        return os.urandom(16).hex()
 
     def _generate_span_id(self) -> str:
         """Generate a unique span ID"""
-        self._span_counter += 1
-        return f"span_{self._span_counter:08x}"
+        return f"span_{next(self._span_counter):08x}"
 
 
 class ObservabilityStack:
@@ -531,7 +1030,8 @@ class ObservabilityStack:
 
     def finish_span(self, span: Span, status: str = "success"):
         """Finish a span"""
-        self.tracer.finish_span(span, status)
+        self.tracer._finish(span, status)
+        # Log while the span is still the current context, then restore it
         self.logger.info(
             f"Finished span: {span.operation}",
             trace_id=span.trace_id,
@@ -539,6 +1039,7 @@ class ObservabilityStack:
             status=status,
         )
         self.metrics.record_histogram("span.duration", span.duration_ms)
+        self.tracer._detach_context(span)
 
     def get_dashboard_data(self) -> Dict[str, Any]:
         """
@@ -547,22 +1048,18 @@ class ObservabilityStack:
         Returns:
             Dictionary with logs, metrics, and trace summaries
         """
+        by_level = self._count_logs_by_level()
         return {
             "service": self.service_name,
-            "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+            "timestamp": _iso_utc_now(),
             "logs": {
-                "total": len(self.logger.get_logs()),
-                "by_level": self._count_logs_by_level(),
+                "total": sum(by_level.values()),
+                "by_level": by_level,
             },
             "metrics": {
                 "counters": dict(self.metrics._counters),
                 "gauges": dict(self.metrics._gauges),
-                "histograms": {
-                    name: self.metrics.get_histogram_stats(
-                        name.split("{")[0], self._parse_tags(name)
-                    )
-                    for name in self.metrics._histograms.keys()
-                },
+                "histograms": self.metrics.get_all_histogram_stats(),
             },
             "traces": {
                 "total": len(self.tracer._spans),
@@ -572,14 +1069,6 @@ class ObservabilityStack:
 
     def _count_logs_by_level(self) -> Dict[str, int]:
         """Count logs by level"""
-        counts = defaultdict(int)
-        for log in self.logger.get_logs():
-            counts[log.level] += 1
-        return dict(counts)
-
-    def _parse_tags(self, key: str) -> Dict[str, str]:
-        """Parse tags from metric key"""
-        if "{" not in key:
-            return {}
-        tag_str = key.split("{")[1].rstrip("}")
-        return dict(pair.split("=") for pair in tag_str.split(",") if pair)
+        # map/attrgetter keep the whole pass in C, so no other thread can
+        # append to the log deque while it is being iterated
+        return dict(Counter(map(_LOG_LEVEL, self.logger.get_logs_iter())))
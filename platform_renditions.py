@@ -4,7 +4,8 @@ Platform-specific media rendition specifications for Discord, Slack, Teams, etc.
 """
 
 from enum import Enum
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from dataclasses import dataclass
 
 
@@ -19,9 +20,9 @@ class Platform(str, Enum):
     GENERIC = "generic"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RenditionSpec:
-    """Specification for a platform-specific rendition"""
+    """Specification for a platform-specific rendition (immutable, shared)"""
 
     platform: Platform
     max_width: Optional[int] = None
@@ -130,20 +131,38 @@ class PlatformRenditions:
         )
 
     @staticmethod
-    def get_all_specs() -> Dict[Platform, RenditionSpec]:
-        """Get default specification for each platform"""
-        return {
-            Platform.DISCORD: PlatformRenditions.get_discord_spec(),
-            Platform.SLACK: PlatformRenditions.get_slack_spec(),
-            Platform.TEAMS: PlatformRenditions.get_teams_spec(),
-            Platform.TWITTER: PlatformRenditions.get_twitter_spec(),
-            Platform.WEB: PlatformRenditions.get_web_1080p_spec(),
-        }
+    def get_all_specs() -> Mapping[Platform, RenditionSpec]:
+        """Get default specification for each platform (read-only)"""
+        return _ALL_SPECS
 
     @staticmethod
     def get_spec_for_platform(platform: Platform) -> Optional[RenditionSpec]:
         """Get specification for a specific platform"""
-        return PlatformRenditions.get_all_specs().get(platform)
+        return _ALL_SPECS.get(platform)
+
+
+# Default spec per platform, built once at import
+_ALL_SPECS: Mapping[Platform, RenditionSpec] = MappingProxyType(
+    {
+        Platform.DISCORD: PlatformRenditions.get_discord_spec(),
+        Platform.SLACK: PlatformRenditions.get_slack_spec(),
+        Platform.TEAMS: PlatformRenditions.get_teams_spec(),
+        Platform.TWITTER: PlatformRenditions.get_twitter_spec(),
+        Platform.WEB: PlatformRenditions.get_web_1080p_spec(),
+    }
+)
+
+_PLATFORM_CONSTRAINTS: Dict[Platform, Dict] = {
+    platform: {
+        "max_width": spec.max_width,
+        "max_height": spec.max_height,
+        "max_file_size_mb": spec.max_file_size_mb,
+        "video_bitrate": spec.video_bitrate,
+        "quality": spec.quality,
+        "description": spec.description,
+    }
+    for platform, spec in _ALL_SPECS.items()
+}
 
 
 # Utility functions
@@ -156,18 +175,9 @@ def get_platform_constraints(platform: Platform) -> Dict:
     Returns:
         Dict with max_width, max_height, max_file_size_mb, etc.
     """
-    spec = PlatformRenditions.get_spec_for_platform(platform)
-    if not spec:
-        return {}
-
-    return {
-        "max_width": spec.max_width,
-        "max_height": spec.max_height,
-        "max_file_size_mb": spec.max_file_size_mb,
-        "video_bitrate": spec.video_bitrate,
-        "quality": spec.quality,
-        "description": spec.description,
-    }
+    constraints = _PLATFORM_CONSTRAINTS.get(platform)
+    # Copy so callers cannot edit the shared table
+    return dict(constraints) if constraints else {}
 
 
 if __name__ == "__main__":
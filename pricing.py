@@ -5,8 +5,8 @@ Issue: #47
 Depends on: rate-limits, analytics
 """
 
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass, field
 import time
@@ -137,6 +137,76 @@ PLAN_CONFIGS = {
 }
 
 
+# Quota type -> (status key, plan limit attr, usage attr, usage type)
+_QUOTA_FIELDS: Dict[QuotaType, Tuple[str, str, str, type]] = {
+    QuotaType.UPLOADS_PER_MONTH: (
+        "uploads",
+        "max_uploads_per_month",
+        "uploads_this_month",
+        int,
+    ),
+    QuotaType.STORAGE_GB: (
+        "storage_gb",
+        "max_storage_gb",
+        "storage_used_gb",
+        float,
+    ),
+    QuotaType.BANDWIDTH_GB: (
+        "bandwidth_gb",
+        "max_bandwidth_gb_per_month",
+        "bandwidth_used_gb_this_month",
+        float,
+    ),
+    QuotaType.TEAM_MEMBERS: (
+        "team_members",
+        "max_team_members",
+        "team_members_count",
+        int,
+    ),
+    QuotaType.API_REQUESTS_PER_DAY: (
+        "api_requests",
+        "api_requests_per_day",
+        "api_requests_today",
+        int,
+    ),
+}
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# (epoch second, day bucket, month bucket) for the last lookup
+_period_cache = (-1, 0, 0)
+
+
+def _period_buckets() -> Tuple[int, int]:
+    """
+    Current local day and month as integer bucket IDs
+
+    The calendar conversion runs at most once per wall-clock second.
+
+    Returns:
+        Tuple of (days since 1970-01-01, year * 12 + month - 1)
+    """
+    global _period_cache
+    second = int(time.time())
+    cached_second, day, month = _period_cache
+    if second != cached_second:
+        now = time.localtime(second)
+        day = date(now.tm_year, now.tm_mon, now.tm_mday).toordinal() - _EPOCH_ORDINAL
+        month = now.tm_year * 12 + now.tm_mon - 1
+        _period_cache = (second, day, month)
+    return day, month
+
+
+def _day_bucket() -> int:
+    """Bucket ID of the current local day"""
+    return _period_buckets()[0]
+
+
+def _month_bucket() -> int:
+    """Bucket ID of the current local month"""
+    return _period_buckets()[1]
+
+
 @dataclass
 class UsageStats:
     """Current usage statistics for a user/account"""
@@ -147,17 +217,28 @@ class UsageStats:
     team_members_count: int = 1
     api_requests_today: int = 0
 
-    # Timestamps for period tracking
-    month_start: datetime = field(
-        default_factory=lambda: datetime.now().replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-    )
-    day_start: datetime = field(
-        default_factory=lambda: datetime.now().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-    )
+    # Period tracking as integer buckets (see _period_buckets)
+    month_bucket: int = field(default_factory=_month_bucket)
+    day_bucket: int = field(default_factory=_day_bucket)
+
+    @property
+    def month_start(self) -> datetime:
+        """Local start of the tracked month"""
+        year, month = divmod(self.month_bucket, 12)
+        return datetime(year, month + 1, 1)
+
+    @month_start.setter
+    def month_start(self, value: datetime):
+        self.month_bucket = value.year * 12 + value.month - 1
+
+    @property
+    def day_start(self) -> datetime:
+        """Local start of the tracked day"""
+        return datetime.fromordinal(self.day_bucket + _EPOCH_ORDINAL)
+
+    @day_start.setter
+    def day_start(self, value: datetime):
+        self.day_bucket = value.toordinal() - _EPOCH_ORDINAL
 
 
 class QuotaExceededError(Exception):
@@ -212,26 +293,22 @@ class PricingManager:
         Returns:
             Current usage statistics
         """
-        if user_id not in self._user_usage:
-            self._user_usage[user_id] = UsageStats()
+        usage = self._user_usage.get(user_id)
+        if usage is None:
+            usage = self._user_usage[user_id] = UsageStats()
 
-        # Reset monthly counters if needed
-        usage = self._user_usage[user_id]
-        now = datetime.now()
-        current_month_start = now.replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
+        day, month = _period_buckets()
 
-        if usage.month_start < current_month_start:
+        # Reset monthly counters if needed
+        if usage.month_bucket < month:
             usage.uploads_this_month = 0
             usage.bandwidth_used_gb_this_month = 0.0
-            usage.month_start = current_month_start
+            usage.month_bucket = month
 
         # Reset daily counters if needed
-        current_day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        if usage.day_start < current_day_start:
+        if usage.day_bucket < day:
             usage.api_requests_today = 0
-            usage.day_start = current_day_start
+            usage.day_bucket = day
 
         return usage
 
@@ -255,23 +332,12 @@ class PricingManager:
         plan = self.get_plan(user_id)
         usage = self.get_usage(user_id)
 
-        if quota_type == QuotaType.UPLOADS_PER_MONTH:
-            limit = plan.max_uploads_per_month
-            current = usage.uploads_this_month
-        elif quota_type == QuotaType.STORAGE_GB:
-            limit = plan.max_storage_gb
-            current = usage.storage_used_gb
-        elif quota_type == QuotaType.BANDWIDTH_GB:
-            limit = plan.max_bandwidth_gb_per_month
-            current = usage.bandwidth_used_gb_this_month
-        elif quota_type == QuotaType.TEAM_MEMBERS:
-            limit = plan.max_team_members
-            current = usage.team_members_count
-        elif quota_type == QuotaType.API_REQUESTS_PER_DAY:
-            limit = plan.api_requests_per_day
-            current = usage.api_requests_today
-        else:
+        quota_fields = _QUOTA_FIELDS.get(quota_type)
+        if quota_fields is None:
             return True  # Unknown quota type, allow
+        _, plan_attr, usage_attr, _ = quota_fields
+        limit = getattr(plan, plan_attr)
+        current = getattr(usage, usage_attr)
 
         if current + amount > limit:
             raise QuotaExceededError(quota_type, current, limit)
@@ -296,18 +362,12 @@ class PricingManager:
         self.check_quota(user_id, quota_type, amount)
 
         # Update usage
+        quota_fields = _QUOTA_FIELDS.get(quota_type)
+        if quota_fields is None:
+            return
+        _, _, usage_attr, usage_type = quota_fields
         usage = self.get_usage(user_id)
-
-        if quota_type == QuotaType.UPLOADS_PER_MONTH:
-            usage.uploads_this_month += int(amount)
-        elif quota_type == QuotaType.STORAGE_GB:
-            usage.storage_used_gb += amount
-        elif quota_type == QuotaType.BANDWIDTH_GB:
-            usage.bandwidth_used_gb_this_month += amount
-        elif quota_type == QuotaType.TEAM_MEMBERS:
-            usage.team_members_count += int(amount)
-        elif quota_type == QuotaType.API_REQUESTS_PER_DAY:
-            usage.api_requests_today += int(amount)
+        setattr(usage, usage_attr, getattr(usage, usage_attr) + usage_type(amount))
 
     def get_quota_status(self, user_id: str) -> Dict:
         """
@@ -322,60 +382,20 @@ class PricingManager:
         plan = self.get_plan(user_id)
         usage = self.get_usage(user_id)
 
+        quotas = {}
+        for status_key, plan_attr, usage_attr, _ in _QUOTA_FIELDS.values():
+            used = getattr(usage, usage_attr)
+            limit = getattr(plan, plan_attr)
+            quotas[status_key] = {
+                "used": used,
+                "limit": limit,
+                "percentage": (used / limit * 100) if limit > 0 else 0,
+            }
+
         return {
             "plan": plan.name,
             "tier": plan.tier.value,
-            "quotas": {
-                "uploads": {
-                    "used": usage.uploads_this_month,
-                    "limit": plan.max_uploads_per_month,
-                    "percentage": (
-                        (usage.uploads_this_month / plan.max_uploads_per_month * 100)
-                        if plan.max_uploads_per_month > 0
-                        else 0
-                    ),
-                },
-                "storage_gb": {
-                    "used": usage.storage_used_gb,
-                    "limit": plan.max_storage_gb,
-                    "percentage": (
-                        (usage.storage_used_gb / plan.max_storage_gb * 100)
-                        if plan.max_storage_gb > 0
-                        else 0
-                    ),
-                },
-                "bandwidth_gb": {
-                    "used": usage.bandwidth_used_gb_this_month,
-                    "limit": plan.max_bandwidth_gb_per_month,
-                    "percentage": (
-                        (
-                            usage.bandwidth_used_gb_this_month
-                            / plan.max_bandwidth_gb_per_month
-                            * 100
-                        )
-                        if plan.max_bandwidth_gb_per_month > 0
-                        else 0
-                    ),
-                },
-                "team_members": {
-                    "used": usage.team_members_count,
-                    "limit": plan.max_team_members,
-                    "percentage": (
-                        (usage.team_members_count / plan.max_team_members * 100)
-                        if plan.max_team_members > 0
-                        else 0
-                    ),
-                },
-                "api_requests": {
-                    "used": usage.api_requests_today,
-                    "limit": plan.api_requests_per_day,
-                    "percentage": (
-                        (usage.api_requests_today / plan.api_requests_per_day * 100)
-                        if plan.api_requests_per_day > 0
-                        else 0
-                    ),
-                },
-            },
+            "quotas": quotas,
             "features": {
                 "team_collaboration": plan.team_collaboration,
                 "priority_support": plan.priority_support,
@@ -400,33 +420,11 @@ class PricingManager:
         """
         current_plan = self._user_plans.get(user_id, PlanTier.FREE)
 
-        upgrade_options = []
-        if current_plan == PlanTier.FREE:
-            upgrade_options = [
-                {
-                    "tier": PlanTier.PRO.value,
-                    "name": PLAN_CONFIGS[PlanTier.PRO].name,
-                    "price": PLAN_CONFIGS[PlanTier.PRO].price_monthly_usd,
-                    "benefits": self._get_upgrade_benefits(PlanTier.FREE, PlanTier.PRO),
-                },
-                {
-                    "tier": PlanTier.TEAM.value,
-                    "name": PLAN_CONFIGS[PlanTier.TEAM].name,
-                    "price": PLAN_CONFIGS[PlanTier.TEAM].price_monthly_usd,
-                    "benefits": self._get_upgrade_benefits(
-                        PlanTier.FREE, PlanTier.TEAM
-                    ),
-                },
-            ]
-        elif current_plan == PlanTier.PRO:
-            upgrade_options = [
-                {
-                    "tier": PlanTier.TEAM.value,
-                    "name": PLAN_CONFIGS[PlanTier.TEAM].name,
-                    "price": PLAN_CONFIGS[PlanTier.TEAM].price_monthly_usd,
-                    "benefits": self._get_upgrade_benefits(PlanTier.PRO, PlanTier.TEAM),
-                }
-            ]
+        # Copy the precomputed options so callers cannot edit the shared table
+        upgrade_options = [
+            {**option, "benefits": list(option["benefits"])}
+            for option in _UPGRADE_OPTIONS[current_plan.value]
+        ]
 
         return {"current_plan": current_plan.value, "upgrade_options": upgrade_options}
 
@@ -434,52 +432,89 @@ class PricingManager:
         self, from_tier: PlanTier, to_tier: PlanTier
     ) -> List[str]:
         """Get list of benefits when upgrading between tiers"""
-        from_plan = PLAN_CONFIGS[from_tier]
-        to_plan = PLAN_CONFIGS[to_tier]
+        return list(_UPGRADE_BENEFITS[(from_tier.value, to_tier.value)])
+
+
+def _compute_upgrade_benefits(from_tier: PlanTier, to_tier: PlanTier) -> List[str]:
+    """
+    Describe what changes when moving from one plan to another
+
+    Args:
+        from_tier: Current plan tier
+        to_tier: Target plan tier
 
-        benefits = []
+    Returns:
+        Human-readable benefit strings
+    """
+    from_plan = PLAN_CONFIGS[from_tier]
+    to_plan = PLAN_CONFIGS[to_tier]
 
-        if to_plan.max_uploads_per_month > from_plan.max_uploads_per_month:
-            benefits.append(
-                f"{to_plan.max_uploads_per_month} uploads/month (from {from_plan.max_uploads_per_month})"
-            )
+    benefits = []
 
-        if to_plan.max_storage_gb > from_plan.max_storage_gb:
-            benefits.append(
-                f"{to_plan.max_storage_gb}GB storage (from {from_plan.max_storage_gb}GB)"
-            )
+    if to_plan.max_uploads_per_month > from_plan.max_uploads_per_month:
+        benefits.append(
+            f"{to_plan.max_uploads_per_month} uploads/month (from {from_plan.max_uploads_per_month})"
+        )
+
+    if to_plan.max_storage_gb > from_plan.max_storage_gb:
+        benefits.append(
+            f"{to_plan.max_storage_gb}GB storage (from {from_plan.max_storage_gb}GB)"
+        )
 
-        if to_plan.max_bandwidth_gb_per_month > from_plan.max_bandwidth_gb_per_month:
-            benefits.append(
-                f"{to_plan.max_bandwidth_gb_per_month}GB bandwidth/month (from {from_plan.max_bandwidth_gb_per_month}GB)"
-            )
+    if to_plan.max_bandwidth_gb_per_month > from_plan.max_bandwidth_gb_per_month:
+        benefits.append(
+            f"{to_plan.max_bandwidth_gb_per_month}GB bandwidth/month (from {from_plan.max_bandwidth_gb_per_month}GB)"
+        )
 
-        if to_plan.max_team_members > from_plan.max_team_members:
-            benefits.append(f"Up to {to_plan.max_team_members} team members")
+    if to_plan.max_team_members > from_plan.max_team_members:
+        benefits.append(f"Up to {to_plan.max_team_members} team members")
 
-        if to_plan.team_collaboration and not from_plan.team_collaboration:
-            benefits.append("Team collaboration features")
+    if to_plan.team_collaboration and not from_plan.team_collaboration:
+        benefits.append("Team collaboration features")
 
-        if to_plan.priority_support and not from_plan.priority_support:
-            benefits.append("Priority support")
+    if to_plan.priority_support and not from_plan.priority_support:
+        benefits.append("Priority support")
 
-        if to_plan.custom_branding and not from_plan.custom_branding:
-            benefits.append("Custom branding")
+    if to_plan.custom_branding and not from_plan.custom_branding:
+        benefits.append("Custom branding")
 
-        if to_plan.watermark_removal and not from_plan.watermark_removal:
-            benefits.append("Watermark removal")
+    if to_plan.watermark_removal and not from_plan.watermark_removal:
+        benefits.append("Watermark removal")
 
-        if to_plan.custom_domain and not from_plan.custom_domain:
-            benefits.append("Custom domain support")
+    if to_plan.custom_domain and not from_plan.custom_domain:
+        benefits.append("Custom domain support")
 
-        if to_plan.webhook_notifications and not from_plan.webhook_notifications:
-            benefits.append("Webhook notifications")
+    if to_plan.webhook_notifications and not from_plan.webhook_notifications:
+        benefits.append("Webhook notifications")
 
-        # Platform differences
-        new_platforms = set(to_plan.platform_distribution) - set(
-            from_plan.platform_distribution
-        )
-        if new_platforms:
-            benefits.append(f"Additional platforms: {', '.join(new_platforms)}")
+    # Platform differences
+    new_platforms = set(to_plan.platform_distribution) - set(
+        from_plan.platform_distribution
+    )
+    if new_platforms:
+        benefits.append(f"Additional platforms: {', '.join(new_platforms)}")
 
-        return benefits
+    return benefits
+
+
+# Plans are static, so upgrade benefits and options are computed once at import
+_UPGRADE_BENEFITS: Dict[Tuple[str, str], List[str]] = {
+    (from_tier.value, to_tier.value): _compute_upgrade_benefits(from_tier, to_tier)
+    for from_tier in PlanTier
+    for to_tier in PlanTier
+    if from_tier is not to_tier
+}
+
+# Tier value -> upgrade options, i.e. every tier listed after it in PlanTier
+_UPGRADE_OPTIONS: Dict[str, List[Dict]] = {
+    from_tier.value: [
+        {
+            "tier": to_tier.value,
+            "name": PLAN_CONFIGS[to_tier].name,
+            "price": PLAN_CONFIGS[to_tier].price_monthly_usd,
+            "benefits": _UPGRADE_BENEFITS[(from_tier.value, to_tier.value)],
+        }
+        for to_tier in list(PlanTier)[index + 1 :]
+    ]
+    for index, from_tier in enumerate(PlanTier)
+}
@@ -4,10 +4,11 @@ Provides rate limiting and abuse protection
 Issue: #22
 """
 
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from enum import Enum
-from collections import deque
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 
@@ -34,7 +35,7 @@ class RateLimitConfig:
     strategy: RateLimitStrategy = RateLimitStrategy.TOKEN_BUCKET
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenBucket:
     """Token bucket for rate limiting"""
 
@@ -57,17 +58,48 @@ class TokenBucket:
         Returns:
             True if tokens were consumed, False if not enough tokens
         """
-        self._refill()
+        return self.try_consume(tokens)[0]
 
-        if self.tokens >= tokens:
-            self.tokens -= tokens
-            return True
-        return False
+    def try_consume(
+        self, tokens: int = 1, now: Optional[float] = None
+    ) -> Tuple[bool, float]:
+        """
+        Try to consume tokens, reporting the wait time on failure
+
+        Args:
+            tokens: Number of tokens to consume
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Tuple of (consumed, seconds to wait; 0.0 when consumed)
+        """
+        if now is None:
+            now = time.time()
 
-    def _refill(self) -> None:
+        # _refill() inlined: this runs once per rate-limited request
+        # A caller's clock read may predate this bucket's creation; never
+        # refill by a negative interval or move last_refill backwards
+        available = self.tokens
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            available += elapsed * self.refill_rate
+            if available > self.capacity:
+                available = self.capacity
+            self.last_refill = now
+
+        if available >= tokens:
+            self.tokens = available - tokens
+            return True, 0.0
+        self.tokens = available
+        return False, (tokens - available) / self.refill_rate
+
+    def _refill(self, now: Optional[float] = None) -> None:
         """Refill tokens based on elapsed time"""
-        now = time.time()
+        if now is None:
+            now = time.time()
         elapsed = now - self.last_refill
+        if elapsed <= 0:
+            return
 
         # Add tokens based on elapsed time
         new_tokens = elapsed * self.refill_rate
@@ -93,7 +125,7 @@ class TokenBucket:
         return tokens_needed / self.refill_rate
 
 
-@dataclass
+@dataclass(slots=True)
 class FixedWindow:
     """Fixed window rate limiter"""
 
@@ -112,7 +144,23 @@ class FixedWindow:
         Returns:
             True if request allowed, False if limit exceeded
         """
-        now = time.time()
+        return self.try_consume(count)[0]
+
+    def try_consume(
+        self, count: int = 1, now: Optional[float] = None
+    ) -> Tuple[bool, float]:
+        """
+        Try to consume from the window, reporting the wait time on failure
+
+        Args:
+            count: Number of requests to consume
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Tuple of (allowed, seconds to wait; 0.0 when allowed)
+        """
+        if now is None:
+            now = time.time()
 
         # Reset window if expired
         if now - self.window_start >= self.window_seconds:
@@ -121,8 +169,9 @@ class FixedWindow:
 
         if self.count + count <= self.limit:
             self.count += count
-            return True
-        return False
+            return True, 0.0
+        # Wait until window resets
+        return False, self.window_seconds - (now - self.window_start)
 
     def get_wait_time(self, count: int = 1) -> float:
         """
@@ -144,13 +193,47 @@ class FixedWindow:
         return self.window_seconds - (now - self.window_start)
 
 
-@dataclass
+@dataclass(slots=True)
 class SlidingWindow:
-    """Sliding window rate limiter"""
+    """
+    Sliding window rate limiter
+
+    Requests are counted in num_buckets fixed-width buckets spanning the
+    window instead of one timestamp each, so memory per key is constant. A
+    request stops counting between one bucket width before, and exactly
+    window_seconds after, it was made.
+    """
 
     limit: int
     window_seconds: int
-    timestamps: deque = field(default_factory=deque)
+    num_buckets: int = 60
+    buckets: List[int] = field(init=False)
+    bucket_seconds: float = field(init=False)
+    total: int = field(init=False, default=0)
+    head: int = field(init=False)  # absolute index of the newest bucket
+
+    def __post_init__(self):
+        self.buckets = [0] * self.num_buckets
+        self.bucket_seconds = self.window_seconds / self.num_buckets
+        self.head = int(time.time() // self.bucket_seconds)
+
+    def _advance(self, now: float) -> None:
+        """Expire buckets that have slid out of the window"""
+        current = int(now // self.bucket_seconds)
+        gap = current - self.head
+        if gap <= 0:
+            return
+        if gap >= self.num_buckets:
+            if self.total:
+                self.buckets = [0] * self.num_buckets
+                self.total = 0
+        else:
+            buckets = self.buckets
+            for absolute in range(self.head + 1, current + 1):
+                slot = absolute % self.num_buckets
+                self.total -= buckets[slot]
+                buckets[slot] = 0
+        self.head = current
 
     def consume(self, count: int = 1) -> bool:
         """
@@ -162,18 +245,35 @@ class SlidingWindow:
         Returns:
             True if request allowed, False if limit exceeded
         """
-        now = time.time()
+        return self.try_consume(count)[0]
+
+    def try_consume(
+        self, count: int = 1, now: Optional[float] = None
+    ) -> Tuple[bool, float]:
+        """
+        Try to consume from the window, reporting the wait time on failure
 
-        # Remove expired timestamps
-        cutoff = now - self.window_seconds
-        while self.timestamps and self.timestamps[0] < cutoff:
-            self.timestamps.popleft()
+        Args:
+            count: Number of requests to consume
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Tuple of (allowed, seconds to wait; 0.0 when allowed)
+        """
+        if now is None:
+            now = time.time()
+        self._advance(now)
+
+        if self.total + count <= self.limit:
+            self.buckets[self.head % self.num_buckets] += count
+            self.total += count
+            return True, 0.0
+        return False, self._oldest_expiry(now)
 
-        if len(self.timestamps) + count <= self.limit:
-            for _ in range(count):
-                self.timestamps.append(now)
-            return True
-        return False
+    def current_count(self) -> int:
+        """Number of requests currently inside the window"""
+        self._advance(time.time())
+        return self.total
 
     def get_wait_time(self, count: int = 1) -> float:
         """
@@ -183,21 +283,108 @@ class SlidingWindow:
             Seconds to wait (0 if requests available now)
         """
         now = time.time()
+        self._advance(now)
 
-        # Remove expired timestamps
-        cutoff = now - self.window_seconds
-        while self.timestamps and self.timestamps[0] < cutoff:
-            self.timestamps.popleft()
-
-        if len(self.timestamps) + count <= self.limit:
+        if self.total + count <= self.limit:
             return 0.0
-
-        # Calculate when oldest request will expire
-        if self.timestamps:
-            return (self.timestamps[0] + self.window_seconds) - now
+        return self._oldest_expiry(now)
+
+    def _oldest_expiry(self, now: float) -> float:
+        """Seconds until the oldest occupied bucket leaves the window"""
+        for absolute in range(self.head - self.num_buckets + 1, self.head + 1):
+            if self.buckets[absolute % self.num_buckets]:
+                expires = (absolute + self.num_buckets) * self.bucket_seconds
+                return max(0.0, expires - now)
         return 0.0
 
 
+def _remaining_requests(limiter) -> int:
+    """Requests a limiter would still allow right now"""
+    if hasattr(limiter, "tokens"):
+        limiter._refill()
+        return int(limiter.tokens)
+    elif hasattr(limiter, "count"):
+        return max(0, limiter.limit - limiter.count)
+    return max(0, limiter.limit - limiter.current_count())
+
+
+# Fewest limiters a shard may be capped at; with smaller shards a handful of
+# identifiers hashing together would evict each other long before the
+# limiter as a whole reaches max_entries
+_MIN_SHARD_ENTRIES = 64
+
+
+class _LimiterShards:
+    """
+    Limiters per identifier, split across independently locked shards
+
+    Each shard is an OrderedDict kept in least-recently-used order and capped
+    at max_entries / shard_count limiters. shard_count is reduced when needed
+    so every shard holds at least _MIN_SHARD_ENTRIES. Threads checking
+    identifiers in different shards never contend, and a shard's lock also
+    makes the consume on each of its limiters atomic.
+    """
+
+    def __init__(self, factory: Callable, max_entries: int, shard_count: int):
+        self._factory = factory
+        shard_count = max(1, min(shard_count, max_entries // _MIN_SHARD_ENTRIES))
+        self._shards = [(OrderedDict(), threading.Lock()) for _ in range(shard_count)]
+        self._shard_capacity = max(1, -(-max_entries // shard_count))
+
+    def _shard(self, key: str) -> Tuple[OrderedDict, threading.Lock]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def try_consume(self, key: str, count: int, now: float) -> Tuple[bool, float]:
+        """
+        Consume from the identifier's limiter, creating it if needed
+
+        Marks the identifier as most recently used and evicts its shard's
+        least recently used identifier when the shard is full.
+
+        Returns:
+            Tuple of (allowed, seconds to wait; 0.0 when allowed)
+        """
+        limiters, lock = self._shard(key)
+        with lock:
+            limiter = limiters.get(key)
+            if limiter is None:
+                limiter = limiters[key] = self._factory()
+                if len(limiters) > self._shard_capacity:
+                    limiters.popitem(last=False)
+            else:
+                limiters.move_to_end(key)
+            return limiter.try_consume(count, now)
+
+    def remaining(self, key: str) -> Optional[int]:
+        """Remaining requests for a tracked identifier, None if untracked"""
+        limiters, lock = self._shard(key)
+        with lock:
+            limiter = limiters.get(key)
+            return None if limiter is None else _remaining_requests(limiter)
+
+    def discard(self, key: str) -> None:
+        """Forget an identifier's limiter"""
+        limiters, lock = self._shard(key)
+        with lock:
+            limiters.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every limiter"""
+        for limiters, lock in self._shards:
+            with lock:
+                limiters.clear()
+
+    def __len__(self) -> int:
+        return sum(len(limiters) for limiters, _ in self._shards)
+
+    def __iter__(self) -> Iterator[str]:
+        """Tracked identifiers, least recently used first within each shard"""
+        for limiters, lock in self._shards:
+            with lock:
+                keys = list(limiters)
+            yield from keys
+
+
 class RateLimiter:
     """Main rate limiter with support for multiple strategies"""
 
@@ -206,6 +393,8 @@ class RateLimiter:
         config: RateLimitConfig,
         enable_per_ip: bool = True,
         enable_per_user: bool = True,
+        max_entries: int = 100_000,
+        shard_count: int = 64,
     ):
         """
         Initialize the rate limiter
@@ -214,14 +403,26 @@ class RateLimiter:
             config: Rate limit configuration
             enable_per_ip: Enable IP-based rate limiting
             enable_per_user: Enable user-based rate limiting
+            max_entries: Approximate maximum IPs and maximum users tracked,
+                split evenly across shards; the least recently seen
+                identifier in a full shard is evicted, which resets its
+                limit (it starts over with a full quota when seen again)
+            shard_count: Maximum number of independently locked shards per
+                map; fewer are used when max_entries is too small to give
+                each shard 64 identifiers
         """
         self.config = config
         self.enable_per_ip = enable_per_ip
         self.enable_per_user = enable_per_user
+        self.max_entries = max_entries
 
         # Storage for rate limiters per identifier
-        self._ip_limiters: Dict[str, any] = {}
-        self._user_limiters: Dict[str, any] = {}
+        self._ip_limiters = _LimiterShards(
+            self._create_limiter, max_entries, shard_count
+        )
+        self._user_limiters = _LimiterShards(
+            self._create_limiter, max_entries, shard_count
+        )
 
     def _create_limiter(self):
         """Create a new limiter instance based on strategy"""
@@ -262,29 +463,20 @@ class RateLimiter:
             allowed: True if request is allowed
             retry_after_seconds: Seconds to wait if blocked, None if allowed
         """
-        max_wait = 0.0
+        # One clock read keeps the IP and user checks consistent
+        now = time.time()
 
         # Check IP-based rate limit
         if self.enable_per_ip and ip_address:
-            if ip_address not in self._ip_limiters:
-                self._ip_limiters[ip_address] = self._create_limiter()
-
-            limiter = self._ip_limiters[ip_address]
-            if not limiter.consume(count):
-                wait_time = limiter.get_wait_time(count)
+            allowed, wait_time = self._ip_limiters.try_consume(ip_address, count, now)
+            if not allowed:
                 return False, wait_time
-            max_wait = max(max_wait, limiter.get_wait_time(count))
 
         # Check user-based rate limit
         if self.enable_per_user and user_id:
-            if user_id not in self._user_limiters:
-                self._user_limiters[user_id] = self._create_limiter()
-
-            limiter = self._user_limiters[user_id]
-            if not limiter.consume(count):
-                wait_time = limiter.get_wait_time(count)
+            allowed, wait_time = self._user_limiters.try_consume(user_id, count, now)
+            if not allowed:
                 return False, wait_time
-            max_wait = max(max_wait, limiter.get_wait_time(count))
 
         return True, None
 
@@ -328,36 +520,16 @@ class RateLimiter:
         result = {}
 
         if self.enable_per_ip and ip_address:
-            if ip_address in self._ip_limiters:
-                limiter = self._ip_limiters[ip_address]
-                if hasattr(limiter, "tokens"):
-                    limiter._refill()
-                    result["ip"] = int(limiter.tokens)
-                elif hasattr(limiter, "count"):
-                    result["ip"] = max(0, limiter.limit - limiter.count)
-                elif hasattr(limiter, "timestamps"):
-                    now = time.time()
-                    cutoff = now - limiter.window_seconds
-                    valid_count = sum(1 for ts in limiter.timestamps if ts >= cutoff)
-                    result["ip"] = max(0, limiter.limit - valid_count)
-            else:
-                result["ip"] = self.config.requests_per_window
+            remaining = self._ip_limiters.remaining(ip_address)
+            result["ip"] = (
+                self.config.requests_per_window if remaining is None else remaining
+            )
 
         if self.enable_per_user and user_id:
-            if user_id in self._user_limiters:
-                limiter = self._user_limiters[user_id]
-                if hasattr(limiter, "tokens"):
-                    limiter._refill()
-                    result["user"] = int(limiter.tokens)
-                elif hasattr(limiter, "count"):
-                    result["user"] = max(0, limiter.limit - limiter.count)
-                elif hasattr(limiter, "timestamps"):
-                    now = time.time()
-                    cutoff = now - limiter.window_seconds
-                    valid_count = sum(1 for ts in limiter.timestamps if ts >= cutoff)
-                    result["user"] = max(0, limiter.limit - valid_count)
-            else:
-                result["user"] = self.config.requests_per_window
+            remaining = self._user_limiters.remaining(user_id)
+            result["user"] = (
+                self.config.requests_per_window if remaining is None else remaining
+            )
 
         return result
 
@@ -371,11 +543,11 @@ class RateLimiter:
             ip_address: IP address to reset (None to keep)
             user_id: User ID to reset (None to keep)
         """
-        if ip_address and ip_address in self._ip_limiters:
-            del self._ip_limiters[ip_address]
+        if ip_address:
+            self._ip_limiters.discard(ip_address)
 
-        if user_id and user_id in self._user_limiters:
-            del self._user_limiters[user_id]
+        if user_id:
+            self._user_limiters.discard(user_id)
 
     def clear_all(self) -> None:
         """Clear all rate limit data"""
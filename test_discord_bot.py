@@ -6,7 +6,10 @@ Issue #9: Discord bot: OAuth2 + send embed/attachment
 
 import unittest
 from unittest.mock import patch, MagicMock, Mock
+import json
 import os
+import requests
+import discord_bot
 from discord_bot import DiscordOAuth2, DiscordMessenger
 
 
@@ -35,17 +38,19 @@ class TestDiscordOAuth2(unittest.TestCase):
 
         self.assertIn("scope=identify+email", url)
 
-    @patch("discord_bot.requests.post")
+    @patch("discord_bot.requests.Session.post")
     def test_exchange_code_for_token(self, mock_post):
         """Test exchanging authorization code for token"""
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "access_token": "test_access_token",
-            "token_type": "Bearer",
-            "expires_in": 604800,
-            "refresh_token": "test_refresh_token",
-            "scope": "identify guilds",
-        }
+        mock_response.content = json.dumps(
+            {
+                "access_token": "test_access_token",
+                "token_type": "Bearer",
+                "expires_in": 604800,
+                "refresh_token": "test_refresh_token",
+                "scope": "identify guilds",
+            }
+        ).encode()
         mock_post.return_value = mock_response
 
         result = self.oauth.exchange_code_for_token("test_code")
@@ -59,17 +64,19 @@ class TestDiscordOAuth2(unittest.TestCase):
         self.assertEqual(call_kwargs["data"]["code"], "test_code")
         self.assertEqual(call_kwargs["data"]["grant_type"], "authorization_code")
 
-    @patch("discord_bot.requests.post")
+    @patch("discord_bot.requests.Session.post")
     def test_refresh_access_token(self, mock_post):
         """Test refreshing access token"""
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "access_token": "new_access_token",
-            "token_type": "Bearer",
-            "expires_in": 604800,
-            "refresh_token": "new_refresh_token",
-            "scope": "identify guilds",
-        }
+        mock_response.content = json.dumps(
+            {
+                "access_token": "new_access_token",
+                "token_type": "Bearer",
+                "expires_in": 604800,
+                "refresh_token": "new_refresh_token",
+                "scope": "identify guilds",
+            }
+        ).encode()
         mock_post.return_value = mock_response
 
         result = self.oauth.refresh_access_token("old_refresh_token")
@@ -81,16 +88,18 @@ class TestDiscordOAuth2(unittest.TestCase):
         self.assertEqual(call_kwargs["data"]["grant_type"], "refresh_token")
         self.assertEqual(call_kwargs["data"]["refresh_token"], "old_refresh_token")
 
-    @patch("discord_bot.requests.get")
+    @patch("discord_bot.requests.Session.get")
     def test_get_user_info(self, mock_get):
         """Test getting user information"""
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "id": "123456789",
-            "username": "testuser",
-            "discriminator": "1234",
-            "avatar": "avatar_hash",
-        }
+        mock_response.content = json.dumps(
+            {
+                "id": "123456789",
+                "username": "testuser",
+                "discriminator": "1234",
+                "avatar": "avatar_hash",
+            }
+        ).encode()
         mock_get.return_value = mock_response
 
         result = self.oauth.get_user_info("test_access_token")
@@ -104,14 +113,16 @@ class TestDiscordOAuth2(unittest.TestCase):
             call_kwargs["headers"]["Authorization"], "Bearer test_access_token"
         )
 
-    @patch("discord_bot.requests.get")
+    @patch("discord_bot.requests.Session.get")
     def test_get_user_guilds(self, mock_get):
         """Test getting user's guilds"""
         mock_response = Mock()
-        mock_response.json.return_value = [
-            {"id": "111", "name": "Guild 1"},
-            {"id": "222", "name": "Guild 2"},
-        ]
+        mock_response.content = json.dumps(
+            [
+                {"id": "111", "name": "Guild 1"},
+                {"id": "222", "name": "Guild 2"},
+            ]
+        ).encode()
         mock_get.return_value = mock_response
 
         result = self.oauth.get_user_guilds("test_access_token")
@@ -158,11 +169,11 @@ class TestDiscordMessenger(unittest.TestCase):
         self.assertEqual(embed["footer"]["text"], "Footer Text")
         self.assertEqual(embed["author"]["name"], "Author Name")
 
-    @patch("discord_bot.requests.post")
+    @patch("discord_bot.requests.Session.post")
     def test_send_embed_with_bot_token(self, mock_post):
         """Test sending embed with bot token"""
         mock_response = Mock()
-        mock_response.json.return_value = {"id": "message_id"}
+        mock_response.content = json.dumps({"id": "message_id"}).encode()
         mock_post.return_value = mock_response
 
         embed = {"title": "Test", "description": "Test embed"}
@@ -174,11 +185,25 @@ class TestDiscordMessenger(unittest.TestCase):
         call_kwargs = mock_post.call_args[1]
         self.assertEqual(call_kwargs["headers"]["Authorization"], "Bot test_bot_token")
 
-    @patch("discord_bot.requests.post")
+    @patch("discord_bot.requests.Session.post")
+    def test_send_embed_reuses_bot_headers(self, mock_post):
+        """Test bot-token headers are built once and reused across calls"""
+        mock_response = Mock()
+        mock_response.content = json.dumps({"id": "message_id"}).encode()
+        mock_post.return_value = mock_response
+
+        self.messenger.send_embed("channel_1", {"title": "One"})
+        self.messenger.send_embed("channel_2", {"title": "Two"})
+
+        first, second = mock_post.call_args_list
+        self.assertIs(first[1]["headers"], second[1]["headers"])
+        self.assertEqual(first[1]["headers"]["Content-Type"], "application/json")
+
+    @patch("discord_bot.requests.Session.post")
     def test_send_embed_with_oauth_token(self, mock_post):
         """Test sending embed with OAuth access token"""
         mock_response = Mock()
-        mock_response.json.return_value = {"id": "message_id"}
+        mock_response.content = json.dumps({"id": "message_id"}).encode()
         mock_post.return_value = mock_response
 
         embed = {"title": "Test", "description": "Test embed"}
@@ -190,11 +215,11 @@ class TestDiscordMessenger(unittest.TestCase):
         call_kwargs = mock_post.call_args[1]
         self.assertEqual(call_kwargs["headers"]["Authorization"], "Bearer oauth_token")
 
-    @patch("discord_bot.requests.post")
+    @patch("discord_bot.requests.Session.post")
     def test_send_embed_with_content(self, mock_post):
         """Test sending embed with text content"""
         mock_response = Mock()
-        mock_response.json.return_value = {"id": "message_id"}
+        mock_response.content = json.dumps({"id": "message_id"}).encode()
         mock_post.return_value = mock_response
 
         embed = {"title": "Test"}
@@ -202,11 +227,12 @@ class TestDiscordMessenger(unittest.TestCase):
 
         # Verify content was included
         call_kwargs = mock_post.call_args[1]
-        self.assertIn("content", call_kwargs["json"])
-        self.assertEqual(call_kwargs["json"]["content"], "Check this out!")
+        body = json.loads(call_kwargs["data"])
+        self.assertIn("content", body)
+        self.assertEqual(body["content"], "Check this out!")
 
-    @patch("discord_bot.requests.get")
-    @patch("discord_bot.requests.post")
+    @patch("discord_bot.requests.Session.get")
+    @patch("discord_bot.requests.Session.post")
     def test_send_attachment(self, mock_post, mock_get):
         """Test sending file attachment"""
         # Mock file download
@@ -216,7 +242,7 @@ class TestDiscordMessenger(unittest.TestCase):
 
         # Mock Discord API response
         mock_post_response = Mock()
-        mock_post_response.json.return_value = {"id": "message_id"}
+        mock_post_response.content = json.dumps({"id": "message_id"}).encode()
         mock_post.return_value = mock_post_response
 
         result = self.messenger.send_attachment(
@@ -232,11 +258,11 @@ class TestDiscordMessenger(unittest.TestCase):
         call_kwargs = mock_post.call_args[1]
         self.assertIn("file", call_kwargs["files"])
 
-    @patch("discord_bot.requests.post")
+    @patch("discord_bot.requests.Session.post")
     def test_send_gif_embed(self, mock_post):
         """Test sending GIF embed"""
         mock_response = Mock()
-        mock_response.json.return_value = {"id": "message_id"}
+        mock_response.content = json.dumps({"id": "message_id"}).encode()
         mock_post.return_value = mock_response
 
         result = self.messenger.send_gif_embed(
@@ -251,7 +277,7 @@ class TestDiscordMessenger(unittest.TestCase):
 
         # Verify embed structure
         call_kwargs = mock_post.call_args[1]
-        embed = call_kwargs["json"]["embeds"][0]
+        embed = json.loads(call_kwargs["data"])["embeds"][0]
         self.assertEqual(embed["title"], "Cool GIF")
         self.assertEqual(embed["description"], "This is a cool GIF")
         self.assertEqual(embed["image"]["url"], "https://example.com/cool.gif")
@@ -259,11 +285,160 @@ class TestDiscordMessenger(unittest.TestCase):
         self.assertEqual(embed["footer"]["text"], "Powered by GIF Distributor")
 
 
+class TestSessionLifecycle(unittest.TestCase):
+    """Test pooled sessions are released deterministically"""
+
+    @patch("discord_bot.requests.Session.close")
+    def test_messenger_context_manager_closes_session(self, mock_close):
+        """Test leaving the with-block closes the messenger session"""
+        with DiscordMessenger(bot_token="token") as messenger:
+            self.assertIsInstance(messenger, DiscordMessenger)
+            mock_close.assert_not_called()
+
+        mock_close.assert_called_once()
+
+    def test_oauth_context_manager_closes_session(self):
+        """Test leaving the with-block closes the OAuth session"""
+        oauth = DiscordOAuth2()
+        with patch.object(oauth._session, "close") as mock_close:
+            with oauth as entered:
+                self.assertIs(entered, oauth)
+            mock_close.assert_called_once()
+
+    @patch("discord_bot.requests.Session.post")
+    def test_session_reused_across_calls(self, mock_post):
+        """Test requests go through the instance session"""
+        mock_response = Mock()
+        mock_response.content = b'{"id": "message_id"}'
+        mock_post.return_value = mock_response
+
+        with DiscordMessenger(bot_token="token") as messenger:
+            messenger.send_embed("channel_1", {"title": "One"})
+            messenger.send_embed("channel_2", {"title": "Two"})
+
+        self.assertEqual(mock_post.call_count, 2)
+
+
+class TestSendEmbedMany(unittest.TestCase):
+    """Test concurrent batch sends"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        os.environ["DISCORD_BOT_TOKEN"] = "test_bot_token"
+        self.messenger = DiscordMessenger(max_concurrency=2)
+
+    def _response(self, status_code, body, headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.content = json.dumps(body).encode()
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.HTTPError(
+                response=response
+            )
+        return response
+
+    @patch("discord_bot.requests.Session.post")
+    def test_results_preserve_channel_order(self, mock_post):
+        """Test one result per channel, in input order"""
+
+        def respond(url, **kwargs):
+            channel_id = url.split("/")[-2]
+            return self._response(200, {"channel_id": channel_id})
+
+        mock_post.side_effect = respond
+
+        results = self.messenger.send_embed_many(["a", "b", "c"], {"title": "T"})
+
+        self.assertEqual([r["channel_id"] for r in results], ["a", "b", "c"])
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch("discord_bot.requests.Session.post")
+    def test_retries_after_rate_limit(self, mock_post):
+        """Test a 429 is retried after the Retry-After window"""
+        mock_post.side_effect = [
+            self._response(429, {"retry_after": 0}, {"Retry-After": "0"}),
+            self._response(200, {"id": "message_id"}),
+        ]
+
+        results = self.messenger.send_embed_many(["a"], {"title": "T"})
+
+        self.assertEqual(results, [{"id": "message_id"}])
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch("discord_bot.time.sleep")
+    @patch("discord_bot.requests.Session.post")
+    def test_unparseable_retry_after_falls_back(self, mock_post, mock_sleep):
+        """Test a non-numeric Retry-After header does not abort the batch"""
+        http_date = {"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}
+        mock_post.side_effect = [
+            self._response(429, {"retry_after": 0}, http_date),
+            self._response(429, {"message": "slow down"}, http_date),
+            self._response(200, {"id": "message_id"}),
+        ]
+
+        results = self.messenger.send_embed_many(["a"], {"title": "T"})
+
+        self.assertEqual(results, [{"id": "message_id"}])
+        self.assertEqual(mock_post.call_count, 3)
+
+    def test_retry_after_sources(self):
+        """Test Retry-After comes from the header, then the body, then a default"""
+        header = self._response(429, {"retry_after": 5}, {"Retry-After": "2.5"})
+        body = self._response(429, {"retry_after": 5}, {"Retry-After": "soon"})
+        neither = self._response(429, {}, {})
+
+        self.assertEqual(discord_bot._retry_after(header), 2.5)
+        self.assertEqual(discord_bot._retry_after(body), 5.0)
+        self.assertEqual(discord_bot._retry_after(neither), 1.0)
+
+    @patch("discord_bot.requests.Session.post")
+    def test_errors_are_returned_not_raised(self, mock_post):
+        """Test a failing channel does not abort the batch"""
+
+        def respond(url, **kwargs):
+            if "/bad/" in url:
+                return self._response(403, {"message": "Missing Access"})
+            return self._response(200, {"id": "ok"})
+
+        mock_post.side_effect = respond
+
+        results = self.messenger.send_embed_many(["good", "bad"], {"title": "T"})
+
+        self.assertEqual(results[0], {"id": "ok"})
+        self.assertIsInstance(results[1], requests.HTTPError)
+
+    def test_empty_channel_list(self):
+        """Test sending to no channels is a no-op"""
+        self.assertEqual(self.messenger.send_embed_many([], {"title": "T"}), [])
+
+
+class TestJsonCodec(unittest.TestCase):
+    """Test JSON encoding helpers with and without orjson"""
+
+    def test_dumps_round_trip(self):
+        """Test request bodies are compact JSON bytes"""
+        body = discord_bot._dumps({"embeds": [{"title": "Test"}]})
+
+        self.assertIsInstance(body, bytes)
+        self.assertEqual(json.loads(body), {"embeds": [{"title": "Test"}]})
+
+    @patch("discord_bot.orjson", None)
+    def test_stdlib_fallback(self):
+        """Test the stdlib json fallback when orjson is unavailable"""
+        body = discord_bot._dumps({"content": "hi"})
+        self.assertEqual(body, b'{"content":"hi"}')
+
+        response = Mock()
+        response.content = body
+        self.assertEqual(discord_bot._loads(response), {"content": "hi"})
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for Discord bot"""
 
-    @patch("discord_bot.requests.post")
-    @patch("discord_bot.requests.get")
+    @patch("discord_bot.requests.Session.post")
+    @patch("discord_bot.requests.Session.get")
     def test_full_oauth_flow(self, mock_get, mock_post):
         """Test complete OAuth2 flow"""
         os.environ["DISCORD_CLIENT_ID"] = "client_id"
@@ -276,10 +451,12 @@ class TestIntegration(unittest.TestCase):
 
         # Step 2: Mock token exchange
         mock_token_response = Mock()
-        mock_token_response.json.return_value = {
-            "access_token": "user_access_token",
-            "refresh_token": "user_refresh_token",
-        }
+        mock_token_response.content = json.dumps(
+            {
+                "access_token": "user_access_token",
+                "refresh_token": "user_refresh_token",
+            }
+        ).encode()
         mock_post.return_value = mock_token_response
 
         tokens = oauth.exchange_code_for_token("auth_code")
@@ -287,7 +464,9 @@ class TestIntegration(unittest.TestCase):
 
         # Step 3: Mock user info
         mock_user_response = Mock()
-        mock_user_response.json.return_value = {"id": "999", "username": "testuser"}
+        mock_user_response.content = json.dumps(
+            {"id": "999", "username": "testuser"}
+        ).encode()
         mock_get.return_value = mock_user_response
 
         user = oauth.get_user_info(tokens["access_token"])
@@ -296,7 +475,7 @@ class TestIntegration(unittest.TestCase):
         # Step 4: Send a message with the user's token
         messenger = DiscordMessenger()
         mock_message_response = Mock()
-        mock_message_response.json.return_value = {"id": "msg_id"}
+        mock_message_response.content = json.dumps({"id": "msg_id"}).encode()
         mock_post.return_value = mock_message_response
 
         result = messenger.send_gif_embed(
@@ -327,6 +327,36 @@ class TestVideoSampling:
         with pytest.raises(FileNotFoundError):
             FrameSampler.sample_video("nonexistent.mp4", 5)
 
+    def test_sample_video_decodes_raw_frames_in_memory(self, tmp_path, monkeypatch):
+        """Should build frames from ffmpeg's rawvideo stdout without temp files"""
+        video_path = tmp_path / "fake.mp4"
+        video_path.write_bytes(b"\x00\x00\x00\x18ftypmp42")
+        raw_frame = bytes([255, 0, 0]) * (4 * 2)
+        commands = []
+
+        class Completed:
+            def __init__(self, stdout):
+                self.stdout = stdout
+
+        def fake_run(cmd, **kwargs):
+            commands.append(cmd)
+            return Completed(raw_frame)
+
+        monkeypatch.setattr(
+            FrameSampler, "get_video_info", staticmethod(lambda path: (10, 1000.0))
+        )
+        monkeypatch.setattr(
+            FrameSampler, "get_video_dimensions", staticmethod(lambda path: (4, 2))
+        )
+        monkeypatch.setattr("frame_sampler.subprocess.run", fake_run)
+
+        result = FrameSampler.sample_video(str(video_path), 2, OutputFormat.PIL_IMAGE)
+
+        assert len(result.frames) == 2
+        assert result.frames[0].size == (4, 2)
+        assert result.frames[0].getpixel((0, 0)) == (255, 0, 0)
+        assert all(cmd[-1] == "-" and "rawvideo" in cmd for cmd in commands)
+
 
 class TestUnifiedSampling:
     """Test unified sample_media function"""
@@ -4,7 +4,10 @@ Tests channel management, upload validation, and programmatic upload
 Issue: #12
 """
 
+import asyncio
+import dataclasses
 import pytest
+from unittest.mock import patch
 from giphy_publisher import (
     GiphyPublisher,
     GiphyUploadMetadata,
@@ -57,6 +60,10 @@ class TestGiphyPublisher:
         assert publisher.sfw_only is True
         assert publisher.base_url == "https://upload.giphy.com/v1"
 
+    def test_publisher_uses_slots(self, publisher):
+        """Test publisher instances carry no per-instance __dict__"""
+        assert not hasattr(publisher, "__dict__")
+
     def test_publisher_custom_base_url(self):
         """Test publisher with custom base URL"""
         publisher = GiphyPublisher(
@@ -182,6 +189,24 @@ class TestGiphyPublisher:
         assert is_valid is False
         assert "Channel" in error and "not found" in error
 
+    def test_validate_and_sanitize_returns_sanitized_tags(self, publisher):
+        """Test validation yields sanitized tags as a byproduct"""
+        metadata = GiphyUploadMetadata(
+            media_url="https://example.com/test.gif",
+            title="Test",
+            tags=["Funny Cat", "funny-cat", "REACTION"],
+        )
+
+        is_valid, error, tags = publisher._validate_and_sanitize(metadata)
+
+        assert is_valid is True
+        assert error is None
+        assert tags == ("funny-cat", "reaction")
+
+    def test_dataclasses_use_slots(self, valid_metadata):
+        """Test metadata records carry no per-instance __dict__"""
+        assert not hasattr(valid_metadata, "__dict__")
+
     def test_sanitize_tags_removes_duplicates(self, publisher):
         """Test tag sanitization removes duplicates"""
         tags = ["funny", "FUNNY", "Funny", "test"]
@@ -208,6 +233,20 @@ class TestGiphyPublisher:
         assert "funny-gif" in sanitized
         assert "test-tag" in sanitized
 
+    def test_sanitize_tags_dedupes_on_hyphenated_form(self, publisher):
+        """Test space and hyphen variants of a tag collapse to one"""
+        sanitized = publisher.sanitize_tags(["cute-cat", "Cute Cat", " cute cat "])
+
+        assert sanitized == ["cute-cat"]
+
+    def test_sanitize_tags_cached_result_not_shared(self, publisher):
+        """Test memoized results are returned as fresh lists"""
+        first = publisher.sanitize_tags(["funny", "cat"])
+        first.append("mutated")
+        second = publisher.sanitize_tags(["funny", "cat"])
+
+        assert second == ["funny", "cat"]
+
     def test_sanitize_tags_lowercase(self, publisher):
         """Test tag sanitization converts to lowercase"""
         tags = ["FUNNY", "Test", "ReAction"]
@@ -268,6 +307,16 @@ class TestGiphyPublisher:
         assert test_channel in channels
         assert channel2 in channels
 
+    def test_list_channels_reflects_registrations(self, publisher, test_channel):
+        """Test the listing is current and independent of the channel store"""
+        assert publisher.list_channels() == []
+
+        publisher.create_channel(test_channel)
+        listed = publisher.list_channels()
+        listed.clear()
+
+        assert publisher.list_channels() == [test_channel]
+
     def test_build_upload_payload(self, publisher, valid_metadata):
         """Test building upload payload"""
         payload = publisher.build_upload_payload(valid_metadata)
@@ -279,6 +328,37 @@ class TestGiphyPublisher:
         assert payload["username"] == publisher.username
         assert "tags" in payload
 
+    def test_build_upload_payload_omits_unset_optional_fields(self, publisher):
+        """Test optional keys are absent when their fields are unset"""
+        metadata = GiphyUploadMetadata(
+            media_url="https://example.com/test.gif", title="Test", tags=["a"]
+        )
+
+        payload = publisher.build_upload_payload(metadata)
+
+        assert set(payload) == {
+            "source_image_url",
+            "title",
+            "tags",
+            "rating",
+            "api_key",
+            "username",
+        }
+
+    def test_build_upload_payload_with_sanitized_tags(self, publisher, valid_metadata):
+        """Test pre-sanitized tags are used as-is"""
+        payload = publisher.build_upload_payload(valid_metadata, ("already", "clean"))
+
+        assert payload["tags"] == "already,clean"
+
+    def test_upload_sanitizes_tags_once(self, publisher, valid_metadata):
+        """Test upload reuses the tags sanitized during validation"""
+        with patch("giphy_publisher._joined_tag_string") as mock_join:
+            result = publisher.upload(valid_metadata)
+
+        assert result.success is True
+        mock_join.assert_not_called()
+
     def test_build_upload_payload_with_channel(
         self, publisher, valid_metadata, test_channel
     ):
@@ -328,6 +408,19 @@ class TestGiphyPublisher:
 
         assert result1.giphy_id != result2.giphy_id
 
+    def test_mock_ids_namespaced_by_api_key(self):
+        """Test mock IDs are 16 hex chars and keyed per API key"""
+        first = GiphyPublisher(api_key="key_a", username="user")
+        second = GiphyPublisher(api_key="key_b", username="user")
+
+        with patch("giphy_publisher.time.time_ns", return_value=123):
+            id_a = first._generate_mock_id("https://example.com/a.gif")
+            id_b = second._generate_mock_id("https://example.com/a.gif")
+
+        assert len(id_a) == 16
+        int(id_a, 16)
+        assert id_a != id_b
+
     def test_check_upload_status(self, publisher):
         """Test checking upload status"""
         status = publisher.check_upload_status("test_id_123")
@@ -344,6 +437,12 @@ class TestGiphyPublisher:
         assert "giphy.com/search" in url
         assert "funny" in url or "cat" in url
 
+    def test_generate_giphy_search_url_hyphenates_and_quotes(self, publisher):
+        """Test search URL joins with hyphens and escapes unsafe characters"""
+        url = publisher.generate_giphy_search_url(["funny cat", "a/b"])
+
+        assert url == "https://giphy.com/search/funny-cat-a%2Fb"
+
     def test_format_tags_for_giphy(self, publisher):
         """Test formatting tags for GIPHY"""
         tags = ["Funny", "Test Tag", "REACTION"]
@@ -387,6 +486,56 @@ class TestGiphyPublisher:
         assert all(result.success for result in results)
         assert len(set(r.giphy_id for r in results)) == 3  # All unique
 
+    def test_batch_upload_deduplicates_identical_items(self, publisher):
+        """Test duplicate metadata is uploaded once and fanned back out"""
+        uploads = [
+            GiphyUploadMetadata(
+                media_url="https://example.com/same.gif", title="Same", tags=["a"]
+            ),
+            GiphyUploadMetadata(
+                media_url="https://example.com/other.gif", title="Other", tags=["a"]
+            ),
+            GiphyUploadMetadata(
+                media_url="https://example.com/same.gif", title="Same", tags=["a"]
+            ),
+        ]
+
+        results = publisher.batch_upload(uploads)
+
+        assert len(results) == 3
+        assert results[0].giphy_id == results[2].giphy_id
+        assert results[0].giphy_id != results[1].giphy_id
+
+    def test_batch_upload_async(self, publisher):
+        """Test concurrent batch upload preserves order and dedupes"""
+        uploads = [
+            GiphyUploadMetadata(
+                media_url=f"https://example.com/test{i % 3}.gif",
+                title=f"Test {i % 3}",
+                tags=["test"],
+            )
+            for i in range(6)
+        ]
+        uploads.append(
+            GiphyUploadMetadata(media_url="invalid_url", title="Bad", tags=["test"])
+        )
+
+        results = asyncio.run(publisher.batch_upload_async(uploads, concurrency=2))
+
+        assert len(results) == 7
+        assert all(result.success for result in results[:6])
+        assert results[6].success is False
+        assert [r.giphy_id for r in results[:3]] == [r.giphy_id for r in results[3:6]]
+        assert len({r.giphy_id for r in results[:3]}) == 3
+
+    def test_shared_batch_results_are_immutable(self, publisher, valid_metadata):
+        """Test results fanned out to duplicate items cannot be mutated"""
+        results = publisher.batch_upload([valid_metadata, valid_metadata])
+
+        assert results[0] is results[1]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            results[0].success = False
+
     def test_batch_upload_partial_failure(self, publisher):
         """Test batch upload with some invalid items"""
         uploads = [
@@ -420,6 +569,25 @@ class TestGiphyPublisher:
         assert "channel_count" in stats
         assert "upload_limit_remaining" in stats
 
+    def test_get_user_stats_cache_invalidated_by_new_channel(
+        self, publisher, test_channel
+    ):
+        """Test cached user stats refresh when a channel is registered"""
+        assert publisher.get_user_stats()["channel_count"] == 0
+
+        publisher.create_channel(test_channel)
+
+        assert publisher.get_user_stats()["channel_count"] == 1
+
+    def test_get_user_stats_returns_copies(self, publisher):
+        """Test mutating returned stats does not affect the cache"""
+        stats = publisher.get_user_stats()
+        stats["top_tags"].append("mutated")
+        stats["total_uploads"] = 99
+
+        assert publisher.get_user_stats()["top_tags"] == []
+        assert publisher.get_user_stats()["total_uploads"] == 0
+
     def test_get_channel_stats_success(self, publisher, test_channel):
         """Test retrieving channel statistics"""
         publisher.create_channel(test_channel)
@@ -476,6 +644,21 @@ class TestGiphyPublisher:
 
         assert len(tags) == 10
 
+    def test_get_trending_tags_cache_expires(self, publisher):
+        """Test trending tags are served from cache until the TTL passes"""
+        with patch("giphy_publisher.time.monotonic_ns", return_value=0):
+            publisher._trending_cache.set(3, ["stale"])
+            tags = publisher.get_trending_tags(limit=3)
+            tags.append("mutated")
+            assert publisher.get_trending_tags(limit=3) == ["stale"]
+
+        with patch("giphy_publisher.time.monotonic_ns", return_value=61 * 10**9):
+            assert publisher.get_trending_tags(limit=3) == [
+                "reaction",
+                "funny",
+                "love",
+            ]
+
     def test_search_similar_gifs(self, publisher):
         """Test searching for similar GIFs"""
         similar = publisher.search_similar_gifs("test_id_123", limit=3)
@@ -2,6 +2,8 @@
 Tests for Media Jobs Runtime Module
 """
 
+import asyncio
+import io
 import os
 import tempfile
 import time
@@ -13,8 +15,13 @@ from media_jobs import (
     JobStatus,
     JobPriority,
     MediaJob,
+    QueueFullError,
+    _PriorityJobQueue,
+    _STDERR_TAIL_LINES,
     create_transcode_job,
     create_thumbnail_job,
+    create_thumbnail_batch_job,
+    run_media_jobs_async,
 )
 
 
@@ -37,15 +44,24 @@ class TestFFmpegRuntime:
             with pytest.raises(RuntimeError, match="ffmpeg/ffprobe not found"):
                 FFmpegRuntime(ffmpeg_path="/invalid/path/ffmpeg")
 
+    @staticmethod
+    def _popen(returncode=0, stdout="", stderr="", wait_side_effect=None):
+        """Build a Popen stand-in whose pipes yield the given text"""
+        proc = MagicMock()
+        proc.stdout = io.StringIO(stdout)
+        proc.stderr = io.StringIO(stderr)
+        proc.wait.return_value = returncode
+        if wait_side_effect is not None:
+            proc.wait.side_effect = wait_side_effect
+        return proc
+
     def test_execute_ffmpeg_success(self):
         """Test successful ffmpeg execution"""
-        with patch("subprocess.run") as mock_run:
-            # Mock validation calls
-            mock_run.side_effect = [
-                MagicMock(returncode=0),  # ffmpeg validation
-                MagicMock(returncode=0),  # ffprobe validation
-                MagicMock(returncode=0, stdout="output", stderr=""),  # actual execution
-            ]
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            mock_popen.return_value = self._popen(0, stdout="output")
 
             runtime = FFmpegRuntime()
             returncode, stdout, stderr = runtime.execute_ffmpeg(
@@ -54,18 +70,37 @@ class TestFFmpegRuntime:
 
             assert returncode == 0
             assert stdout == "output"
+            assert mock_popen.call_args[0][0] == [
+                runtime._ffmpeg_exe,
+                "-i",
+                "input.mp4",
+                "output.mp4",
+            ]
+
+    def test_execute_ffmpeg_spawn_friendly_launch(self):
+        """Test ffmpeg is launched with an absolute path and close_fds=False"""
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen, patch("media_jobs.shutil.which") as mock_which:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            mock_popen.return_value = self._popen(0)
+            mock_which.side_effect = lambda name: f"/usr/bin/{name}"
+
+            runtime = FFmpegRuntime()
+            runtime.execute_ffmpeg(["-version"])
+
+            args, kwargs = mock_popen.call_args
+            assert args[0][0] == "/usr/bin/ffmpeg"
+            assert kwargs["close_fds"] is False
+            assert runtime.ffmpeg_path == "ffmpeg"
 
     def test_execute_ffmpeg_failure(self):
         """Test ffmpeg execution failure"""
-        with patch("subprocess.run") as mock_run:
-            # Mock validation calls
-            mock_run.side_effect = [
-                MagicMock(returncode=0),  # ffmpeg validation
-                MagicMock(returncode=0),  # ffprobe validation
-                MagicMock(
-                    returncode=1, stdout="", stderr="error message"
-                ),  # actual execution
-            ]
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            mock_popen.return_value = self._popen(1, stderr="error message")
 
             runtime = FFmpegRuntime()
             returncode, stdout, stderr = runtime.execute_ffmpeg(
@@ -75,23 +110,193 @@ class TestFFmpegRuntime:
             assert returncode == 1
             assert stderr == "error message"
 
+    def test_execute_ffmpeg_keeps_only_stderr_tail(self):
+        """Test long stderr output is truncated to the trailing lines"""
+        lines = [f"frame={i}\n" for i in range(5000)]
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            mock_popen.return_value = self._popen(1, stderr="".join(lines))
+
+            runtime = FFmpegRuntime()
+            _, _, stderr = runtime.execute_ffmpeg(["-i", "input.mp4", "out.mp4"])
+
+            assert stderr == "".join(lines[-_STDERR_TAIL_LINES:])
+
     def test_execute_ffmpeg_timeout(self):
         """Test ffmpeg execution timeout"""
-        with patch("subprocess.run") as mock_run:
-            import subprocess
-
-            # Mock validation calls
-            mock_run.side_effect = [
-                MagicMock(returncode=0),  # ffmpeg validation
-                MagicMock(returncode=0),  # ffprobe validation
-                subprocess.TimeoutExpired("ffmpeg", 5),  # timeout
-            ]
+        import subprocess
+
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            proc = self._popen(
+                wait_side_effect=[subprocess.TimeoutExpired("ffmpeg", 5), -9]
+            )
+            mock_popen.return_value = proc
 
             runtime = FFmpegRuntime()
             with pytest.raises(TimeoutError, match="timed out"):
                 runtime.execute_ffmpeg(
                     ["-i", "input.mp4", "output.mp4"], timeout_seconds=5
                 )
+            proc.kill.assert_called_once()
+
+    def test_execute_ffmpeg_thread_limits(self):
+        """Test threads_per_job injects decoder, encoder and filter limits"""
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            mock_popen.side_effect = lambda *a, **k: self._popen(0)
+
+            runtime = FFmpegRuntime(threads_per_job=2)
+            runtime.execute_ffmpeg(["-i", "in.mp4", "out.mp4"])
+            assert mock_popen.call_args[0][0][1:] == [
+                "-filter_threads",
+                "2",
+                "-threads",
+                "2",
+                "-i",
+                "in.mp4",
+                "-threads",
+                "2",
+                "out.mp4",
+            ]
+
+            runtime.execute_ffmpeg(["-threads", "8", "-i", "in.mp4", "out.mp4"])
+            assert mock_popen.call_args[0][0][1:] == [
+                "-filter_threads",
+                "2",
+                "-threads",
+                "8",
+                "-i",
+                "in.mp4",
+                "out.mp4",
+            ]
+
+    def test_extract_frames_shm(self):
+        """Test rawvideo frames are read straight into shared memory"""
+        frames = bytes(range(2 * 2 * 3)) + bytes(12)  # two 2x2 rgb24 frames
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            proc = MagicMock()
+            proc.stdout = io.BytesIO(frames)
+            proc.stderr = io.BytesIO(b"")
+            proc.wait.return_value = 0
+            mock_popen.return_value = proc
+
+            runtime = FFmpegRuntime()
+            shm, count = runtime.extract_frames_shm("in.mp4", [2.0, 1.0], 2, 2)
+            try:
+                assert count == 2
+                assert bytes(shm.buf[: len(frames)]) == frames
+            finally:
+                shm.close()
+                shm.unlink()
+
+            cmd = mock_popen.call_args[0][0]
+            assert cmd[-7:] == [
+                "-vsync",
+                "0",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgb24",
+                "-",
+            ]
+            assert "gte(pts*TB,1.0)" in cmd[cmd.index("-vf") + 1]
+
+    def test_extract_frames_shm_no_timestamps(self):
+        """Test no timestamps returns an empty result without running ffmpeg"""
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+
+            runtime = FFmpegRuntime()
+            assert runtime.extract_frames_shm("in.mp4", [], 2, 2) == (None, 0)
+            mock_popen.assert_not_called()
+
+    def test_extract_frames_shm_failure(self):
+        """Test a failed extraction frees the block and reports stderr"""
+        from multiprocessing import shared_memory
+
+        real_shm = shared_memory.SharedMemory
+        created = []
+
+        def make_shm(*args, **kwargs):
+            created.append(real_shm(*args, **kwargs))
+            return created[-1]
+
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen, patch(
+            "media_jobs.shared_memory.SharedMemory", side_effect=make_shm
+        ):
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+            proc = MagicMock()
+            proc.stdout = io.BytesIO(b"")
+            proc.stderr = io.BytesIO(b"No such file\n")
+            proc.wait.return_value = 1
+            mock_popen.return_value = proc
+
+            runtime = FFmpegRuntime()
+            with pytest.raises(RuntimeError, match="No such file"):
+                runtime.extract_frames_shm("missing.mp4", [1.0], 2, 2)
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=created[0].name)
+
+    def test_extract_frames_shm_popen_failure(self):
+        """Test the block is freed when ffmpeg cannot be started"""
+        from multiprocessing import shared_memory
+
+        real_shm = shared_memory.SharedMemory
+        created = []
+
+        def make_shm(*args, **kwargs):
+            created.append(real_shm(*args, **kwargs))
+            return created[-1]
+
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen", side_effect=OSError("Too many open files")
+        ), patch("media_jobs.shared_memory.SharedMemory", side_effect=make_shm):
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+
+            runtime = FFmpegRuntime()
+            with pytest.raises(OSError, match="Too many open files"):
+                runtime.extract_frames_shm("in.mp4", [1.0], 2, 2)
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=created[0].name)
+
+    def test_extract_frames_shm_interrupted_reaps_ffmpeg(self):
+        """Test an interrupted read kills and reaps ffmpeg and frees the block"""
+        with patch("subprocess.run") as mock_run, patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            mock_run.return_value = MagicMock(returncode=0)  # validation
+
+            class InterruptedPipe(io.BytesIO):
+                def readinto(self, buffer):
+                    raise KeyboardInterrupt
+
+            proc = MagicMock()
+            proc.stdout = InterruptedPipe()
+            proc.stderr = io.BytesIO(b"")
+            mock_popen.return_value = proc
+
+            runtime = FFmpegRuntime()
+            with pytest.raises(KeyboardInterrupt):
+                runtime.extract_frames_shm("in.mp4", [1.0], 2, 2)
+
+            proc.kill.assert_called_once()
+            proc.wait.assert_called_once()
 
     def test_probe_media_success(self):
         """Test successful media probing"""
@@ -128,6 +333,161 @@ class TestFFmpegRuntime:
             with pytest.raises(RuntimeError, match="Failed to probe"):
                 runtime.probe_media("input.mp4")
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_probe_media_json_backends(self, use_orjson):
+        """Test probe parsing works with and without orjson"""
+        import media_jobs
+
+        if use_orjson and media_jobs.orjson is None:
+            pytest.skip("orjson not installed")
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout='{"format": {"duration": "3.5"}}'
+            )
+            runtime = FFmpegRuntime()
+            orjson_module = media_jobs.orjson if use_orjson else None
+            with patch("media_jobs.orjson", orjson_module):
+                assert runtime.probe_media("input.mp4") == {
+                    "format": {"duration": "3.5"}
+                }
+
+                mock_run.return_value = MagicMock(returncode=0, stdout="not json")
+                with pytest.raises(RuntimeError, match="Failed to probe"):
+                    runtime.probe_media("input.mp4")
+
+    def test_probe_scalars(self):
+        """Test the key=value fast path parses size, frame rate and duration"""
+        output = "width=1920\nheight=1080\nr_frame_rate=30000/1001\nduration=N/A\n"
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout=output)
+            runtime = FFmpegRuntime()
+            scalars = runtime.probe_scalars("input.mp4")
+
+            assert scalars["width"] == 1920
+            assert scalars["height"] == 1080
+            assert scalars["fps"] == pytest.approx(29.97, abs=0.01)
+            assert scalars["duration"] is None
+            cmd = mock_run.call_args[0][0]
+            assert "stream=width,height,r_frame_rate,duration" in cmd
+            assert "json" not in cmd
+
+    def test_probe_media_cached_until_file_changes(self, tmp_path):
+        """Test repeat probes of an unchanged file reuse the cached result"""
+        media = tmp_path / "clip.mp4"
+        media.write_bytes(b"abc")
+        mock_json = '{"format": {"duration": "10.0"}, "streams": []}'
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout=mock_json)
+            runtime = FFmpegRuntime()
+
+            first = runtime.probe_media(str(media))
+            first["format"]["duration"] = "mutated"
+            second = runtime.probe_media(str(media))
+            assert mock_run.call_count == 3  # 2 validations + 1 probe
+            assert second["format"]["duration"] == "10.0"
+
+            media.write_bytes(b"abcdef")
+            runtime.probe_media(str(media))
+            assert mock_run.call_count == 4
+
+    def test_probe_media_cache_evicts_oldest(self, tmp_path):
+        """Test the probe cache is bounded by probe_cache_size"""
+        paths = []
+        for name in ("a.mp4", "b.mp4"):
+            path = tmp_path / name
+            path.write_bytes(b"x")
+            paths.append(str(path))
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="{}")
+            runtime = FFmpegRuntime(probe_cache_size=1)
+
+            runtime.probe_media(paths[0])
+            runtime.probe_media(paths[1])
+            runtime.probe_media(paths[0])
+            assert mock_run.call_count == 5
+            assert len(runtime._probe_cache) == 1
+
+
+class TestPriorityJobQueue:
+    """Test the deque-per-priority job queue"""
+
+    @staticmethod
+    def _job(name, priority):
+        return MediaJob(
+            job_id=name,
+            job_type="transcode",
+            input_path=f"{name}.mp4",
+            output_path=f"{name}_out.mp4",
+            ffmpeg_args=[],
+            priority=priority,
+        )
+
+    def test_priority_then_fifo_order(self):
+        """Test higher priorities first and submission order within a priority"""
+        job_queue = _PriorityJobQueue()
+        for name, priority in [
+            ("low", JobPriority.LOW),
+            ("normal1", JobPriority.NORMAL),
+            ("critical", JobPriority.CRITICAL),
+            ("normal2", JobPriority.NORMAL),
+        ]:
+            job_queue.put(self._job(name, priority))
+
+        assert job_queue.qsize() == 4
+        order = [job_queue.get(timeout=0).job_id for _ in range(4)]
+        assert order == ["critical", "normal1", "normal2", "low"]
+
+    def test_get_empty_raises(self):
+        """Test get on an empty queue raises queue.Empty after the timeout"""
+        from queue import Empty
+
+        with pytest.raises(Empty):
+            _PriorityJobQueue().get(timeout=0.01)
+
+    def test_join_waits_for_task_done(self):
+        """Test join returns once every queued job is marked done"""
+        import threading
+
+        job_queue = _PriorityJobQueue()
+        job_queue.put(self._job("a", JobPriority.NORMAL))
+        joined = threading.Event()
+        waiter = threading.Thread(target=lambda: (job_queue.join(), joined.set()))
+        waiter.start()
+
+        job_queue.get(timeout=0)
+        assert not joined.wait(0.05)
+        job_queue.task_done()
+        assert joined.wait(1)
+
+    def test_idle_workers_woken_most_recent_first(self):
+        """Test the job queue hands new work to the last worker to go idle"""
+        import threading
+
+        job_queue = _PriorityJobQueue()
+        taken = []
+
+        def getter(name):
+            job_queue.get(timeout=2)
+            taken.append(name)
+
+        first = threading.Thread(target=getter, args=("first",))
+        first.start()
+        time.sleep(0.05)
+        second = threading.Thread(target=getter, args=("second",))
+        second.start()
+        time.sleep(0.05)
+
+        job_queue.put(self._job("a", JobPriority.NORMAL))
+        second.join(timeout=1)
+        assert taken == ["second"]
+
+        job_queue.put(self._job("b", JobPriority.NORMAL))
+        first.join(timeout=1)
+        assert taken == ["second", "first"]
+
 
 class TestMediaJobQueue:
     """Test media job queue and worker pool"""
@@ -274,6 +634,83 @@ class TestMediaJobQueue:
 
         queue.shutdown(wait=False)
 
+    def test_cancelled_job_is_not_executed(self, mock_runtime):
+        """Test a job cancelled while queued is skipped by workers"""
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+
+            def slow_exec(*args, **kwargs):
+                time.sleep(0.3)
+                return (0, "success", "")
+
+            mock_exec.side_effect = slow_exec
+
+            queue = MediaJobQueue(min_workers=1, max_workers=1)
+            first_id = queue.submit_job(
+                job_type="transcode",
+                input_path="a.mp4",
+                output_path="a_out.mp4",
+                ffmpeg_args=["-i", "a.mp4", "a_out.mp4"],
+            )
+            second_id = queue.submit_job(
+                job_type="transcode",
+                input_path="b.mp4",
+                output_path="b_out.mp4",
+                ffmpeg_args=["-i", "b.mp4", "b_out.mp4"],
+            )
+
+            assert queue.cancel_job(second_id)
+            queue.shutdown(wait=True)
+
+            assert queue.get_job_status(first_id).status == JobStatus.COMPLETED
+            assert queue.get_job_status(second_id).status == JobStatus.CANCELLED
+            assert mock_exec.call_count == 1
+
+    def test_submit_rejected_at_max_queue_size(self, mock_runtime):
+        """Test admission control rejects jobs once the queue is full"""
+        queue = MediaJobQueue(min_workers=0, max_workers=1, max_queue_size=2)
+        for i in range(2):
+            queue.submit_job(
+                job_type="transcode",
+                input_path=f"input{i}.mp4",
+                output_path=f"output{i}.mp4",
+                ffmpeg_args=["-i", f"input{i}.mp4", f"output{i}.mp4"],
+            )
+
+        with pytest.raises(QueueFullError, match="full"):
+            queue.submit_job(
+                job_type="transcode",
+                input_path="extra.mp4",
+                output_path="extra_out.mp4",
+                ffmpeg_args=["-i", "extra.mp4", "extra_out.mp4"],
+            )
+        assert len(queue.jobs) == 2
+
+        queue.shutdown(wait=False)
+
+    def test_threads_per_job_defaults_to_cpu_share(self, mock_runtime):
+        """Test the queue splits CPUs across max_workers for ffmpeg threads"""
+        with patch("media_jobs.os.cpu_count", return_value=8):
+            queue = MediaJobQueue(min_workers=1, max_workers=4)
+        assert queue.runtime.threads_per_job == 2
+        queue.shutdown(wait=False)
+
+    @pytest.mark.skipif(
+        not hasattr(os, "sched_setaffinity"), reason="requires sched_setaffinity"
+    )
+    def test_pin_workers_sets_thread_affinity(self, mock_runtime):
+        """Test pinned workers apply their CPU slice on start"""
+        with patch("media_jobs.os.sched_setaffinity") as mock_affinity, patch(
+            "media_jobs.os.sched_getaffinity", return_value={0, 1, 2, 3}
+        ):
+            queue = MediaJobQueue(
+                min_workers=2, max_workers=2, threads_per_job=2, pin_workers=True
+            )
+            queue.shutdown(wait=True)
+
+        assert sorted(
+            sorted(call.args[1]) for call in mock_affinity.call_args_list
+        ) == [[0, 1], [2, 3]]
+
     def test_autoscaling_up(self, mock_runtime):
         """Test worker autoscaling up"""
         with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
@@ -309,6 +746,41 @@ class TestMediaJobQueue:
 
             queue.shutdown(wait=False)
 
+    def test_scale_down_needs_consecutive_quiet_ticks(self, mock_runtime):
+        """Test scale-down waits for scale_down_ticks quiet autoscaler checks"""
+        queue = MediaJobQueue(min_workers=1, max_workers=3, scale_down_ticks=3)
+        with queue._scale_lock:
+            queue._scale_workers(3)
+
+        queue._autoscale_tick()
+        queue._autoscale_tick()
+        assert len(queue.workers) == 3
+
+        queue._autoscale_tick()
+        assert len(queue.workers) == 2
+
+        queue.shutdown(wait=False)
+
+    def test_scale_down_retires_longest_idle_worker(self, mock_runtime):
+        """Test scale-down stops the least recently active idle worker"""
+        queue = MediaJobQueue(min_workers=1, max_workers=3)
+        with queue._scale_lock:
+            queue._scale_workers(3)
+
+        for offset, worker in enumerate(queue.workers):
+            worker.last_active = 1000.0 + offset
+        oldest = queue.workers[0]
+
+        with queue._scale_lock:
+            queue._scale_workers(2)
+
+        assert oldest not in queue.workers
+        assert oldest.stop_self
+        oldest.join(timeout=2)
+        assert not oldest.is_alive()
+
+        queue.shutdown(wait=False)
+
     def test_get_metrics(self, mock_runtime):
         """Test metrics collection"""
         with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
@@ -333,6 +805,139 @@ class TestMediaJobQueue:
 
             queue.shutdown(wait=False)
 
+    def test_job_duration_uses_monotonic_ns(self, mock_runtime):
+        """Test durations come from perf_counter_ns stamps"""
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+
+            def slow_exec(*args, **kwargs):
+                time.sleep(0.05)
+                return (0, "success", "")
+
+            mock_exec.side_effect = slow_exec
+            queue = MediaJobQueue(min_workers=1, max_workers=1)
+            job_id = queue.submit_job(
+                job_type="transcode",
+                input_path="input.mp4",
+                output_path="output.mp4",
+                ffmpeg_args=["-i", "input.mp4", "output.mp4"],
+            )
+            queue.shutdown(wait=True)
+
+            job = queue.get_job_status(job_id)
+            assert isinstance(job.started_ns, int)
+            assert job.duration_ns >= 50_000_000
+            metrics = queue.get_metrics()
+            assert metrics.average_job_duration == pytest.approx(job.duration_ns / 1e9)
+
+    def test_metrics_counted_at_transition(self, mock_runtime):
+        """Test metrics come from running totals, not the job history"""
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+            mock_exec.side_effect = [(0, "", ""), (0, "", ""), (1, "", "err")]
+            queue = MediaJobQueue(min_workers=1, max_workers=1)
+            for i in range(3):
+                queue.submit_job(
+                    job_type="transcode",
+                    input_path=f"input{i}.mp4",
+                    output_path=f"output{i}.mp4",
+                    ffmpeg_args=["-i", f"input{i}.mp4", f"output{i}.mp4"],
+                )
+            queue.shutdown(wait=True)
+
+        queue.jobs.clear()
+        metrics = queue.get_metrics()
+        assert metrics.total_jobs_processed == 2
+        assert metrics.total_jobs_failed == 1
+
+    def test_job_history_is_bounded(self, mock_runtime):
+        """Test the oldest finished jobs are evicted past max_history"""
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+            mock_exec.return_value = (0, "", "")
+            queue = MediaJobQueue(min_workers=1, max_workers=1, max_history=3)
+            job_ids = [
+                queue.submit_job(
+                    job_type="transcode",
+                    input_path=f"input{i}.mp4",
+                    output_path=f"output{i}.mp4",
+                    ffmpeg_args=["-i", f"input{i}.mp4", f"output{i}.mp4"],
+                )
+                for i in range(5)
+            ]
+            queue.shutdown(wait=True)
+
+        assert list(queue.jobs) == job_ids[2:]
+        assert queue.get_job_status(job_ids[0]) is None
+        assert queue.get_metrics().total_jobs_processed == 5
+
+    def test_history_eviction_keeps_pending_jobs(self, mock_runtime):
+        """Test jobs that have not finished are never evicted"""
+        queue = MediaJobQueue(min_workers=0, max_workers=1, max_history=1)
+        job_ids = [
+            queue.submit_job(
+                job_type="transcode",
+                input_path=f"input{i}.mp4",
+                output_path=f"output{i}.mp4",
+                ffmpeg_args=["-i", f"input{i}.mp4", f"output{i}.mp4"],
+            )
+            for i in range(3)
+        ]
+        queue.cancel_job(job_ids[1])
+
+        assert list(queue.jobs) == [job_ids[0], job_ids[2]]
+        queue.shutdown(wait=False)
+
+    def test_failed_job_retried_with_backoff(self, mock_runtime):
+        """Test a failing job is re-run after a delay until it succeeds"""
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+            calls = []
+
+            def flaky_exec(*args, **kwargs):
+                calls.append(time.monotonic())
+                return (1, "", "transient") if len(calls) < 3 else (0, "", "")
+
+            mock_exec.side_effect = flaky_exec
+            queue = MediaJobQueue(
+                min_workers=1, max_workers=1, retry_backoff_seconds=0.05
+            )
+            job_id = queue.submit_job(
+                job_type="transcode",
+                input_path="input.mp4",
+                output_path="output.mp4",
+                ffmpeg_args=["-i", "input.mp4", "output.mp4"],
+                max_retries=3,
+            )
+            queue.shutdown(wait=True)
+
+        job = queue.get_job_status(job_id)
+        assert job.status == JobStatus.COMPLETED
+        assert job.retry_count == 2
+        assert calls[1] - calls[0] >= 0.05
+        assert calls[2] - calls[1] >= 0.1
+        metrics = queue.get_metrics()
+        assert metrics.total_jobs_retried == 2
+        assert metrics.total_jobs_failed == 0
+
+    def test_job_fails_after_max_retries(self, mock_runtime):
+        """Test a job is marked FAILED once its retries are exhausted"""
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+            mock_exec.return_value = (1, "", "permanent")
+            queue = MediaJobQueue(
+                min_workers=1, max_workers=1, retry_backoff_seconds=0.01
+            )
+            job_id = queue.submit_job(
+                job_type="transcode",
+                input_path="input.mp4",
+                output_path="output.mp4",
+                ffmpeg_args=["-i", "input.mp4", "output.mp4"],
+                max_retries=2,
+            )
+            queue.shutdown(wait=True)
+
+        job = queue.get_job_status(job_id)
+        assert job.status == JobStatus.FAILED
+        assert "permanent" in job.error
+        assert mock_exec.call_count == 3
+        assert queue.get_metrics().total_jobs_failed == 1
+
     def test_job_timeout(self, mock_runtime):
         """Test job timeout handling"""
         with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
@@ -378,6 +983,214 @@ class TestMediaJobQueue:
             for worker in queue.workers:
                 assert not worker.is_alive()
 
+    def test_shutdown_wakes_idle_workers(self, mock_runtime):
+        """Test idle workers exit promptly on shutdown instead of polling"""
+        queue = MediaJobQueue(min_workers=3, max_workers=3)
+        workers = list(queue.workers)
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        queue.shutdown(wait=False)
+
+        assert not any(worker.is_alive() for worker in workers)
+        assert time.monotonic() - start < 0.5
+
+
+class TestJobPersistence:
+    """Test SQLite-backed job state"""
+
+    @pytest.fixture
+    def mock_runtime(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            yield
+
+    @staticmethod
+    def _submit(queue, name):
+        return queue.submit_job(
+            job_type="transcode",
+            input_path=f"{name}.mp4",
+            output_path=f"{name}_out.mp4",
+            ffmpeg_args=["-i", f"{name}.mp4", f"{name}_out.mp4"],
+            metadata={"name": name},
+        )
+
+    def test_status_and_counters_persisted(self, mock_runtime, tmp_path):
+        """Test job rows and metric counters are written on transitions"""
+        import sqlite3
+
+        db_path = str(tmp_path / "jobs.db")
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+            mock_exec.side_effect = [(0, "", ""), (1, "", "boom")]
+            queue = MediaJobQueue(min_workers=1, max_workers=1, db_path=db_path)
+            ok_id = self._submit(queue, "ok")
+            bad_id = self._submit(queue, "bad")
+            queue.shutdown(wait=True)
+
+        conn = sqlite3.connect(db_path)
+        rows = dict(conn.execute("SELECT job_id, status FROM jobs"))
+        counters = dict(conn.execute("SELECT key, value FROM job_counters"))
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+
+        assert rows == {ok_id: "completed", bad_id: "failed"}
+        assert counters["completed"] == 1
+        assert counters["failed"] == 1
+        assert mode == "wal"
+
+    def test_metrics_read_from_counters(self, mock_runtime, tmp_path):
+        """Test get_metrics uses the persisted counters"""
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+            mock_exec.return_value = (0, "", "")
+            queue = MediaJobQueue(
+                min_workers=1, max_workers=1, db_path=str(tmp_path / "jobs.db")
+            )
+            for i in range(3):
+                self._submit(queue, f"clip{i}")
+            queue.job_queue.join()
+
+            metrics = queue.get_metrics()
+            assert metrics.total_jobs_processed == 3
+            assert metrics.total_jobs_failed == 0
+            queue.shutdown(wait=True)
+
+    def test_pending_jobs_survive_restart(self, mock_runtime, tmp_path):
+        """Test jobs queued when a process stops are re-run by the next one"""
+        db_path = str(tmp_path / "jobs.db")
+        first = MediaJobQueue(min_workers=0, max_workers=1, db_path=db_path)
+        job_id = self._submit(first, "clip")
+        first.shutdown(wait=False)
+
+        with patch.object(FFmpegRuntime, "execute_ffmpeg") as mock_exec:
+            mock_exec.return_value = (0, "", "")
+            second = MediaJobQueue(min_workers=1, max_workers=1, db_path=db_path)
+            second.shutdown(wait=True)
+
+        assert mock_exec.call_count == 1
+        third = MediaJobQueue(min_workers=0, max_workers=1, db_path=db_path)
+        job = third.get_job_status(job_id)
+        assert job.status == JobStatus.COMPLETED
+        assert job.metadata == {"name": "clip"}
+        assert job.ffmpeg_args == ["-i", "clip.mp4", "clip_out.mp4"]
+        assert third.get_metrics().total_jobs_processed == 1
+        third.shutdown(wait=False)
+
+
+class _FakeAsyncProcess:
+    """Stand-in for asyncio.subprocess.Process with canned output"""
+
+    def __init__(self, returncode=0, stdout=b"", stderr=b"", hang=False):
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.returncode = None
+        self._result = returncode
+        self._done = asyncio.Event()
+        self.killed = False
+        for reader, data in ((self.stdout, stdout), (self.stderr, stderr)):
+            reader.feed_data(data)
+            if not hang:
+                reader.feed_eof()
+        if not hang:
+            self._done.set()
+
+    async def wait(self):
+        await self._done.wait()
+        self.returncode = self._result
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+        self._result = -9
+        for reader in (self.stdout, self.stderr):
+            reader.feed_eof()
+        self._done.set()
+
+
+class TestAsyncExecution:
+    """Test the asyncio execution path"""
+
+    @pytest.fixture
+    def runtime(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            yield FFmpegRuntime()
+
+    @staticmethod
+    def _run_with(procs, coro_factory):
+        async def main():
+            fakes = [_FakeAsyncProcess(**kwargs) for kwargs in procs]
+            with patch("asyncio.create_subprocess_exec") as mock_exec:
+                mock_exec.side_effect = fakes
+                return await coro_factory(), fakes, mock_exec
+
+        return asyncio.run(main())
+
+    def test_execute_ffmpeg_async(self, runtime):
+        """Test async execution returns output and a bounded stderr tail"""
+        big_stderr = b"x" * 100_000 + b"final error"
+        result, fakes, mock_exec = self._run_with(
+            [{"returncode": 1, "stdout": b"out", "stderr": big_stderr}],
+            lambda: runtime.execute_ffmpeg_async(["-i", "in.mp4", "out.mp4"]),
+        )
+
+        returncode, stdout, stderr = result
+        assert returncode == 1
+        assert stdout == "out"
+        assert stderr.endswith("final error")
+        assert len(stderr) == 16 * 1024
+        assert mock_exec.call_args[0][1:] == ("-i", "in.mp4", "out.mp4")
+
+    def test_execute_ffmpeg_async_timeout(self, runtime):
+        """Test async execution kills ffmpeg on timeout"""
+        fakes = []
+
+        async def main():
+            fake = _FakeAsyncProcess(hang=True)
+            fakes.append(fake)
+            with patch("asyncio.create_subprocess_exec", return_value=fake):
+                await runtime.execute_ffmpeg_async(["-i", "in.mp4"], 0.05)
+
+        with pytest.raises(TimeoutError, match="timed out"):
+            asyncio.run(main())
+        assert fakes[0].killed
+
+    def test_run_media_jobs_async(self, runtime):
+        """Test jobs run concurrently and get worker-style status updates"""
+
+        def job(name, priority=JobPriority.NORMAL):
+            return MediaJob(
+                job_id=name,
+                job_type="transcode",
+                input_path=f"{name}.mp4",
+                output_path=f"{name}_out.mp4",
+                ffmpeg_args=["-i", f"{name}.mp4"],
+                priority=priority,
+            )
+
+        jobs = [job("low", JobPriority.LOW), job("ok"), job("bad"), job("skip")]
+        jobs[3].status = JobStatus.CANCELLED
+
+        result, _, mock_exec = self._run_with(
+            [
+                {"returncode": 0},
+                {"returncode": 1, "stderr": b"boom"},
+                {"returncode": 0},
+            ],
+            lambda: run_media_jobs_async(runtime, jobs, max_concurrency=1),
+        )
+
+        assert result is jobs
+        assert [c[0][2] for c in mock_exec.call_args_list] == [
+            "ok.mp4",
+            "bad.mp4",
+            "low.mp4",
+        ]
+        assert jobs[0].status == JobStatus.COMPLETED
+        assert jobs[1].status == JobStatus.COMPLETED
+        assert jobs[2].status == JobStatus.FAILED
+        assert "boom" in jobs[2].error
+        assert jobs[3].status == JobStatus.CANCELLED
+
 
 class TestConvenienceFunctions:
     """Test convenience functions for common operations"""
@@ -408,6 +1221,18 @@ class TestConvenienceFunctions:
         assert job.priority == JobPriority.HIGH
         assert "-c:v" in job.ffmpeg_args
         assert "libx264" in job.ffmpeg_args
+        assert job.ffmpeg_args == (
+            "-i",
+            "input.mp4",
+            "-c:v",
+            "libx264",
+            "-c:a",
+            "aac",
+            "-b:v",
+            "2M",
+            "-y",
+            "output.mp4",
+        )
 
     def test_create_thumbnail_job(self, mock_queue):
         """Test thumbnail job creation"""
@@ -427,6 +1252,51 @@ class TestConvenienceFunctions:
         assert "00:00:05" in job.ffmpeg_args
         assert "scale=640:-1" in job.ffmpeg_args
 
+    def test_create_thumbnail_batch_job(self, mock_queue):
+        """Test batched thumbnail extraction uses a single ffmpeg job"""
+        job_id = create_thumbnail_batch_job(
+            queue=mock_queue,
+            input_path="input.mp4",
+            output_dir="thumbs",
+            timestamps=[5.0, 1.5, 5.0],
+            width=160,
+        )
+
+        job = mock_queue.get_job_status(job_id)
+        assert job.job_type == "thumbnail_batch"
+        assert job.metadata["timestamps"] == [1.5, 5.0]
+        assert job.ffmpeg_args[-1] == os.path.join("thumbs", "thumb_%03d.jpg")
+
+        vf = job.ffmpeg_args[job.ffmpeg_args.index("-vf") + 1]
+        assert vf.startswith("select='")
+        assert "gte(pts*TB,1.5)" in vf and "gte(pts*TB,5.0)" in vf
+        assert vf.endswith(",scale=160:-1")
+
+    def test_thumbnail_batch_records_written_files(self):
+        """Test output_paths lists only thumbnails written by this run"""
+        from datetime import datetime
+        import media_jobs
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pattern = os.path.join(tmpdir, "thumb_%03d.jpg")
+            for index in (1, 2, 3):
+                with open(pattern % index, "wb") as f:
+                    f.write(b"jpg")
+            os.utime(pattern % 3, (0, 0))  # Left over from an earlier run
+
+            job = MediaJob(
+                job_id="thumbs",
+                job_type="thumbnail_batch",
+                input_path="input.mp4",
+                output_path=pattern,
+                ffmpeg_args=[],
+                metadata={"timestamps": [1.0, 1.01, 2.0, 99.0]},
+            )
+            job.started_at = datetime.now()
+            media_jobs._record_job_outputs(job)
+
+            assert job.metadata["output_paths"] == [pattern % 1, pattern % 2]
+
 
 class TestIntegration:
     """Integration tests"""
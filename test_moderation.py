@@ -12,9 +12,19 @@ from moderation import (
     ModerationResult,
     AuditEntry,
     ModerationError,
+    _classify_hash_prefix,
 )
 
 
+@pytest.fixture
+def fallback_scanner(monkeypatch):
+    """Scanner built without pyahocorasick, exercising the regex fallback"""
+    import moderation
+
+    monkeypatch.setattr(moderation, "ahocorasick", None)
+    return ContentScanner()
+
+
 class TestContentScanner:
     """Test content scanner functionality"""
 
@@ -71,6 +81,116 @@ class TestContentScanner:
         category2, _, _ = scanner.scan_metadata(title="nsfw content")
         assert category1 == category2 == ContentCategory.NSFW
 
+    def test_category_priority_independent_of_position(self):
+        """Test that NSFW outranks violence and hate regardless of text order"""
+        scanner = ContentScanner()
+        category, _, reasons = scanner.scan_metadata(
+            title="hate and gore", description="then something explicit"
+        )
+        assert category == ContentCategory.NSFW
+        assert reasons == ["NSFW keyword detected: 'explicit'"]
+
+        category, _, _ = scanner.scan_metadata(title="hate then gore")
+        assert category == ContentCategory.GRAPHIC_VIOLENCE
+
+    def test_keyword_reasons_prebuilt(self):
+        """Test hit reasons reuse the strings built at scanner init"""
+        scanner = ContentScanner()
+        _, _, first = scanner.scan_metadata(title="gore")
+        _, _, second = scanner.scan_metadata(tags=["GORE"])
+        assert first == ["Violence keyword detected: 'gore'"]
+        assert first[0] is second[0]
+
+    def test_priority_across_fields(self):
+        """Test a later field's higher-priority keyword wins over an earlier one"""
+        scanner = ContentScanner()
+        category, _, reasons = scanner.scan_metadata(
+            title="Racist rant", description="brutal", tags=["cat", "XXX"]
+        )
+        assert category == ContentCategory.NSFW
+        assert reasons == ["NSFW keyword detected: 'xxx'"]
+
+    def test_substring_fallback_matches_automaton(self, fallback_scanner):
+        """Test that the substring fallback agrees with the automaton path"""
+        fast = ContentScanner()
+        slow = fallback_scanner
+        samples = [
+            {"title": "Cute Cat GIF", "tags": ["cat"]},
+            {"title": "Brutal fight", "tags": ["racist"]},
+            {"title": "Hate Speech Example", "tags": ["hate"]},
+            {"description": "18+ only"},
+        ]
+        for sample in samples:
+            assert fast.scan_metadata(**sample)[:2] == slow.scan_metadata(**sample)[:2]
+
+    def test_fallback_patterns_escape_keywords(self, fallback_scanner):
+        """Test that regex metacharacters in keywords are matched literally"""
+        scanner = fallback_scanner
+        category, _, reasons = scanner.scan_metadata(title="Rated 18+ clip")
+        assert category == ContentCategory.NSFW
+        assert reasons == ["NSFW keyword detected: '18+'"]
+
+        category, _, _ = scanner.scan_metadata(title="Rated 18 clip")
+        assert category == ContentCategory.SAFE
+
+    def test_fallback_case_insensitive_reports_keyword(self, fallback_scanner):
+        """Test mixed-case text matches and reports the lowercase keyword"""
+        scanner = fallback_scanner
+        category, _, reasons = scanner.scan_metadata(tags=["BruTAL"])
+        assert category == ContentCategory.GRAPHIC_VIOLENCE
+        assert reasons == ["Violence keyword detected: 'brutal'"]
+
+    @pytest.mark.parametrize("fallback", [False, True])
+    def test_unicode_case_folding_not_matched(self, fallback, monkeypatch):
+        """Test text that only matches under Unicode case folding stays safe"""
+        import moderation
+
+        if fallback:
+            monkeypatch.setattr(moderation, "ahocorasick", None)
+        scanner = ContentScanner()
+
+        category, _, _ = scanner.scan_metadata(title="ſupremacist rally")
+        assert category == ContentCategory.SAFE
+        category, _, reasons = scanner.scan_metadata(title="SUPREMACIST rally")
+        assert reasons == ["Hate speech keyword detected: 'supremacist'"]
+
+    def test_blocklist_edits_take_effect(self):
+        """Test keywords added or removed after construction are honoured"""
+        scanner = ContentScanner()
+        assert scanner.scan_metadata(title="zzbadword here")[0] == ContentCategory.SAFE
+
+        scanner.hate_keywords.add("zzbadword")
+        category, _, reasons = scanner.scan_metadata(title="zzbadword here")
+        assert category == ContentCategory.HATE_SPEECH
+        assert reasons == ["Hate speech keyword detected: 'zzbadword'"]
+
+        scanner.nsfw_keywords = {"zzbadword"}
+        assert scanner.scan_metadata(title="zzbadword")[0] == ContentCategory.NSFW
+        assert scanner.scan_metadata(title="explicit")[0] == ContentCategory.SAFE
+
+    def test_fallback_blocklist_edits_take_effect(self, fallback_scanner):
+        """Test the regex fallback also rebuilds when a blocklist changes"""
+        scanner = fallback_scanner
+        scanner.hate_keywords.add("zzbadword")
+        assert (
+            scanner.scan_metadata(title="zzbadword")[0] == ContentCategory.HATE_SPEECH
+        )
+
+        scanner.nsfw_keywords.clear()
+        assert scanner.scan_metadata(title="explicit cat")[0] == ContentCategory.SAFE
+
+    def test_empty_blocklists_match_nothing(self):
+        """Test clearing every blocklist leaves all metadata safe"""
+        scanner = ContentScanner()
+        for keywords in (
+            scanner.nsfw_keywords,
+            scanner.violence_keywords,
+            scanner.hate_keywords,
+        ):
+            keywords.clear()
+
+        assert scanner.scan_metadata(title="explicit gore")[0] == ContentCategory.SAFE
+
     def test_visual_content_scanning(self):
         """Test visual content scanning"""
         scanner = ContentScanner()
@@ -86,6 +206,21 @@ class TestContentScanner:
         assert 0.0 <= confidence <= 1.0
         assert len(reasons) > 0
 
+    def test_visual_scan_cached_reasons_not_shared(self):
+        """Test cached visual classifications hand out independent reason lists"""
+        scanner = ContentScanner()
+        _classify_hash_prefix.cache_clear()
+        first = scanner.scan_visual_content("/a.gif", "ffffff3a" + "0" * 56)
+        first[2].append("caller note")
+        second = scanner.scan_visual_content("/b.gif", "ffffff3a" + "1" * 56)
+
+        assert _classify_hash_prefix.cache_info().hits == 1
+        assert second == (
+            ContentCategory.NSFW,
+            0.85,
+            ["Visual content detected inappropriate imagery"],
+        )
+
 
 class TestModerationPipeline:
     """Test moderation pipeline"""
@@ -118,6 +253,54 @@ class TestModerationPipeline:
         assert result.scan_id
         assert result.timestamp
 
+    def test_automated_audit_entries_built_on_read(self):
+        """Test automated decisions are stored compactly and expanded on read"""
+        pipeline = ModerationPipeline()
+        result = pipeline.moderate_content(
+            asset_id="lazy", file_path="/p.gif", file_hash="a" * 64, title="explicit"
+        )
+        assert not isinstance(pipeline._audit_trail[0], AuditEntry)
+
+        entry = pipeline.get_audit_trail()[0]
+        assert isinstance(entry, AuditEntry)
+        assert entry.asset_id == "lazy"
+        assert entry.moderator == "automated"
+        assert entry.decision == result.decision
+        assert entry.timestamp == result.timestamp
+        assert entry.reasons == result.reasons
+
+        exported = pipeline.export_audit_trail()[0]
+        assert exported["audit_id"] == entry.audit_id
+        assert exported["category"] == result.category.value
+
+    def test_audit_trail_snapshots_result(self):
+        """Test editing a returned result does not rewrite the audit trail"""
+        pipeline = ModerationPipeline()
+        result = pipeline.moderate_content(
+            asset_id="snap", file_path="/p.gif", file_hash="a" * 64, title="cats"
+        )
+        decision, confidence = result.decision, result.confidence
+        reasons = list(result.reasons)
+
+        result.decision = ModerationDecision.REJECTED
+        result.confidence = 0.0
+        result.reasons.append("edited")
+
+        entry = pipeline.get_audit_trail()[0]
+        assert entry.decision == decision
+        assert entry.confidence == confidence
+        assert entry.reasons == reasons
+        assert pipeline.export_audit_trail()[0]["decision"] == decision.value
+
+    def test_records_use_slots(self):
+        """Test moderation records carry no per-instance __dict__"""
+        pipeline = ModerationPipeline()
+        result = pipeline.moderate_content(
+            asset_id="slots", file_path="/p.gif", file_hash="a" * 64
+        )
+        assert not hasattr(result, "__dict__")
+        assert not hasattr(pipeline.get_audit_trail()[0], "__dict__")
+
     def test_moderate_nsfw_metadata(self):
         """Test rejection based on NSFW metadata"""
         pipeline = ModerationPipeline()
@@ -183,6 +366,21 @@ class TestModerationPipeline:
         assert manual_entry.decision == ModerationDecision.APPROVED
         assert manual_entry.confidence == 1.0
 
+    @pytest.mark.parametrize(
+        "decision,category",
+        [
+            (ModerationDecision.APPROVED, ContentCategory.SAFE),
+            (ModerationDecision.REJECTED, ContentCategory.NSFW),
+            (ModerationDecision.FLAGGED, ContentCategory.UNKNOWN),
+            (ModerationDecision.PENDING, ContentCategory.UNKNOWN),
+        ],
+    )
+    def test_manual_review_category(self, decision, category):
+        """Test the category recorded for each manual decision"""
+        pipeline = ModerationPipeline()
+        entry = pipeline.manual_review("asset", "scan", decision, "moderator123")
+        assert entry.category == category
+
     def test_get_audit_trail_filtered(self):
         """Test filtering audit trail by asset"""
         pipeline = ModerationPipeline()
@@ -307,6 +505,22 @@ class TestModerationPipeline:
         assert "asset_id" in exported[0]
         assert "decision" in exported[0]
         assert "timestamp" in exported[0]
+        assert exported[0]["decision"] == pipeline.get_audit_trail()[0].decision.value
+        assert exported[0]["category"] == pipeline.get_audit_trail()[0].category.value
+
+    def test_export_audit_trail_malformed_bounds(self):
+        """Test non-ISO bounds are compared as strings rather than raising"""
+        pipeline = ModerationPipeline()
+        pipeline.moderate_content(
+            asset_id="export_test",
+            file_path="/path/to/export.gif",
+            file_hash="m" * 64,
+            title="Export Test",
+        )
+
+        assert pipeline.export_audit_trail(start_time="not-a-date") == []
+        assert len(pipeline.export_audit_trail(end_time="not-a-date")) == 1
+        assert len(pipeline.export_audit_trail(start_time="0000")) == 1
 
     def test_scan_id_uniqueness(self):
         """Test that scan IDs are unique"""
@@ -330,6 +544,77 @@ class TestModerationPipeline:
 
         assert result1.scan_id != result2.scan_id
 
+    def test_ids_unique_for_repeated_asset(self):
+        """Test scan and audit IDs stay unique for rapid rescans of one asset"""
+        pipeline = ModerationPipeline()
+        results = [
+            pipeline.moderate_content(
+                asset_id="same", file_path="/p.gif", file_hash="a" * 64
+            )
+            for _ in range(50)
+        ]
+        scan_ids = {r.scan_id for r in results}
+        audit_ids = {e.audit_id for e in pipeline.get_audit_trail()}
+        assert len(scan_ids) == len(audit_ids) == 50
+        for scan_id in scan_ids:
+            assert len(scan_id) == 16
+            int(scan_id, 16)
+
+
+class TestBatchModeration:
+    """Test concurrent batch moderation"""
+
+    def test_batch_results_in_input_order(self):
+        """Test batch results line up with their inputs"""
+        pipeline = ModerationPipeline(max_concurrency=4)
+        items = [
+            {
+                "asset_id": f"batch_{i}",
+                "file_path": f"/path/to/{i}.gif",
+                "file_hash": "a" * 64,
+                "title": "explicit" if i % 3 == 0 else "cat",
+            }
+            for i in range(30)
+        ]
+
+        results = pipeline.moderate_batch(items)
+
+        assert len(results) == 30
+        for i, result in enumerate(results):
+            expected = ContentCategory.NSFW if i % 3 == 0 else ContentCategory.SAFE
+            assert result.category == expected
+
+        stats = pipeline.get_statistics()
+        assert stats["total_scans"] == 30
+        assert stats["rejected"] == 10
+        trail = pipeline.get_audit_trail(limit=100)
+        assert len(trail) == 30
+        assert len({e.audit_id for e in trail}) == 30
+
+    def test_batch_empty(self):
+        """Test an empty batch does no work"""
+        pipeline = ModerationPipeline()
+        assert pipeline.moderate_batch([]) == []
+        assert pipeline.get_statistics()["total_scans"] == 0
+
+    def test_batch_rate_limited(self, monkeypatch):
+        """Test scans are spaced out to the requested rate"""
+        import moderation
+
+        sleeps = []
+        monkeypatch.setattr(moderation.time, "sleep", sleeps.append)
+        pipeline = ModerationPipeline(max_concurrency=1)
+        items = [
+            {"asset_id": f"rl_{i}", "file_path": "/p.gif", "file_hash": "a" * 64}
+            for i in range(5)
+        ]
+
+        pipeline.moderate_batch(items, requests_per_second=10)
+
+        # First scan starts immediately; with sleep stubbed out, scan k is
+        # handed the slot k intervals after the first
+        assert sleeps == pytest.approx([0.1, 0.2, 0.3, 0.4], abs=0.02)
+
 
 class TestModerationDecisions:
     """Test decision-making logic"""
@@ -435,6 +720,51 @@ class TestAuditCompliance:
         exported = pipeline.export_audit_trail(end_time=past)
         assert len(exported) == 0
 
+    @staticmethod
+    def _entry(asset_id, timestamp):
+        return AuditEntry(
+            audit_id=asset_id,
+            asset_id=asset_id,
+            decision=ModerationDecision.APPROVED,
+            category=ContentCategory.SAFE,
+            confidence=1.0,
+            moderator="automated",
+            timestamp=timestamp,
+            reasons=[],
+        )
+
+    def test_export_time_window_inclusive(self):
+        """Test exporting a window returns exactly the entries inside it"""
+        pipeline = ModerationPipeline()
+        for hour in range(5):
+            pipeline._append_audit(
+                self._entry(f"h{hour}", f"2025-01-01T0{hour}:00:00+00:00")
+            )
+
+        exported = pipeline.export_audit_trail(
+            start_time="2025-01-01T01:00:00+00:00",
+            end_time="2025-01-01T03:00:00+00:00",
+        )
+        assert [e["asset_id"] for e in exported] == ["h1", "h2", "h3"]
+
+        # Naive bounds are taken as UTC; offsets are honoured
+        exported = pipeline.export_audit_trail(
+            start_time="2025-01-01T04:00:00", end_time="2025-01-01T05:00:00+01:00"
+        )
+        assert [e["asset_id"] for e in exported] == ["h4"]
+
+    def test_out_of_order_audit_entries_sorted(self):
+        """Test late-stamped entries are inserted in order, even at capacity"""
+        pipeline = ModerationPipeline(audit_max_entries=3)
+        for asset_id, hour in [("a", 1), ("c", 3), ("b", 2), ("d", 4), ("x", 0)]:
+            pipeline._append_audit(
+                self._entry(asset_id, f"2025-01-01T0{hour}:00:00+00:00")
+            )
+
+        assert [e.asset_id for e in pipeline.get_audit_trail()] == ["x", "c", "d"]
+        exported = pipeline.export_audit_trail(start_time="2025-01-01T03:00:00+00:00")
+        assert [e["asset_id"] for e in exported] == ["c", "d"]
+
 
 class TestEdgeCases:
     """Test edge cases and error handling"""
@@ -519,6 +849,59 @@ class TestEdgeCases:
         # Get only last 5
         trail = pipeline.get_audit_trail(limit=5)
         assert len(trail) == 5
+        assert [e.asset_id for e in trail] == [f"limit_test_{i}" for i in range(15, 20)]
+
+    def test_limit_with_filter_returns_newest_matches(self):
+        """Test filtered, limited trails return the newest matches oldest-first"""
+        pipeline = ModerationPipeline()
+        for i in range(6):
+            pipeline.moderate_content(
+                asset_id="even" if i % 2 == 0 else "odd",
+                file_path="/p.gif",
+                file_hash="a" * 64,
+                title=f"Content {i}",
+            )
+
+        trail = pipeline.get_audit_trail(asset_id="even", limit=2)
+        assert [e.asset_id for e in trail] == ["even", "even"]
+        assert (
+            trail[0].audit_id == pipeline.get_audit_trail(asset_id="even")[1].audit_id
+        )
+
+    def test_audit_trail_bounded(self):
+        """Test that the oldest audit entries are dropped past the cap"""
+        pipeline = ModerationPipeline(audit_max_entries=3)
+        for i in range(5):
+            pipeline.moderate_content(
+                asset_id=f"bounded_{i}", file_path="/p.gif", file_hash="a" * 64
+            )
+
+        trail = pipeline.get_audit_trail()
+        assert [e.asset_id for e in trail] == ["bounded_2", "bounded_3", "bounded_4"]
+
+        pipeline.clear_audit_trail(asset_id="bounded_3")
+        for i in range(5, 7):
+            pipeline.moderate_content(
+                asset_id=f"bounded_{i}", file_path="/p.gif", file_hash="a" * 64
+            )
+        trail = pipeline.get_audit_trail()
+        assert [e.asset_id for e in trail] == ["bounded_4", "bounded_5", "bounded_6"]
+
+    def test_statistics_cached_until_next_decision(self):
+        """Test statistics are reused between decisions and safe to mutate"""
+        pipeline = ModerationPipeline()
+        pipeline.moderate_content("a1", "/p.gif", "a" * 64, title="explicit")
+
+        stats = pipeline.get_statistics()
+        stats["rejected"] = 99
+        assert pipeline.get_statistics()["rejected"] == 1
+        assert pipeline._cached_stats is not None
+
+        pipeline.manual_review("a1", "scan", ModerationDecision.APPROVED, "mod")
+        assert pipeline._cached_stats is None
+        stats = pipeline.get_statistics()
+        assert stats["approved"] == 1
+        assert stats["rejection_rate"] == 100.0
 
     def test_statistics_no_scans(self):
         """Test statistics when no scans performed"""
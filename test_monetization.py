@@ -40,6 +40,12 @@ class TestAdRevenueTracking:
         assert event.metadata["clicks"] == 25
         assert event.metadata["ctr"] == 2.5
 
+    def test_events_use_slots(self, tracker):
+        """Test revenue records carry no per-instance __dict__"""
+        event = tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.50)
+        assert not hasattr(event, "__dict__")
+        assert not hasattr(tracker.get_ad_revenue_metrics(), "__dict__")
+
     def test_track_multiple_ad_events(self, tracker):
         """Test tracking multiple ad revenue events"""
         tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.50)
@@ -129,6 +135,20 @@ class TestRevenueCalculations:
         assert breakdown["pro_subscription"] == 9.99
         assert breakdown["team_subscription"] == 49.99
 
+    def test_revenue_by_source_all_keys_and_range(self, tracker):
+        """Test breakdown lists every source and honours the date range"""
+        event = tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 10.00)
+        tracker.track_subscription_revenue("user_2", "pro", 9.99)
+
+        breakdown = tracker.get_revenue_by_source()
+        assert set(breakdown) == {source.value for source in RevenueSource}
+        assert breakdown["custom_partnership"] == 0.0
+
+        after = tracker.get_revenue_by_source(start_date=event.timestamp)
+        assert after["website_ads"] == 10.00
+        later = event.timestamp + timedelta(days=1)
+        assert sum(tracker.get_revenue_by_source(start_date=later).values()) == 0.0
+
     def test_revenue_filtered_by_source(self, tracker):
         """Test filtering revenue by specific source"""
         tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 10.00)
@@ -157,6 +177,55 @@ class TestRevenueCalculations:
 
         assert recent_revenue == 10.00  # Only the recent event
 
+    def test_date_range_bounds_inclusive(self, tracker):
+        """Test that start and end dates both include matching events"""
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for day, source in enumerate(
+            [RevenueSource.WEBSITE_ADS, RevenueSource.PRO_SUBSCRIPTION] * 3
+        ):
+            tracker.revenue_events.append(
+                RevenueEvent(
+                    event_id=f"e{day}",
+                    source=source,
+                    amount_usd=float(day + 1),
+                    user_id="user",
+                    timestamp=base + timedelta(days=day),
+                    metadata={},
+                )
+            )
+
+        start, end = base + timedelta(days=1), base + timedelta(days=4)
+        assert tracker.get_total_revenue(start, end) == 2 + 3 + 4 + 5
+        assert tracker.get_total_revenue(start, end, RevenueSource.WEBSITE_ADS) == 3 + 5
+        assert tracker.get_total_revenue(end_date=base) == 1
+
+    def test_backdated_events_filtered_by_current_timestamp(self, tracker):
+        """Test in-place timestamp edits and direct appends are respected"""
+        now = datetime.now(timezone.utc)
+        tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.00)
+        backdated = tracker.track_ad_revenue("ad_002", "user_2", 1000, 25, 7.00)
+        backdated.timestamp = now - timedelta(days=60)
+        tracker.revenue_events.append(
+            RevenueEvent(
+                event_id="late",
+                source=RevenueSource.PRO_SUBSCRIPTION,
+                amount_usd=3.00,
+                user_id="user_3",
+                timestamp=now - timedelta(days=1),
+                metadata={},
+            )
+        )
+
+        start_date = now - timedelta(days=30)
+        assert tracker.get_total_revenue(start_date=start_date) == 8.00
+        assert tracker.get_total_revenue(end_date=start_date) == 7.00
+        assert (
+            tracker.get_total_revenue(
+                start_date=start_date, source=RevenueSource.PRO_SUBSCRIPTION
+            )
+            == 3.00
+        )
+
 
 class TestMRR:
     """Test Monthly Recurring Revenue calculations"""
@@ -241,6 +310,30 @@ class TestMonetizationSummary:
         assert "ad_metrics" in summary
         assert "subscription_metrics" in summary
 
+    def test_summary_reflects_in_place_event_edits(self, tracker):
+        """Test the summary is derived from events as they currently are"""
+        event = tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.00)
+        assert tracker.get_monetization_summary()["total_revenue_usd"] == 5.00
+
+        event.amount_usd = 8.00
+        event.metadata["clicks"] = 50
+        summary = tracker.get_monetization_summary()
+        assert summary["total_revenue_usd"] == 8.00
+        assert summary["ad_metrics"]["clicks"] == 50
+
+        event.timestamp -= timedelta(days=60)
+        assert tracker.get_monetization_summary()["total_revenue_usd"] == 0.0
+
+    def test_breakdowns_respect_date_range(self, tracker):
+        """Test breakdowns only include events inside the requested range"""
+        tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.00)
+        future = datetime.now(timezone.utc) + timedelta(days=1)
+
+        assert tracker.get_revenue_by_source()["website_ads"] == 5.00
+        assert tracker.get_revenue_by_source(start_date=future)["website_ads"] == 0.0
+        assert tracker.get_ad_revenue_metrics(start_date=future).impressions == 0
+        assert tracker.get_ad_revenue_metrics().impressions == 1000
+
 
 class TestRevenueExport:
     """Test revenue report export"""
@@ -255,6 +348,25 @@ class TestRevenueExport:
         assert "total_revenue_usd" in report
         assert "mrr" in report
 
+    def test_export_json_backends_match(self, tracker, monkeypatch):
+        """Test orjson and stdlib json produce the same indented report"""
+        import json
+        import monetization
+
+        if monetization.orjson is None:
+            pytest.skip("orjson not installed")
+
+        tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.00)
+        tracker.track_subscription_revenue("user_2", "pro", 9.99, "annual")
+        summary = tracker.get_monetization_summary()  # Pin the reporting period
+        monkeypatch.setattr(tracker, "get_monetization_summary", lambda: summary)
+        fast = tracker.export_revenue_report(format="json")
+        monkeypatch.setattr(monetization, "orjson", None)
+        slow = tracker.export_revenue_report(format="json")
+
+        assert fast == slow
+        assert json.loads(fast)["total_revenue_usd"] == 14.99
+
     def test_export_csv(self, tracker):
         """Test exporting report as CSV"""
         tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.00)
@@ -265,6 +377,20 @@ class TestRevenueExport:
         assert "metric,value" in report
         assert "total_revenue_usd" in report
 
+    def test_export_csv_parses_back(self, tracker):
+        """Test CSV export round-trips through csv.reader"""
+        import csv
+
+        tracker.track_ad_revenue("ad_001", "user_1", 1000, 25, 5.00)
+        tracker.track_subscription_revenue("user_2", "team", 49.99)
+
+        rows = list(csv.reader(tracker.export_revenue_report(format="csv").split("\n")))
+        assert rows[0] == ["metric", "value"]
+        values = dict(rows[1:])
+        assert values["total_revenue_usd"] == "54.99"
+        assert values["subscription_revenue"] == "49.99"
+        assert values["ad_impressions"] == "1000"
+
     def test_export_unsupported_format(self, tracker):
         """Test exporting with unsupported format"""
         with pytest.raises(ValueError, match="Unsupported format"):
@@ -11,6 +11,7 @@ from observability import (
     ObservabilityStack,
     LogLevel,
     MetricType,
+    DEFAULT_HISTOGRAM_BUCKETS,
 )
 
 
@@ -59,6 +60,17 @@ class TestStructuredLogger:
         assert len(logs) == 2
         assert all(log.level in ["WARNING", "ERROR"] for log in logs)
 
+    def test_min_level_can_be_changed(self):
+        """Test reassigning min_level takes effect for later records"""
+        logger = StructuredLogger("test-service", min_level=LogLevel.ERROR)
+        logger.warning("Dropped")
+        logger.min_level = LogLevel.DEBUG
+        logger.debug("Kept")
+
+        assert [log.message for log in logger.get_logs()] == ["Kept"]
+        assert logger.min_level is LogLevel.DEBUG
+        assert logger._should_log(LogLevel.DEBUG)
+
     def test_log_with_metadata(self):
         """Test logging with metadata"""
         logger = StructuredLogger("test-service")
@@ -79,6 +91,95 @@ class TestStructuredLogger:
         assert "key" in json_str
         assert "value" in json_str
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_log_json_backends(self, use_orjson, monkeypatch):
+        """Test JSON output round-trips with and without orjson"""
+        import json
+        import observability
+
+        if use_orjson and observability.orjson is None:
+            pytest.skip("orjson not installed")
+        if not use_orjson:
+            monkeypatch.setattr(observability, "orjson", None)
+
+        logger = StructuredLogger("test-service")
+        logger.info("Test", nested={"a": [1, 2]}, big=2**70, text="ü")
+
+        entry = logger.get_logs()[0]
+        payload = json.loads(entry.to_json())
+        assert json.loads(entry.to_json_bytes()) == payload
+        assert payload["message"] == "Test"
+        assert payload["service"] == "test-service"
+        assert payload["trace_id"] is None
+        assert payload["metadata"] == {
+            "nested": {"a": [1, 2]},
+            "big": 2**70,
+            "text": "ü",
+        }
+
+    def test_log_json_same_with_or_without_orjson(self, monkeypatch):
+        """Test the stdlib fallback emits the same compact JSON as orjson"""
+        import observability
+
+        if observability.orjson is None:
+            pytest.skip("orjson not installed")
+        payload = {"a": 1, "b": "x", "text": "ü", "nested": {"c": [1, 2]}}
+        fast = observability._dumps(payload), observability._dumps_bytes(payload)
+        monkeypatch.setattr(observability, "orjson", None)
+        slow = observability._dumps(payload), observability._dumps_bytes(payload)
+
+        assert fast == slow
+        assert fast[0].startswith('{"a":1,"b":"x"')
+
+    def test_batched_output_stream(self):
+        """Test records are written as JSON lines by the background writer"""
+        import io
+        import json
+
+        output = io.BytesIO()
+        logger = StructuredLogger("test-service", output=output)
+        for i in range(50):
+            logger.info("Message", index=i)
+        logger.debug("Filtered out")
+        logger.flush()
+
+        lines = output.getvalue().splitlines()
+        assert [json.loads(line)["metadata"]["index"] for line in lines] == list(
+            range(50)
+        )
+        assert len(logger.get_logs()) == 50
+
+        logger.close()
+        logger.info("After close")
+        logger.flush()
+        assert len(output.getvalue().splitlines()) == 50
+        assert logger.dropped_records == 1
+
+    def test_batched_output_drops_when_full(self):
+        """Test producers never block when the writer queue is full"""
+        import io
+        import threading
+
+        class _BlockingStream(io.BytesIO):
+            def __init__(self):
+                super().__init__()
+                self.release = threading.Event()
+
+            def write(self, data):
+                self.release.wait(5)
+                return super().write(data)
+
+        output = _BlockingStream()
+        logger = StructuredLogger("test-service", output=output, queue_size=2)
+        for i in range(20):
+            logger.info("Message", index=i)
+
+        assert logger.dropped_records > 0
+        output.release.set()
+        logger.close()
+        written = len(output.getvalue().splitlines())
+        assert written + logger.dropped_records == 20
+
     def test_clear_logs(self):
         """Test clearing logs"""
         logger = StructuredLogger("test-service")
@@ -90,6 +191,93 @@ class TestStructuredLogger:
         logger.clear_logs()
         assert len(logger.get_logs()) == 0
 
+    def test_log_buffer_is_bounded(self):
+        """Test only the most recent entries are retained"""
+        logger = StructuredLogger("test-service", capacity=3)
+        for i in range(5):
+            logger.info(f"message {i}")
+
+        assert [log.message for log in logger.get_logs()] == [
+            "message 2",
+            "message 3",
+            "message 4",
+        ]
+        assert list(logger.get_logs_iter()) == logger.get_logs()
+
+    def test_forwards_to_standard_logging(self, caplog):
+        """Test records reach standard logging at the matching level"""
+        import json
+        import logging
+
+        logger = StructuredLogger("test-service", min_level=LogLevel.DEBUG)
+        with caplog.at_level(logging.DEBUG):
+            logger.debug("debug message")
+            logger.critical("critical message")
+
+        forwarded = [
+            (r.levelname, json.loads(r.getMessage())["message"]) for r in caplog.records
+        ]
+        assert forwarded == [
+            ("DEBUG", "debug message"),
+            ("CRITICAL", "critical message"),
+        ]
+
+
+class TestRecordTypes:
+    """Test log, metric and span record types"""
+
+    def test_records_use_slots(self):
+        """Test hot-path record types carry no per-instance __dict__"""
+        obs = ObservabilityStack("test-service")
+        obs.logger.info("hello")
+        obs.metrics.increment_counter("requests")
+        span = obs.start_trace("operation")
+
+        assert not hasattr(obs.logger.get_logs()[0], "__dict__")
+        assert not hasattr(obs.metrics.get_all_metrics()[0], "__dict__")
+        assert not hasattr(span, "__dict__")
+        assert span.to_dict()["operation"] == "operation"
+
+
+class TestTimestamps:
+    """Test cached timestamp formatting"""
+
+    @pytest.mark.parametrize(
+        "time_ns",
+        [
+            1_700_000_000_123_456_789,
+            1_700_000_000_123_999_000,
+            1_700_000_001_000_000_000,  # whole second: no fractional part
+            1_700_000_001_000_001_000,
+        ],
+    )
+    def test_matches_datetime_isoformat(self, time_ns, monkeypatch):
+        """Test the cached formatter matches datetime.isoformat output"""
+        from datetime import datetime, timezone
+        import observability
+
+        monkeypatch.setattr(observability.time, "time_ns", lambda: time_ns)
+        expected = (
+            datetime.fromtimestamp(time_ns // 1000 / 1_000_000, tz=timezone.utc)
+            .replace(microsecond=time_ns // 1000 % 1_000_000)
+            .isoformat()
+            + "Z"
+        )
+        assert observability._iso_utc_now() == expected
+
+    def test_prefix_refreshes_each_second(self, monkeypatch):
+        """Test the cached date/time prefix advances with the clock"""
+        import observability
+
+        now = [1_700_000_000_500_000_000]
+        monkeypatch.setattr(observability.time, "time_ns", lambda: now[0])
+        first = observability._iso_utc_now()
+        now[0] += 1_000_000_000
+        second = observability._iso_utc_now()
+
+        assert first == "2023-11-14T22:13:20.500000+00:00Z"
+        assert second == "2023-11-14T22:13:21.500000+00:00Z"
+
 
 class TestMetricsCollector:
     """Test metrics collection"""
@@ -164,6 +352,22 @@ class TestMetricsCollector:
         assert stats["count"] == 1
         assert stats["min"] >= 10  # At least 10ms
 
+    def test_metric_keys(self):
+        """Test metric keys are stable regardless of tag order"""
+        collector = MetricsCollector()
+
+        assert collector._make_key("requests", None) == "requests"
+        assert collector._make_key("requests", {}) == "requests"
+        assert (
+            collector._make_key("requests", {"b": "2", "a": "1"})
+            == collector._make_key("requests", {"a": "1", "b": "2"})
+            == "requests{a=1,b=2}"
+        )
+        # Unhashable tag values still produce a key, just uncached
+        assert (
+            collector._make_key("requests", {"ids": [1, 2]}) == "requests{ids=[1, 2]}"
+        )
+
     def test_get_all_metrics(self):
         """Test getting all metrics"""
         collector = MetricsCollector()
@@ -177,6 +381,49 @@ class TestMetricsCollector:
         assert any(m.name == "cpu" for m in metrics)
         assert any(m.name == "latency" for m in metrics)
 
+    def test_get_all_metrics_aggregates_series(self):
+        """Test repeated updates collapse into one metric per series"""
+        collector = MetricsCollector()
+        for _ in range(5):
+            collector.increment_counter("requests", tags={"route": "/a"})
+        collector.set_gauge("cpu", 10.0)
+        collector.set_gauge("cpu", 40.0)
+        collector.record_histogram("latency", 100)
+        collector.record_histogram("latency", 200)
+
+        metrics = {m.name: m for m in collector.get_all_metrics()}
+        assert len(metrics) == 3
+        assert metrics["requests"].value == 5
+        assert metrics["requests"].tags == {"route": "/a"}
+        assert metrics["requests"].metric_type == MetricType.COUNTER.value
+        assert metrics["cpu"].value == 40.0
+        assert metrics["latency"].value == 150
+
+    def test_untagged_series_share_empty_tags(self):
+        """Test untagged updates do not allocate tag dicts per series"""
+        import observability
+
+        collector = MetricsCollector()
+        collector.increment_counter("requests")
+        with collector.time_operation("work"):
+            pass
+
+        assert collector._series["requests"][1] is observability._EMPTY_TAGS
+        assert collector._series["work"][1] is observability._EMPTY_TAGS
+        metric = collector.get_all_metrics()[0]
+        assert metric.tags == {}
+        assert metric.to_dict()["tags"] == {}
+
+    def test_record_events_keeps_bounded_stream(self):
+        """Test record_events keeps the most recent raw metric events"""
+        collector = MetricsCollector(record_events=True, max_events=3)
+        for value in range(5):
+            collector.increment_counter("requests", value)
+
+        events = collector.get_all_metrics()
+        assert [m.value for m in events] == [2, 3, 4]
+        assert collector.get_counter("requests") == 10
+
     def test_clear_metrics(self):
         """Test clearing metrics"""
         collector = MetricsCollector()
@@ -187,6 +434,58 @@ class TestMetricsCollector:
         assert collector.get_counter("test") == 0.0
         assert collector.get_gauge("test") is None
 
+    def test_histogram_keeps_recent_window(self):
+        """Test histograms retain only the most recent samples"""
+        collector = MetricsCollector(histogram_capacity=5)
+        for value in range(1, 11):
+            collector.record_histogram("latency", float(value))
+
+        stats = collector.get_histogram_stats("latency")
+        assert stats["count"] == 5
+        assert stats["min"] == 6.0
+        assert stats["max"] == 10.0
+        assert stats["mean"] == 8.0
+
+    def test_histogram_stats_refresh_after_new_samples(self):
+        """Test cached histogram stats update when samples are added"""
+        collector = MetricsCollector()
+        collector.record_histogram("latency", 10)
+        first = collector.get_histogram_stats("latency")
+        first["max"] = -1
+
+        assert collector.get_histogram_stats("latency")["max"] == 10
+        collector.record_histogram("latency", 30)
+        assert collector.get_histogram_stats("latency")["max"] == 30
+        assert collector.get_all_histogram_stats()["latency"]["mean"] == 20
+
+    def test_bucketed_histogram_stats(self):
+        """Test bucketed histograms keep exact summary and bucket percentiles"""
+        collector = MetricsCollector(histogram_buckets=range(10, 101, 10))
+        for value in range(1, 101):
+            collector.record_histogram("latency", value)
+
+        stats = collector.get_histogram_stats("latency")
+        assert stats["count"] == 100
+        assert stats["min"] == 1
+        assert stats["max"] == 100
+        assert stats["mean"] == 50.5
+        assert stats["median"] == 60
+        assert stats["p95"] == 100
+        assert stats["p99"] == 100
+
+    def test_bucketed_histogram_is_constant_size(self):
+        """Test bucketed histograms count samples instead of storing them"""
+        collector = MetricsCollector(histogram_buckets=DEFAULT_HISTOGRAM_BUCKETS)
+        for value in range(5000):
+            collector.record_histogram("latency", value * 1000.0)
+
+        histogram = collector._histograms["latency"]
+        assert len(histogram.counts) == len(DEFAULT_HISTOGRAM_BUCKETS) + 1
+        stats = collector.get_histogram_stats("latency")
+        assert stats["count"] == 5000
+        # Samples past the largest bound report the observed maximum
+        assert stats["p99"] == 4_999_000.0
+
 
 class TestTracer:
     """Test distributed tracing"""
@@ -249,6 +548,18 @@ class TestTracer:
         assert len(span.logs) == 2
         assert span.logs[0]["message"] == "Started processing"
 
+    def test_generated_ids(self):
+        """Test trace IDs are random hex and span IDs count upwards"""
+        tracer = Tracer()
+        root = tracer.start_trace("request")
+        child = tracer.start_span("db_query", root)
+
+        assert len(root.trace_id) == 32
+        int(root.trace_id, 16)
+        assert tracer.start_trace("other").trace_id != root.trace_id
+        assert root.span_id == "span_00000001"
+        assert child.span_id == "span_00000002"
+
     def test_get_trace(self):
         """Test retrieving a complete trace"""
         tracer = Tracer()
@@ -271,6 +582,25 @@ class TestTracer:
         all_traces = tracer.get_all_traces()
         assert len(all_traces) == 2
 
+    def test_get_all_traces_is_read_only_view(self):
+        """Test get_all_traces shares storage without allowing mutation"""
+        tracer = Tracer()
+        all_traces = tracer.get_all_traces()
+        span = tracer.start_trace("request")
+
+        assert list(all_traces[span.trace_id]) == [span]
+        with pytest.raises(TypeError):
+            all_traces["other"] = []
+
+    def test_spans_per_trace_are_capped(self):
+        """Test long-running traces discard their oldest spans"""
+        tracer = Tracer(max_spans_per_trace=3)
+        root = tracer.start_trace("request")
+        children = [tracer.start_span(f"step{i}", root) for i in range(4)]
+
+        trace = tracer.get_trace(root.trace_id)
+        assert trace == children[1:]
+
     def test_clear_traces(self):
         """Test clearing traces"""
         tracer = Tracer()
@@ -337,6 +667,27 @@ class TestObservabilityStack:
         assert "metrics" in dashboard
         assert "traces" in dashboard
 
+    def test_dashboard_log_counts(self):
+        """Test dashboard log totals and per-level counts"""
+        obs = ObservabilityStack("test-service")
+        obs.logger.info("one")
+        obs.logger.info("two")
+        obs.logger.error("three")
+
+        logs = obs.get_dashboard_data()["logs"]
+        assert logs == {"total": 3, "by_level": {"INFO": 2, "ERROR": 1}}
+
+    def test_dashboard_histograms_by_key(self):
+        """Test dashboard histogram stats are keyed by full metric key"""
+        obs = ObservabilityStack("test-service")
+        obs.metrics.record_histogram("latency", 10, tags={"route": "/a=b"})
+        obs.metrics.record_histogram("latency", 30, tags={"route": "/a=b"})
+        obs.metrics.record_histogram("latency", 5)
+
+        histograms = obs.get_dashboard_data()["metrics"]["histograms"]
+        assert histograms["latency{route=/a=b}"]["mean"] == 20
+        assert histograms["latency"]["count"] == 1
+
     def test_integrated_workflow(self):
         """Test complete integrated workflow"""
         obs = ObservabilityStack("api-server")
@@ -385,6 +736,64 @@ class TestIntegration:
         processing_log = [l for l in logs if "Processing request" in l.message][0]
         assert processing_log.trace_id == span.trace_id
 
+    def test_finishing_span_restores_parent_context(self):
+        """Test finishing a span restores the previous trace context"""
+        import observability
+
+        obs = ObservabilityStack("test-service")
+        before = observability._trace_context.get()
+        root = obs.start_trace("request")
+        child = obs.tracer.start_span("db_query", root)
+        assert observability._trace_context.get() == (root.trace_id, child.span_id)
+
+        obs.finish_span(child)
+        assert observability._trace_context.get() == (root.trace_id, root.span_id)
+        finished_log = obs.logger.get_logs()[-1]
+        assert finished_log.span_id == child.span_id
+
+        obs.finish_span(root)
+        assert observability._trace_context.get() == before
+
+    def test_untraced_logs_skip_context_lookup(self, monkeypatch):
+        """Test logging outside any trace does not read the trace context"""
+        import observability
+
+        class ExplodingContext:
+            def get(self):
+                raise AssertionError("trace context read with no active trace")
+
+        monkeypatch.setattr(observability, "_active_trace_contexts", 0)
+        monkeypatch.setattr(observability, "_trace_context", ExplodingContext())
+        logger = StructuredLogger("test-service")
+        logger.info("untraced")
+
+        assert logger.get_logs()[0].trace_id is None
+
+    def test_active_trace_count_returns_to_baseline(self):
+        """Test finishing spans releases the active trace count"""
+        import observability
+
+        baseline = observability._active_trace_contexts
+        obs = ObservabilityStack("test-service")
+        root = obs.start_trace("request")
+        child = obs.tracer.start_span("db_query", root)
+        assert observability._active_trace_contexts == baseline + 2
+
+        obs.finish_span(child)
+        obs.finish_span(root)
+        assert observability._active_trace_contexts == baseline
+
+    def test_finish_span_in_other_context(self):
+        """Test finishing a span outside its starting context is harmless"""
+        import contextvars
+
+        tracer = Tracer()
+        span = tracer.start_trace("request")
+        contextvars.copy_context().run(tracer.finish_span, span)
+
+        assert span.status == "success"
+        assert tracer._active_spans == {}
+
     def test_performance_monitoring(self):
         """Test monitoring performance across multiple operations"""
         obs = ObservabilityStack("worker-service")
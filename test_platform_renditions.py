@@ -2,6 +2,8 @@
 Tests for Platform Renditions Module - Issue #30
 """
 
+import dataclasses
+
 import pytest
 from platform_renditions import (
     Platform,
@@ -106,6 +108,18 @@ def test_get_all_specs():
         assert spec.platform == platform
 
 
+def test_get_all_specs_is_shared_and_read_only():
+    """Test the default spec table is built once and cannot be modified"""
+    all_specs = PlatformRenditions.get_all_specs()
+
+    assert all_specs is PlatformRenditions.get_all_specs()
+    assert PlatformRenditions.get_spec_for_platform(Platform.SLACK) is (
+        all_specs[Platform.SLACK]
+    )
+    with pytest.raises(TypeError):
+        all_specs[Platform.GENERIC] = PlatformRenditions.get_web_720p_spec()
+
+
 def test_get_spec_for_platform():
     """Test getting spec for a specific platform"""
     discord_spec = PlatformRenditions.get_spec_for_platform(Platform.DISCORD)
@@ -133,6 +147,14 @@ def test_get_platform_constraints():
     assert constraints["quality"] == "medium"
 
 
+def test_get_platform_constraints_returns_copy():
+    """Test editing returned constraints does not affect later calls"""
+    constraints = get_platform_constraints(Platform.DISCORD)
+    constraints["max_width"] = 1
+
+    assert get_platform_constraints(Platform.DISCORD)["max_width"] == 1280
+
+
 def test_get_platform_constraints_nonexistent():
     """Test getting constraints for nonexistent platform"""
     constraints = get_platform_constraints(Platform.GENERIC)
@@ -161,6 +183,16 @@ def test_rendition_spec_dataclass():
     assert spec.description == "Custom spec"
 
 
+def test_rendition_spec_is_immutable():
+    """Test shared rendition specs cannot be modified"""
+    spec = PlatformRenditions.get_spec_for_platform(Platform.DISCORD)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        spec.max_width = 4096
+    assert not hasattr(spec, "__dict__")
+    assert PlatformRenditions.get_discord_spec() == spec
+
+
 def test_discord_file_size_constraint():
     """Test Discord has appropriate file size constraint for free tier"""
     spec = PlatformRenditions.get_discord_spec()
@@ -3,6 +3,8 @@ Tests for Pricing Plans & Quotas Module
 Issue: #47
 """
 
+import time
+
 import pytest
 from datetime import datetime, timedelta
 from pricing import (
@@ -157,6 +159,34 @@ class TestPricingManager:
         usage = manager.get_usage("user1")
         assert usage.api_requests_today == 0
 
+    def test_usage_period_starts(self):
+        """Period start datetimes map onto the stored integer buckets"""
+        usage = UsageStats()
+        now = datetime.now()
+
+        assert usage.month_start == datetime(now.year, now.month, 1)
+        assert usage.day_start == datetime(now.year, now.month, now.day)
+
+        usage.month_start = datetime(2024, 12, 1)
+        usage.day_start = datetime(2024, 12, 31, 15, 30)
+        assert usage.month_bucket == 2024 * 12 + 11
+        assert usage.month_start == datetime(2024, 12, 1)
+        assert usage.day_start == datetime(2024, 12, 31)
+
+    def test_usage_resets_when_clock_crosses_day(self, monkeypatch):
+        """Counters reset once the wall clock moves into the next day"""
+        import pricing
+
+        manager = PricingManager()
+        usage = manager.get_usage("user1")
+        usage.api_requests_today = 100
+
+        tomorrow = time.time() + 86400
+        monkeypatch.setattr(pricing.time, "time", lambda: tomorrow)
+        usage = manager.get_usage("user1")
+        assert usage.api_requests_today == 0
+        assert usage.day_bucket == pricing._period_buckets()[0]
+
 
 class TestQuotaChecking:
     """Test quota checking functionality"""
@@ -337,6 +367,36 @@ class TestQuotaStatus:
         assert status["quotas"]["uploads"]["limit"] == 50
         assert status["quotas"]["uploads"]["percentage"] == 20.0
 
+    def test_quota_status_covers_every_quota_type(self):
+        """Status should report usage for each quota type in order"""
+        manager = PricingManager()
+        manager.assign_plan("user1", PlanTier.TEAM)
+        manager.consume_quota("user1", QuotaType.STORAGE_GB, 25.0)
+        manager.consume_quota("user1", QuotaType.TEAM_MEMBERS, 4)
+        manager.consume_quota("user1", QuotaType.API_REQUESTS_PER_DAY, 3)
+
+        quotas = manager.get_quota_status("user1")["quotas"]
+
+        assert list(quotas) == [
+            "uploads",
+            "storage_gb",
+            "bandwidth_gb",
+            "team_members",
+            "api_requests",
+        ]
+        assert quotas["storage_gb"]["percentage"] == 10.0
+        assert quotas["team_members"]["used"] == 5
+        assert isinstance(quotas["team_members"]["used"], int)
+        assert quotas["api_requests"]["used"] == 3
+
+    def test_unknown_quota_type_is_allowed(self):
+        """Quota types without limits should be allowed and not tracked"""
+        manager = PricingManager()
+
+        assert manager.check_quota("user1", "not_a_quota", 1.0) is True
+        manager.consume_quota("user1", "not_a_quota", 1.0)
+        assert manager.get_usage("user1") == UsageStats()
+
     def test_quota_status_includes_features(self):
         """Status should include plan features"""
         manager = PricingManager()
@@ -376,6 +436,21 @@ class TestUpgradeOptions:
         assert len(upgrades["upgrade_options"]) == 1
         assert upgrades["upgrade_options"][0]["tier"] == "team"
 
+    def test_upgrade_options_are_not_shared(self):
+        """Editing returned upgrade options should not affect later calls"""
+        manager = PricingManager()
+        first = manager.can_upgrade("user1")
+        first["upgrade_options"][0]["benefits"].append("Free pony")
+        first["upgrade_options"][0]["price"] = 0
+
+        second = manager.can_upgrade("user1")
+        assert "Free pony" not in second["upgrade_options"][0]["benefits"]
+        assert second["upgrade_options"][0]["price"] == 19.99
+        assert second["upgrade_options"][0]["benefits"] == (
+            manager._get_upgrade_benefits(PlanTier.FREE, PlanTier.PRO)
+        )
+        assert "Priority support" in second["upgrade_options"][0]["benefits"]
+
     def test_team_cannot_upgrade(self):
         """Team users should have no upgrades"""
         manager = PricingManager()
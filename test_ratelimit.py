@@ -114,13 +114,13 @@ class TestSlidingWindow:
         window = SlidingWindow(limit=10, window_seconds=60)
         assert window.limit == 10
         assert window.window_seconds == 60
-        assert len(window.timestamps) == 0
+        assert window.current_count() == 0
 
     def test_sliding_window_consume_success(self):
         """Test successful consumption"""
         window = SlidingWindow(limit=10, window_seconds=60)
         assert window.consume(5) is True
-        assert len(window.timestamps) == 5
+        assert window.current_count() == 5
 
     def test_sliding_window_consume_failure(self):
         """Test consumption when limit exceeded"""
@@ -132,11 +132,11 @@ class TestSlidingWindow:
         """Test old requests expire"""
         window = SlidingWindow(limit=10, window_seconds=1)
         window.consume(10)
-        assert len(window.timestamps) == 10
+        assert window.current_count() == 10
 
         time.sleep(1.1)
         assert window.consume(5) is True
-        assert len(window.timestamps) == 5
+        assert window.current_count() == 5
 
     def test_sliding_window_get_wait_time(self):
         """Test wait time calculation"""
@@ -146,6 +146,28 @@ class TestSlidingWindow:
         assert wait_time > 0
         assert wait_time <= 60
 
+    def test_sliding_window_expires_bucket_by_bucket(self, monkeypatch):
+        """Test requests leave the window in the order they were made"""
+        import ratelimit
+
+        clock = [1000.0]
+        monkeypatch.setattr(ratelimit.time, "time", lambda: clock[0])
+        window = SlidingWindow(limit=10, window_seconds=60)
+
+        assert window.consume(6) is True
+        clock[0] += 30
+        assert window.consume(4) is True
+        assert window.consume(1) is False
+        assert window.get_wait_time(1) == 30.0
+
+        clock[0] += 30  # first six requests slide out
+        assert window.current_count() == 4
+        assert window.consume(6) is True
+        assert len(window.buckets) == 60
+
+        clock[0] += 600  # everything expires
+        assert window.current_count() == 0
+
 
 class TestRateLimiterTokenBucket:
     """Test RateLimiter with token bucket strategy"""
@@ -294,6 +316,20 @@ class TestRateLimiterTokenBucket:
         assert len(limiter._ip_limiters) == 0
         assert len(limiter._user_limiters) == 0
 
+    def test_limiter_maps_evict_least_recently_used(self):
+        """Test tracked identifiers are capped with LRU eviction"""
+        config = RateLimitConfig(requests_per_window=10, window_seconds=60)
+        limiter = RateLimiter(config, max_entries=2, shard_count=1)
+
+        limiter.check_rate_limit(ip_address="10.0.0.1")
+        limiter.check_rate_limit(ip_address="10.0.0.2")
+        limiter.check_rate_limit(ip_address="10.0.0.1")  # now most recent
+        limiter.check_rate_limit(ip_address="10.0.0.3")
+
+        assert list(limiter._ip_limiters) == ["10.0.0.1", "10.0.0.3"]
+        # The evicted IP starts over with a full quota
+        assert limiter.get_remaining_quota(ip_address="10.0.0.2") == {"ip": 10}
+
 
 class TestRateLimiterFixedWindow:
     """Test RateLimiter with fixed window strategy"""
@@ -453,6 +489,138 @@ class TestRateLimiterEdgeCases:
         )
         assert allowed is False
 
+    @pytest.mark.parametrize(
+        "make_limiter",
+        [
+            lambda: TokenBucket(capacity=10, refill_rate=10 / 60),
+            lambda: FixedWindow(limit=10, window_seconds=60),
+            lambda: SlidingWindow(limit=10, window_seconds=60),
+        ],
+    )
+    def test_try_consume_reports_wait_time(self, make_limiter, monkeypatch):
+        """Test try_consume returns the same wait as get_wait_time"""
+        import ratelimit
+
+        limiter = make_limiter()
+        now = time.time()
+        monkeypatch.setattr(ratelimit.time, "time", lambda: now)
+
+        assert limiter.try_consume(10, now) == (True, 0.0)
+        allowed, wait_time = limiter.try_consume(1, now)
+        assert allowed is False
+        assert wait_time == pytest.approx(limiter.get_wait_time(1))
+        assert 0 < wait_time <= 60
+
+    def test_limiters_spread_across_shards(self):
+        """Test identifiers are tracked across shards and capped per shard"""
+        config = RateLimitConfig(requests_per_window=10, window_seconds=60)
+        limiter = RateLimiter(config, max_entries=400, shard_count=4)
+
+        for i in range(1000):
+            limiter.check_rate_limit(ip_address=f"10.0.{i // 256}.{i % 256}")
+
+        assert len(limiter._ip_limiters) <= 400
+        assert all(len(shard) == 100 for shard, _ in limiter._ip_limiters._shards)
+        assert "10.0.3.231" in set(limiter._ip_limiters)  # most recent kept
+
+    def test_small_max_entries_limits_shard_count(self):
+        """Test a blocked identifier is not evicted by one unrelated identifier"""
+        config = RateLimitConfig(requests_per_window=1, window_seconds=1200)
+        limiter = RateLimiter(config, enable_per_ip=False, max_entries=64)
+
+        assert limiter.check_rate_limit(user_id="blocked")[0] is True
+        assert limiter.check_rate_limit(user_id="blocked")[0] is False
+        for i in range(63):
+            limiter.check_rate_limit(user_id=f"other{i}")
+
+        assert len(limiter._user_limiters._shards) == 1
+        assert limiter.check_rate_limit(user_id="blocked")[0] is False
+
+    def test_concurrent_checks_respect_limit(self):
+        """Test threads sharing one identifier cannot exceed its limit"""
+        import threading
+
+        config = RateLimitConfig(
+            requests_per_window=500,
+            window_seconds=3600,
+            strategy=RateLimitStrategy.FIXED_WINDOW,
+        )
+        limiter = RateLimiter(config)
+        allowed = []
+
+        def worker():
+            for _ in range(200):
+                allowed.append(limiter.check_rate_limit(user_id="user1")[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert allowed.count(True) == 500
+
+    def test_limiters_use_slots(self):
+        """Test per-key limiter objects carry no per-instance __dict__"""
+        for limiter in (
+            TokenBucket(capacity=10, refill_rate=1.0),
+            FixedWindow(limit=10, window_seconds=60),
+            SlidingWindow(limit=10, window_seconds=60),
+        ):
+            assert not hasattr(limiter, "__dict__")
+
+    def test_token_bucket_refills_up_to_capacity(self):
+        """Test try_consume refills by elapsed time without exceeding capacity"""
+        bucket = TokenBucket(capacity=10, refill_rate=2.0)
+        start = bucket.last_refill
+
+        assert bucket.try_consume(10, start) == (True, 0.0)
+        assert bucket.try_consume(3, start + 1.0) == (False, 0.5)
+        assert bucket.try_consume(3, start + 1.5) == (True, 0.0)
+        assert bucket.tokens == 0.0
+        assert bucket.try_consume(1, start + 100.0) == (True, 0.0)
+        assert bucket.tokens == 9
+
+    def test_first_request_at_full_capacity(self):
+        """Test a new identifier can spend its whole quota immediately"""
+        config = RateLimitConfig(requests_per_window=1, window_seconds=60)
+        limiter = RateLimiter(config)
+
+        assert limiter.check_rate_limit(ip_address="10.0.0.1") == (True, None)
+        assert limiter.check_rate_limit(user_id="user1") == (True, None)
+        assert limiter.check_rate_limit(ip_address="10.0.0.1")[0] is False
+
+    def test_token_bucket_ignores_clock_before_creation(self):
+        """Test a stale now neither drains tokens nor rewinds last_refill"""
+        bucket = TokenBucket(capacity=5, refill_rate=1.0)
+        created = bucket.last_refill
+
+        assert bucket.try_consume(5, now=created - 1.0) == (True, 0.0)
+        assert bucket.last_refill == created
+
+    def test_check_rate_limit_reads_clock_once(self, monkeypatch):
+        """Test IP and user checks share a single clock read"""
+        import ratelimit
+
+        config = RateLimitConfig(requests_per_window=10, window_seconds=60)
+        limiter = RateLimiter(config)
+        limiter.check_rate_limit(ip_address="10.0.0.1", user_id="user1")
+
+        now = time.time()
+        calls = []
+
+        def fake_time():
+            calls.append(1)
+            return now
+
+        monkeypatch.setattr(ratelimit.time, "time", fake_time)
+        allowed, retry_after = limiter.check_rate_limit(
+            ip_address="10.0.0.1", user_id="user1"
+        )
+
+        assert (allowed, retry_after) == (True, None)
+        assert len(calls) == 1
+
 
 class TestRateLimitConfig:
     """Test rate limit configuration"""